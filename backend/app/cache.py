@@ -0,0 +1,167 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+from .config import settings
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    headers: str  # 원본 응답 헤더 (JSON [[이름, 값], ...])
+    etag: str
+
+
+class NullCache:
+    """응답 캐시 비활성화 (서비스 메모가 쓰는 무효화 세대는 유지)"""
+
+    def __init__(self):
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        return None
+
+    def set(self, key: str, entry: CachedResponse, ttl: int):
+        pass
+
+    def generation(self, tag: str) -> int:
+        return self._generations.get(tag, 0)
+
+    def bump(self, *tags: str):
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+
+
+class MemoryCache:
+    """프로세스 내 LRU + TTL 캐시 (항목 수 / 전체 바이트 상한)"""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (entry, expires_at)
+        self._generations = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            entry, expires_at = item
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedResponse, ttl: int):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (entry, time.monotonic() + ttl)
+            self._bytes += len(entry.body)
+            # 상한을 넘으면 가장 오래 사용하지 않은 항목부터 제거
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+
+    def generation(self, tag: str) -> int:
+        return self._generations.get(tag, 0)
+
+    def bump(self, *tags: str):
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+
+    def _remove(self, key: str):
+        entry, _ = self._entries.pop(key)
+        self._bytes -= len(entry.body)
+
+
+class SQLiteCache:
+    """파일 기반 공유 캐시 (여러 워커 프로세스가 항목과 무효화 세대를 공유)"""
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._writes = 0
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "key TEXT PRIMARY KEY, body BLOB NOT NULL, headers TEXT NOT NULL, "
+                "etag TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_entries_expires_at ON cache_entries (expires_at)")
+            conn.execute("CREATE TABLE IF NOT EXISTS cache_generations (tag TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        row = self._connection().execute(
+            "SELECT body, headers, etag FROM cache_entries WHERE key = ? AND expires_at >= ?",
+            (key, time.time())
+        ).fetchone()
+        return CachedResponse(*row) if row else None
+
+    def set(self, key: str, entry: CachedResponse, ttl: int):
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entries (key, body, headers, etag, expires_at) VALUES (?, ?, ?, ?, ?)",
+            (key, entry.body, entry.headers, entry.etag, time.time() + ttl)
+        )
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self._prune(conn)
+
+    def _prune(self, conn):
+        """만료 항목 삭제 후 용량 상한을 넘으면 만료가 임박한 항목부터 제거"""
+        conn.execute("DELETE FROM cache_entries WHERE expires_at < ?", (time.time(),))
+        total = conn.execute("SELECT COALESCE(SUM(LENGTH(body)), 0) FROM cache_entries").fetchone()[0]
+        while total > self.max_bytes:
+            row = conn.execute(
+                "SELECT key, LENGTH(body) FROM cache_entries ORDER BY expires_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            conn.execute("DELETE FROM cache_entries WHERE key = ?", (row[0],))
+            total -= row[1]
+
+    def generation(self, tag: str) -> int:
+        row = self._connection().execute(
+            "SELECT value FROM cache_generations WHERE tag = ?", (tag,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def bump(self, *tags: str):
+        conn = self._connection()
+        for tag in tags:
+            conn.execute(
+                "INSERT INTO cache_generations (tag, value) VALUES (?, 1) "
+                "ON CONFLICT(tag) DO UPDATE SET value = value + 1",
+                (tag,)
+            )
+
+
+def _create_cache():
+    if settings.cache_backend == "memory":
+        return MemoryCache(settings.cache_max_entries, settings.cache_max_bytes)
+    if settings.cache_backend == "sqlite":
+        return SQLiteCache(settings.cache_path, settings.cache_max_bytes)
+    return NullCache()
+
+
+cache = _create_cache()
+
+
+def invalidate(*tags: str):
+    """태그에 속한 캐시 항목 무효화 (쓰기 트랜잭션 커밋 후 호출)"""
+    cache.bump(*tags)
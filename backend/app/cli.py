@@ -0,0 +1,153 @@
+import argparse
+from sqlalchemy import text
+from .database import SessionLocal, engine, Base
+from .migrations import incremental_vacuum_pending, rollups_need_rebuild, run_migrations
+from .models import campaign, experiment  # noqa: F401 (테이블 생성을 위해 필요)
+from .services.compaction_service import CompactionService
+from .services.experiment_analysis_service import ExperimentAnalysisService
+from .services.rollup_service import RollupService
+from .services.search_service import SearchService
+from .services.segment_bitmap_service import SegmentBitmapService
+from .services.segment_execution_service import SegmentExecutionService
+from .services.stats_service import StatsService
+
+
+def rebuild_rollups(args):
+    """원본 데이터 포인트로부터 롤업 재계산"""
+    db = SessionLocal()
+    try:
+        RollupService.rebuild(db, metric_id=args.metric_id)
+    finally:
+        db.close()
+    print("롤업 재계산 완료")
+
+
+def compact(args):
+    """보존 기간이 지난 데이터 포인트 압축"""
+    db = SessionLocal()
+    try:
+        report = CompactionService.compact(db)
+    finally:
+        db.close()
+    print(report)
+
+
+def enable_incremental_vacuum(args):
+    """기존 DB 파일에 auto_vacuum=INCREMENTAL 적용 (전체 VACUUM 1회 실행)"""
+    # VACUUM은 트랜잭션 안에서 실행할 수 없다
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+        conn.execute(text("VACUUM"))
+        mode = conn.execute(text("PRAGMA auto_vacuum")).scalar()
+    print(f"auto_vacuum = {mode}")
+
+
+def maintenance(args):
+    """필요한 1회성 관리 작업 실행 (롤업/스케치 백필, 증분 VACUUM 전환)"""
+    if rollups_need_rebuild(engine):
+        rebuild_rollups(argparse.Namespace(metric_id=None))
+    if incremental_vacuum_pending(engine):
+        enable_incremental_vacuum(args)
+    print("관리 작업 완료")
+
+
+def rebuild_search_index(args):
+    """지표/세그먼트/실험 검색 인덱스 재생성"""
+    db = SessionLocal()
+    try:
+        SearchService.rebuild(db)
+    finally:
+        db.close()
+    print("검색 인덱스 재생성 완료")
+
+
+def repair_counters(args):
+    """통계 카운터를 원본 테이블 기준으로 재계산"""
+    db = SessionLocal()
+    try:
+        drift = StatsService.rebuild(db)
+    finally:
+        db.close()
+    print(f"카운터 재계산 완료 (보정 {len(drift)}건)")
+    for key, values in drift.items():
+        print(f"  {key}: {values['before']} -> {values['after']}")
+
+
+def rebuild_experiment_stats(args):
+    """실험 관측값으로부터 누적 통계량 재계산"""
+    db = SessionLocal()
+    try:
+        ExperimentAnalysisService.rebuild_accumulators(db, experiment_id=args.experiment_id)
+    finally:
+        db.close()
+    print("실험 통계량 재계산 완료")
+
+
+def refresh_segments(args):
+    """세그먼트 쿼리 실행 (재계산이 필요한 세그먼트만, --force면 전체)"""
+    db = SessionLocal()
+    try:
+        if args.segment_id is not None:
+            results = [SegmentExecutionService.refresh_segment(db, args.segment_id, force=args.force)]
+        else:
+            results = SegmentExecutionService.refresh_due(db, force=args.force)
+    finally:
+        db.close()
+    for result in results:
+        print(result)
+
+
+def rebuild_segment_bitmaps(args):
+    """세그먼트 멤버십 행으로부터 압축 비트맵 재생성"""
+    db = SessionLocal()
+    try:
+        SegmentBitmapService.rebuild(db, segment_id=args.segment_id)
+    finally:
+        db.close()
+    print("세그먼트 비트맵 재생성 완료")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="DataHub 관리 명령")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rollups = subparsers.add_parser("rebuild-rollups", help="원본 데이터 포인트로부터 롤업 재계산")
+    rollups.add_argument("--metric-id", type=int, default=None, help="특정 지표만 재계산")
+    rollups.set_defaults(func=rebuild_rollups)
+
+    compaction = subparsers.add_parser("compact", help="보존 기간이 지난 데이터 포인트 압축")
+    compaction.set_defaults(func=compact)
+
+    vacuum = subparsers.add_parser("enable-incremental-vacuum", help="기존 DB 파일에 증분 VACUUM 적용")
+    vacuum.set_defaults(func=enable_incremental_vacuum)
+
+    pending = subparsers.add_parser("maintenance", help="필요한 롤업 백필과 증분 VACUUM 전환 실행")
+    pending.set_defaults(func=maintenance)
+
+    search = subparsers.add_parser("rebuild-search-index", help="검색 인덱스 재생성")
+    search.set_defaults(func=rebuild_search_index)
+
+    counters = subparsers.add_parser("repair-counters", help="통계 카운터 재계산")
+    counters.set_defaults(func=repair_counters)
+
+    experiment_stats = subparsers.add_parser("rebuild-experiment-stats", help="실험 누적 통계량 재계산")
+    experiment_stats.add_argument("--experiment-id", type=int, default=None, help="특정 실험만 재계산")
+    experiment_stats.set_defaults(func=rebuild_experiment_stats)
+
+    segments = subparsers.add_parser("refresh-segments", help="세그먼트 쿼리 실행 및 멤버십 갱신")
+    segments.add_argument("--segment-id", type=int, default=None, help="특정 세그먼트만 실행")
+    segments.add_argument("--force", action="store_true", help="주기/입력 변경과 무관하게 재실행")
+    segments.set_defaults(func=refresh_segments)
+
+    bitmaps = subparsers.add_parser("rebuild-segment-bitmaps", help="세그먼트 멤버십 비트맵 재생성")
+    bitmaps.add_argument("--segment-id", type=int, default=None, help="특정 세그먼트만 재생성")
+    bitmaps.set_defaults(func=rebuild_segment_bitmaps)
+
+    args = parser.parse_args(argv)
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
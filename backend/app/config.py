@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 import os
 from pathlib import Path
 
@@ -14,6 +14,127 @@ class Settings(BaseSettings):
     api_port: int = 8000
     cors_origins: List[str] = ["http://localhost:3000", "http://localhost:5173"]
 
+    # 데이터 포인트 일괄 적재
+    ingest_chunk_size: int = 5000
+    ingest_max_rows: int = 500000
+
+    # 시계열 조회 시 반환할 최대 포인트(버킷) 수
+    timeseries_max_points: int = 10000
+    timeseries_batch_max_metrics: int = 100  # 일괄 시계열 조회 1회당 최대 지표 수
+    timeseries_memo_size: int = 128  # 변환 요청용 버킷 시계열 메모 개수
+    export_batch_size: int = 10000  # 내보내기 스트리밍 시 한 번에 읽는 행 수
+    rollup_rebuild_batch_size: int = 50000  # 롤업 재계산(rebuild-rollups) 시 한 번에 읽는 원본 행 수 (일 단위로 맞춤)
+
+    # 원본 데이터 포인트 보존 기간 (Metric.aggregation_period별, 일 단위)
+    # 보존 기간이 지난 원본은 일별 롤업만 남기고 삭제한다
+    raw_retention_days: Dict[str, int] = {
+        "실시간": 7,
+        "시간별": 14,
+        "일별": 30,
+        "주별": 90,
+        "월별": 365,
+    }
+    raw_retention_default_days: int = 30
+    compaction_batch_size: int = 5000
+    compaction_vacuum_pages: int = 1000  # 증분 VACUUM 1회에 반환할 페이지 수
+    compaction_interval_minutes: int = 60  # 0이면 백그라운드 압축 비활성화
+
+    # SQLite 프로파일 (default / production)
+    # production: WAL + 튜닝 PRAGMA + 커넥션 풀, GET 요청은 읽기 전용 엔진 사용
+    database_profile: str = "default"
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size_kib: int = 64 * 1024  # 커넥션당 페이지 캐시
+    sqlite_busy_timeout_ms: int = 5000
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_read_pool_size: int = 10
+
+    # 요청 처리 DB 모드 (sync: 스레드풀 + 동기 엔진 / async: aiosqlite AsyncSession)
+    database_mode: str = "sync"
+
+    # 실험 순차 검정 (mSPRT) 혼합 분포 크기: 실험에 MDE가 없을 때 쓰는 상대 효과 크기
+    sequential_default_mde: float = 0.05
+
+    # 실험 설계 계산기: 기준선 통계 기간, 곡선 격자 크기, 지표별 기준선 메모 개수
+    design_baseline_days: int = 28
+    design_grid_size: int = 25
+    design_baseline_memo_size: int = 256
+
+    # 실험 그룹 배정: 해시 버킷 수, 일괄 배정 1회당 최대 단위 ID 수
+    assignment_buckets: int = 10000
+    assignment_batch_max_ids: int = 100000
+
+    # 세그먼트 쿼리 실행: 읽기 전용으로 여는 로컬 SQLite 데이터 소스 (+ ATTACH할 별칭 -> 경로)
+    segment_source_path: str = str(BASE_DIR / "database" / "segment_source.db")
+    segment_source_attach: Dict[str, str] = {}
+    segment_query_timeout_ms: int = 5000
+    segment_max_members: int = 1000000
+    # refresh_period별 재계산 주기 (초)
+    segment_refresh_seconds: Dict[str, int] = {
+        "실시간": 60,
+        "1시간": 3600,
+        "6시간": 6 * 3600,
+        "12시간": 12 * 3600,
+        "일별": 86400,
+        "주별": 7 * 86400,
+    }
+    segment_refresh_default_seconds: int = 86400
+    # aggregation_period별 지표 현재 값 갱신 주기 (초)
+    metric_refresh_seconds: Dict[str, int] = {
+        "실시간": 60,
+        "시간별": 3600,
+        "일별": 86400,
+        "주별": 7 * 86400,
+        "월별": 30 * 86400,
+        "분기별": 91 * 86400,
+        "연별": 365 * 86400,
+    }
+    metric_refresh_default_seconds: int = 86400
+
+    # 지표 알림 평가 (alert_settings): z-score 규칙의 기본 EWMA 창 크기, 평가 전 필요한 최소 포인트 수
+    alert_ewma_window: int = 30
+    alert_min_points: int = 10
+    # pct_change 규칙의 비교 시점: aggregation_period만큼 이전 시각 (초, 그 시각이 속한 롤업 버킷의 평균과 비교)
+    alert_pct_change_seconds: Dict[str, int] = {
+        "실시간": 3600,
+        "시간별": 3600,
+        "일별": 86400,
+        "주별": 7 * 86400,
+        "월별": 30 * 86400,
+        "분기별": 91 * 86400,
+        "연별": 365 * 86400,
+    }
+    alert_pct_change_default_seconds: int = 86400
+
+    # 롤업 버킷별 분위수 스케치 (t-digest) 압축 계수: 클수록 정확하고 버킷당 centroid가 많아진다 (약 δ/2개)
+    sketch_compression: int = 200
+
+    # 파생 지표 (calculation_logic 식): 기본 조회 버킷 수, 메모할 시계열 수, 입력 변경 기록 보존 시간
+    derived_default_buckets: int = 30
+    derived_memo_size: int = 128
+    derived_change_retention_hours: int = 24
+
+    # 백그라운드 refresh 스케줄러 (세그먼트 쿼리, 지표 값, 압축). 끄면 보존 기간 압축도 실행되지 않는다
+    scheduler_enabled: bool = True
+    # 지표 현재 값(value)을 최신 데이터 포인트 값으로 덮어쓰는 작업 (사용자가 입력한 값을 덮어쓰므로 선택)
+    scheduler_refresh_metric_values: bool = False
+    scheduler_workers: int = 2  # 요청 처리 스레드풀과 별도인 작업 스레드 수
+    scheduler_max_writers: int = 1  # 동시에 SQLite에 쓰는 작업 수 상한
+    scheduler_tick_seconds: float = 1.0
+    scheduler_sync_seconds: int = 60  # 세그먼트/지표 목록으로 작업을 다시 구성하는 주기
+    scheduler_job_timeout_seconds: int = 300
+    scheduler_jitter_fraction: float = 0.1
+    scheduler_max_jitter_seconds: int = 300
+
+    # GET 응답 캐시 (memory / sqlite / none)
+    # 여러 워커 프로세스로 실행할 때는 sqlite 백엔드를 사용해야 무효화가 공유된다
+    cache_backend: str = "memory"
+    cache_ttl_seconds: int = 300
+    cache_max_entries: int = 1000
+    cache_max_bytes: int = 64 * 1024 * 1024
+    cache_max_entry_bytes: int = 1024 * 1024  # 이보다 큰 응답은 캐시하지 않고 그대로 전달
+    cache_path: str = str(BASE_DIR / "database" / "cache.db")
+
     class Config:
         env_file = ".env"
 
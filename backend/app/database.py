@@ -1,26 +1,164 @@
-from sqlalchemy import create_engine
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from .config import settings
 
+PRODUCTION = settings.database_profile == "production"
+READ_METHODS = ("GET", "HEAD")
+
+
+def _engine_options(pool_size: int, **options):
+    if not PRODUCTION:
+        return {}
+    return {
+        **options,
+        "pool_size": pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_pre_ping": True,
+    }
+
+
+def _read_only_url(url):
+    """같은 DB 파일을 mode=ro URI로 여는 URL (메모리 DB는 None)"""
+    if not url.database or url.database == ":memory:":
+        return None
+    return url.set(database=f"file:{url.database}", query={"mode": "ro", "uri": "true"})
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    # 삭제로 생긴 빈 페이지를 증분 VACUUM으로 반환 (기존 파일은 python -m app.cli maintenance가 한 번 VACUUM해 적용)
+    cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    if PRODUCTION:
+        # WAL: 읽기와 쓰기가 서로를 막지 않음 (DB 파일에 영구 적용)
+        cursor.execute("PRAGMA journal_mode = WAL")
+        _set_tuning_pragmas(cursor)
+    cursor.close()
+
+
+def _set_read_only_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only = ON")
+    _set_tuning_pragmas(cursor)
+    cursor.close()
+
+
+def _set_tuning_pragmas(cursor):
+    cursor.execute("PRAGMA synchronous = NORMAL")
+    cursor.execute(f"PRAGMA mmap_size = {settings.sqlite_mmap_size}")
+    cursor.execute(f"PRAGMA cache_size = -{settings.sqlite_cache_size_kib}")
+    cursor.execute(f"PRAGMA busy_timeout = {settings.sqlite_busy_timeout_ms}")
+    cursor.execute("PRAGMA temp_store = MEMORY")
+
+
+database_url = make_url(settings.database_url)
+
 # SQLite 데이터베이스 엔진 생성
 engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False}  # SQLite에서 필요
+    database_url,
+    connect_args={"check_same_thread": False},  # SQLite에서 필요
+    **_engine_options(settings.database_pool_size)
 )
+event.listen(engine, "connect", _set_sqlite_pragmas)
 
 # 세션 로컬 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 읽기 전용 엔진 (production 프로파일에서 GET 요청용, 쓰기 작업 대기열과 분리)
+read_engine = None
+ReadSessionLocal = SessionLocal
+read_only_url = _read_only_url(database_url) if PRODUCTION else None
+if read_only_url is not None:
+    read_engine = create_engine(
+        read_only_url,
+        connect_args={"check_same_thread": False},
+        **_engine_options(settings.database_read_pool_size)
+    )
+    event.listen(read_engine, "connect", _set_read_only_pragmas)
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# 비동기 엔진 (database_mode=async 일 때만 생성)
+async_engine = None
+AsyncSessionLocal = None
+AsyncReadSessionLocal = None
+async_read_engine = None
+if settings.database_mode == "async":
+    async_engine = create_async_engine(
+        database_url.set(drivername="sqlite+aiosqlite"),
+        **_engine_options(settings.database_pool_size, poolclass=AsyncAdaptedQueuePool)
+    )
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    AsyncSessionLocal = AsyncReadSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+    if read_only_url is not None:
+        async_read_engine = create_async_engine(
+            read_only_url.set(drivername="sqlite+aiosqlite"),
+            **_engine_options(settings.database_read_pool_size, poolclass=AsyncAdaptedQueuePool)
+        )
+        event.listen(async_read_engine.sync_engine, "connect", _set_read_only_pragmas)
+        AsyncReadSessionLocal = async_sessionmaker(
+            async_read_engine, autoflush=False, expire_on_commit=False
+        )
+
+
+async def dispose_async_engines():
+    """풀에 남은 aiosqlite 커넥션 정리 (커넥션 스레드가 종료를 막지 않도록)"""
+    for pooled_engine in (async_engine, async_read_engine):
+        if pooled_engine is not None:
+            await pooled_engine.dispose()
+
+
 # Base 클래스 생성
 Base = declarative_base()
 
 
-# 데이터베이스 세션 의존성
-def get_db():
-    db = SessionLocal()
+# 데이터베이스 세션 의존성 (GET 요청은 읽기 전용 세션)
+def get_db(request: Request):
+    db = ReadSessionLocal() if request.method in READ_METHODS else SessionLocal()
     try:
         yield db
     finally:
         db.close()
 
+
+class ThreadpoolSession:
+    """동기 세션을 AsyncSession과 같은 run_sync 인터페이스로 감싼 어댑터 (스레드풀에서 실행)"""
+
+    def __init__(self, session):
+        self.sync_session = session
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+    async def close(self):
+        await run_in_threadpool(self.sync_session.close)
+
+
+def _async_session(read_only: bool):
+    if AsyncSessionLocal is not None:
+        return AsyncReadSessionLocal() if read_only else AsyncSessionLocal()
+    return ThreadpoolSession(ReadSessionLocal() if read_only else SessionLocal())
+
+
+# 비동기 라우트용 세션 의존성 (database_mode에 따라 AsyncSession 또는 스레드풀 어댑터)
+async def get_async_db(request: Request):
+    db = _async_session(request.method in READ_METHODS)
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+# 본문이 필요해 POST로 받는 조회 전용 라우트용 (항상 읽기 전용 세션)
+async def get_async_read_db():
+    db = _async_session(read_only=True)
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -1,20 +1,42 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from .cache import cache
 from .config import settings
-from .database import engine, Base
+from .database import engine, Base, dispose_async_engines
+from .middleware import ResponseCacheMiddleware
+from .migrations import run_migrations
+from .services.scheduler import scheduler
 
 # 모델 import (테이블 생성을 위해 필요)
 from .models import segment, campaign, experiment
 
 # 데이터베이스 테이블 생성
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 백그라운드 refresh 스케줄러 시작/종료 (세그먼트 쿼리, 지표 값, 압축)
+    scheduler.start()
+    yield
+    # 실행 중인 작업이 끝날 때까지 기다리므로 이벤트 루프를 막지 않도록 스레드에서 종료
+    await asyncio.to_thread(scheduler.stop)
+    await dispose_async_engines()
+
 
 app = FastAPI(
     title="DataHub API",
     description="데이터 분석 및 인사이트 제공 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# GET 응답 캐시 (CORS 헤더가 캐시 응답에도 붙도록 CORS보다 안쪽에 등록)
+app.add_middleware(ResponseCacheMiddleware, cache=cache)
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -36,8 +58,10 @@ async def health_check():
 
 
 # 라우터 임포트
-from .routes import metrics, segments, experiments
+from .routes import metrics, segments, experiments, search, admin
 app.include_router(metrics.router, prefix="/api/metrics", tags=["metrics"])
 app.include_router(segments.router, prefix="/api/segments", tags=["segments"])
 app.include_router(experiments.router, prefix="/api/experiments", tags=["experiments"])
+app.include_router(search.router, prefix="/api/search", tags=["search"])
+app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
 
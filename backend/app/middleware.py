@@ -0,0 +1,137 @@
+import hashlib
+import json
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+from .cache import CachedResponse
+from .config import settings
+
+# 경로 접두사별 캐시 태그 (해당 태그가 무효화되면 캐시 항목도 무효)
+CACHE_TAGS: Dict[str, Tuple[str, ...]] = {
+    "/api/metrics": ("metrics",),
+    "/api/segments": ("segments",),
+    "/api/experiments": ("experiments",),
+    "/api/search": ("metrics", "segments", "experiments"),
+}
+
+# 다른 엔티티의 데이터에 의존하는 하위 경로의 추가 태그
+PATH_SUFFIX_TAGS: Dict[str, Tuple[str, ...]] = {
+    "/design": ("metrics",),
+    "/experiments": ("experiments",),
+}
+
+# 캐시된 원본 헤더 중 재전송 시 새로 채우는 헤더
+_REPLACED_HEADERS = (b"content-length", b"etag", b"cache-control")
+
+
+def tags_for_path(path: str) -> Optional[Tuple[str, ...]]:
+    for prefix, tags in CACHE_TAGS.items():
+        if path == prefix or path.startswith(prefix + "/"):
+            entity_id = path[len(prefix) + 1:].split("/", 1)[0]
+            if entity_id.isdigit():
+                # 개별 엔티티 경로는 엔티티 단위 태그(예: experiments:3)도 함께 사용
+                tags = tags + (f"{tags[0]}:{entity_id}",)
+                for suffix, extra in PATH_SUFFIX_TAGS.items():
+                    if path.endswith(suffix):
+                        tags = tags + extra
+            return tags
+    return None
+
+
+def make_etag(body: bytes) -> str:
+    """본문 해시 기반 강한 ETag"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+class ResponseCacheMiddleware:
+    """GET API 응답 캐시 + ETag/304 처리
+
+    캐시 키는 경로 + 정렬된 쿼리 문자열 + 태그별 무효화 세대로 구성되어,
+    서비스 계층의 쓰기 작업이 태그를 무효화하면 이전 항목은 더 이상 조회되지 않는다.
+    캐시 적중 시 라우트(DB)를 거치지 않고 응답하며, If-None-Match가 일치하면 304를 반환한다.
+    """
+
+    def __init__(self, app, cache):
+        self.app = app
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return await self.app(scope, receive, send)
+        tags = tags_for_path(scope["path"])
+        if tags is None:
+            return await self.app(scope, receive, send)
+
+        key = self._cache_key(scope, tags)
+        if_none_match = None
+        for name, value in scope["headers"]:
+            if name == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+                break
+
+        entry = self.cache.get(key)
+        if entry is not None:
+            return await self._send_entry(send, entry, if_none_match, hit=True)
+
+        captured = {"start": None, "chunks": [], "size": 0, "passthrough": False}
+
+        async def capture(message):
+            if captured["passthrough"]:
+                return await send(message)
+            if message["type"] == "http.response.start":
+                # 200 이외의 응답은 캐시하지 않음
+                if message["status"] != 200:
+                    captured["passthrough"] = True
+                    return await send(message)
+                captured["start"] = message
+                return
+            if message["type"] == "http.response.body":
+                captured["chunks"].append(message.get("body", b""))
+                captured["size"] += len(message.get("body", b""))
+                if message.get("more_body", False):
+                    # 대용량/스트리밍 응답은 버퍼링을 멈추고 그대로 전달
+                    if captured["size"] > settings.cache_max_entry_bytes:
+                        captured["passthrough"] = True
+                        await send(captured["start"])
+                        await send({"type": "http.response.body", "body": b"".join(captured["chunks"]), "more_body": True})
+                    return
+                body = b"".join(captured["chunks"])
+                headers = [
+                    [name.decode("latin-1"), value.decode("latin-1")]
+                    for name, value in captured["start"]["headers"]
+                    if name.lower() not in _REPLACED_HEADERS
+                ]
+                entry = CachedResponse(body, json.dumps(headers), make_etag(body))
+                if len(body) <= settings.cache_max_entry_bytes:
+                    self.cache.set(key, entry, settings.cache_ttl_seconds)
+                await self._send_entry(send, entry, if_none_match, hit=False)
+
+        await self.app(scope, receive, capture)
+
+    def _cache_key(self, scope, tags) -> str:
+        query = parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)
+        generations = ",".join(f"{tag}:{self.cache.generation(tag)}" for tag in tags)
+        return f"{scope['path']}?{urlencode(sorted(query))}|{generations}"
+
+    async def _send_entry(self, send, entry: CachedResponse, if_none_match: Optional[str], hit: bool):
+        headers = [
+            (b"etag", entry.etag.encode("latin-1")),
+            (b"cache-control", b"no-cache"),
+            (b"x-cache", b"HIT" if hit else b"MISS"),
+        ]
+        if _etag_matches(if_none_match, entry.etag):
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        headers += [
+            (name.encode("latin-1"), value.encode("latin-1")) for name, value in json.loads(entry.headers)
+        ]
+        headers.append((b"content-length", str(len(entry.body)).encode("latin-1")))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": entry.body})
@@ -0,0 +1,209 @@
+import logging
+from sqlalchemy import inspect, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from .database import Base
+
+logger = logging.getLogger(__name__)
+
+
+def run_migrations(engine):
+    """기존 데이터베이스에 누락된 스키마 변경 적용 (idempotent)"""
+    _dedupe_metric_data_points(engine)
+    added_columns = _add_missing_columns(engine)
+    _create_missing_indexes(engine)
+    _create_search_index(engine)
+    _backfill_entity_counters(engine)
+    _backfill_experiment_accumulators(engine)
+    _backfill_experiment_metrics(engine)
+    _backfill_segment_bitmaps(engine)
+    _backfill_metric_dependencies(engine)
+    _warn_pending_maintenance(engine, rollup_sketches_added=("metric_rollups", "sketch") in added_columns)
+
+
+def _dedupe_metric_data_points(engine):
+    """(metric_id, timestamp) 유니크 인덱스 생성 전 중복 포인트 정리"""
+    index_names = {index["name"] for index in inspect(engine).get_indexes("metric_data_points")}
+    if "ix_metric_data_points_metric_id_timestamp" in index_names:
+        return
+
+    # 가장 최근에 적재된 행만 남긴다
+    with engine.begin() as conn:
+        conn.execute(text(
+            "DELETE FROM metric_data_points WHERE id NOT IN ("
+            "SELECT MAX(id) FROM metric_data_points GROUP BY metric_id, timestamp)"
+        ))
+
+
+def _add_missing_columns(engine):
+    """create_all은 기존 테이블에 새 컬럼을 추가하지 않으므로 nullable 컬럼만 ALTER TABLE로 추가
+
+    추가한 (테이블, 컬럼) 집합을 반환한다.
+    """
+    inspector = inspect(engine)
+    added = set()
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'))
+                added.add((table.name, column.name))
+    return added
+
+
+def _create_missing_indexes(engine):
+    """create_all은 기존 테이블의 신규 인덱스를 만들지 않으므로 별도로 생성"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+def _create_search_index(engine):
+    """FTS5 검색 인덱스 생성 후 비어 있으면 기존 엔티티로 채운다"""
+    from .services.search_service import SearchService, create_search_index
+
+    with engine.begin() as conn:
+        create_search_index(conn)
+        has_documents = conn.execute(text("SELECT 1 FROM search_index LIMIT 1")).first()
+    if has_documents:
+        return
+
+    with Session(engine) as db:
+        SearchService.rebuild(db)
+
+
+def _backfill_entity_counters(engine):
+    """통계 카운터가 비어 있으면 기존 엔티티로 채운다"""
+    from .services.stats_service import StatsService
+
+    with engine.connect() as conn:
+        if conn.execute(text("SELECT 1 FROM entity_counters LIMIT 1")).first():
+            return
+
+    with Session(engine) as db:
+        StatsService.rebuild(db)
+
+
+def _backfill_experiment_accumulators(engine):
+    """실험 누적 통계량이 비어 있고 관측값이 있으면 원본으로부터 계산"""
+    from .services.experiment_analysis_service import ExperimentAnalysisService
+
+    with engine.connect() as conn:
+        if conn.execute(text("SELECT 1 FROM experiment_accumulators LIMIT 1")).first():
+            return
+        if not conn.execute(text("SELECT 1 FROM experiment_observations LIMIT 1")).first():
+            return
+
+    with Session(engine) as db:
+        ExperimentAnalysisService.rebuild_accumulators(db)
+
+
+def _backfill_experiment_metrics(engine):
+    """실험-지표 연결 테이블이 비어 있으면 기존 실험의 지표 JSON 필드로 채운다
+
+    필요한 컬럼만 읽고, *_metric_ids 컬럼이 없는 오래된 experiments 테이블이면 건너뛴다.
+    """
+    from .models.experiment import Experiment
+    from .models.experiment_metric import ExperimentMetric
+    from .services.experiment_service import metric_links
+
+    with engine.connect() as conn:
+        if conn.execute(text("SELECT 1 FROM experiment_metrics LIMIT 1")).first():
+            return
+        try:
+            experiments = conn.execute(select(
+                Experiment.id,
+                Experiment.primary_metric_ids,
+                Experiment.secondary_metric_ids,
+                Experiment.guardrail_metric_ids,
+            )).all()
+        except OperationalError:
+            logger.warning("experiment_metrics backfill skipped: experiments table schema is out of date")
+            return
+
+    links = [link for experiment in experiments for link in metric_links(experiment)]
+    if links:
+        with engine.begin() as conn:
+            conn.execute(ExperimentMetric.__table__.insert(), links)
+
+
+def _backfill_segment_bitmaps(engine):
+    """멤버십은 있는데 비트맵이 없으면 멤버십 행으로 비트맵 생성"""
+    from .services.segment_bitmap_service import SegmentBitmapService
+
+    with engine.connect() as conn:
+        if conn.execute(text("SELECT 1 FROM segment_bitmaps LIMIT 1")).first():
+            return
+        if not conn.execute(text("SELECT 1 FROM segment_memberships LIMIT 1")).first():
+            return
+
+    with Session(engine) as db:
+        SegmentBitmapService.rebuild(db)
+
+
+def _backfill_metric_dependencies(engine):
+    """calculation_logic이 식인 기존 지표의 의존 간선 생성 (의존 테이블이 비어 있을 때만)"""
+    from .services.metric_expressions import is_expression, parse_expression
+
+    with engine.connect() as conn:
+        if conn.execute(text("SELECT 1 FROM metric_dependencies LIMIT 1")).first():
+            return
+        rows = conn.execute(text("SELECT id, calculation_logic FROM metrics WHERE calculation_logic LIKE '%metric%[%'")).all()
+
+    edges = []
+    for metric_id, logic in rows:
+        if not is_expression(logic):
+            continue
+        try:
+            expression = parse_expression(logic)
+        except ValueError:
+            continue  # 설명 문장이 식처럼 보이는 경우는 건너뛴다
+        edges.extend({"metric_id": metric_id, "input_metric_id": input_id} for input_id in expression.inputs)
+    if edges:
+        with engine.begin() as conn:
+            conn.execute(text(
+                "INSERT OR IGNORE INTO metric_dependencies (metric_id, input_metric_id) VALUES (:metric_id, :input_metric_id)"
+            ), edges)
+
+
+def rollups_need_rebuild(engine) -> bool:
+    """원본 포인트가 있는데 롤업이 비어 있거나, 스케치가 없는 시간별 롤업(sketch 컬럼 추가 이전 행)이 있는지
+
+    시간별 롤업은 원본이 남아 있는 구간에만 있으므로 스케치를 다시 만들 수 있다.
+    """
+    with engine.connect() as conn:
+        if not conn.execute(text("SELECT 1 FROM metric_data_points LIMIT 1")).first():
+            return False
+        if not conn.execute(text("SELECT 1 FROM metric_rollups LIMIT 1")).first():
+            return True
+        return conn.execute(text(
+            "SELECT 1 FROM metric_rollups WHERE granularity = 'hour' AND sketch IS NULL LIMIT 1"
+        )).first() is not None
+
+
+def incremental_vacuum_pending(engine) -> bool:
+    """파일 DB가 아직 auto_vacuum=INCREMENTAL로 전환되지 않았는지 (전체 VACUUM 1회 필요)
+
+    연결 시 auto_vacuum=INCREMENTAL을 설정하지만 이전에 만든 파일은 VACUUM 전까지 NONE으로 남아
+    압축 작업이 삭제한 페이지를 반환하지 못한다.
+    """
+    if not engine.url.database or engine.url.database == ":memory:":
+        return False
+    with engine.connect() as conn:
+        return conn.execute(text("PRAGMA auto_vacuum")).scalar() != 2
+
+
+def _warn_pending_maintenance(engine, rollup_sketches_added: bool):
+    """시작 시에는 오래 걸리는 백필/VACUUM을 하지 않고 필요 여부만 확인해 관리 명령을 안내"""
+    with engine.connect() as conn:
+        rollups_empty = (
+            conn.execute(text("SELECT 1 FROM metric_data_points LIMIT 1")).first() is not None
+            and conn.execute(text("SELECT 1 FROM metric_rollups LIMIT 1")).first() is None
+        )
+    if rollups_empty or rollup_sketches_added:
+        logger.warning("metric rollups are incomplete: run 'python -m app.cli maintenance' to rebuild them")
+    if incremental_vacuum_pending(engine):
+        logger.warning("incremental vacuum is not enabled: run 'python -m app.cli maintenance' to apply it")
@@ -2,6 +2,14 @@
 # from .insight import Insight
 from .metric import Metric
 from .metric_data_point import MetricDataPoint
+from .metric_rollup import MetricRollup
 from .segment import Segment
+from .entity_counter import EntityCounter
+from .experiment_observation import ExperimentObservation
+from .experiment_accumulator import ExperimentAccumulator
+from .experiment_metric import ExperimentMetric
+from .metric_alert import MetricAlert, MetricAlertState
+from .metric_dependency import MetricDependency, MetricChange
+from .segment_membership import SegmentMembership, SegmentRefresh, SegmentMemberKey, SegmentBitmap
 
-__all__ = ["Metric", "MetricDataPoint", "Segment"]
+__all__ = ["Metric", "MetricDataPoint", "MetricRollup", "Segment", "EntityCounter", "ExperimentObservation", "ExperimentAccumulator", "ExperimentMetric", "MetricAlert", "MetricAlertState", "MetricDependency", "MetricChange", "SegmentMembership", "SegmentRefresh", "SegmentMemberKey", "SegmentBitmap"]
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, String
+from ..database import Base
+
+
+class EntityCounter(Base):
+    """엔티티 통계 카운터 (서비스 쓰기 시 같은 트랜잭션에서 증감)"""
+    __tablename__ = "entity_counters"
+
+    scope = Column(String(50), primary_key=True)  # 예: metric.status
+    key = Column(String(100), primary_key=True)  # 예: 활성화
+    value = Column(Integer, nullable=False, default=0)
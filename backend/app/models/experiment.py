@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Text, ForeignKey, Index
 from sqlalchemy.sql import func
 from ..database import Base
 
 
 class Experiment(Base):
     __tablename__ = "experiments"
+    __table_args__ = (
+        # 최신 생성 순 키셋 페이지네이션용 인덱스
+        Index("ix_experiments_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
 
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from ..database import Base
+
+
+class ExperimentAccumulator(Base):
+    """(실험, 지표, 그룹)별 충분통계량 (Welford n / 평균 / 편차제곱합, 적재 시 병합)"""
+    __tablename__ = "experiment_accumulators"
+
+    experiment_id = Column(Integer, ForeignKey("experiments.id", ondelete="CASCADE"), primary_key=True)
+    metric_id = Column(Integer, ForeignKey("metrics.id", ondelete="CASCADE"), primary_key=True)
+    variant = Column(String(100), primary_key=True)
+    n = Column(Integer, nullable=False, default=0)
+    mean = Column(Float, nullable=False, default=0.0)
+    m2 = Column(Float, nullable=False, default=0.0)  # 평균 대비 편차제곱합
+    min_value = Column(Float, nullable=True)
+    max_value = Column(Float, nullable=True)
+    non_binary = Column(Integer, nullable=False, default=0)  # 0/1이 아닌 관측값 수 (비율 지표 판별)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from ..database import Base
+
+
+class ExperimentMetric(Base):
+    """실험-지표 연결 (Experiment의 *_metric_ids JSON을 정규화, ExperimentService가 동기화)"""
+    __tablename__ = "experiment_metrics"
+    __table_args__ = (
+        # 지표 기준 역조회용 인덱스 (지표 -> 역할 -> 실험)
+        Index("ix_experiment_metrics_metric_role", "metric_id", "role", "experiment_id"),
+    )
+
+    experiment_id = Column(Integer, ForeignKey("experiments.id", ondelete="CASCADE"), primary_key=True)
+    metric_id = Column(Integer, ForeignKey("metrics.id", ondelete="CASCADE"), primary_key=True)
+    role = Column(String(20), primary_key=True)  # primary / secondary / guardrail
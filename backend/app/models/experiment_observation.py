@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from ..database import Base
+
+
+class ExperimentObservation(Base):
+    """실험 단위(사용자 등)별 지표 관측값"""
+    __tablename__ = "experiment_observations"
+    __table_args__ = (
+        # 실험 결과 계산 시 (실험, 지표, 그룹) 단위 일괄 조회용 인덱스
+        Index("ix_experiment_observations_experiment_metric_variant", "experiment_id", "metric_id", "variant"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    experiment_id = Column(Integer, ForeignKey("experiments.id", ondelete="CASCADE"), nullable=False)
+    metric_id = Column(Integer, ForeignKey("metrics.id", ondelete="CASCADE"), nullable=False)
+    variant = Column(String(100), nullable=False)
+    unit_id = Column(String(100), nullable=True)  # 실험 단위 식별자 (선택)
+    value = Column(Float, nullable=False)
+    timestamp = Column(DateTime, server_default=func.now())
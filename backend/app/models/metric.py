@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text
+from sqlalchemy import Boolean, Column, Integer, String, Float, DateTime, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database import Base
@@ -21,6 +21,7 @@ class Metric(Base):
     alert_settings = Column(String, nullable=True)
     data_source = Column(Text, nullable=True)
     aggregation_period = Column(String(50), nullable=True)
+    higher_is_better = Column(Boolean, nullable=True)  # 값이 클수록 좋은 지표인지 (없으면 True, 가드레일 위반 방향)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
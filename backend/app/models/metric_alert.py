@@ -0,0 +1,35 @@
+from sqlalchemy import Boolean, Column, Integer, String, Float, DateTime, ForeignKey, Index, Text
+from sqlalchemy.sql import func
+from ..database import Base
+
+
+class MetricAlertState(Base):
+    """지표별 알림 평가 상태 (EWMA 평균/분산, 직전 값, 발생 중인 규칙) — 적재 시 포인트마다 O(1) 갱신"""
+    __tablename__ = "metric_alert_states"
+
+    metric_id = Column(Integer, ForeignKey("metrics.id", ondelete="CASCADE"), primary_key=True)
+    n = Column(Integer, nullable=False, default=0)
+    ewma_mean = Column(Float, nullable=False, default=0.0)
+    ewma_var = Column(Float, nullable=False, default=0.0)
+    last_value = Column(Float, nullable=True)
+    last_timestamp = Column(DateTime, nullable=True)
+    firing = Column(Text, nullable=False, default="[]")  # 발생 중인 규칙 키 (JSON 배열)
+    status_flagged = Column(Boolean, nullable=False, default=False)  # 알림으로 status를 "주의"로 바꿨는지
+
+
+class MetricAlert(Base):
+    """알림 발생/해소 이벤트"""
+    __tablename__ = "metric_alerts"
+    __table_args__ = (
+        Index("ix_metric_alerts_metric_id", "metric_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    metric_id = Column(Integer, ForeignKey("metrics.id", ondelete="CASCADE"), nullable=False)
+    rule = Column(String(100), nullable=False)
+    state = Column(String(20), nullable=False)  # firing / resolved
+    value = Column(Float, nullable=False)  # 규칙을 평가한 데이터 포인트 값
+    score = Column(Float, nullable=True)  # 규칙 입력값 (value / 변화율 % / z-score)
+    expected = Column(Float, nullable=True)  # 평가 시점 EWMA 평균
+    timestamp = Column(DateTime, nullable=False)  # 데이터 포인트 시각
+    created_at = Column(DateTime, server_default=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database import Base
@@ -6,6 +6,10 @@ from ..database import Base
 
 class MetricDataPoint(Base):
     __tablename__ = "metric_data_points"
+    __table_args__ = (
+        # (metric_id, timestamp) 기준 upsert 및 구간 조회용 인덱스
+        Index("ix_metric_data_points_metric_id_timestamp", "metric_id", "timestamp", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     metric_id = Column(Integer, ForeignKey("metrics.id", ondelete="CASCADE"), nullable=False)
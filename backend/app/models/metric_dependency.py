@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from ..database import Base
+
+
+class MetricDependency(Base):
+    """파생 지표 식의 입력 지표 (metric_id가 input_metric_id를 참조)"""
+    __tablename__ = "metric_dependencies"
+    __table_args__ = (
+        Index("ix_metric_dependencies_input", "input_metric_id", "metric_id"),
+    )
+
+    metric_id = Column(Integer, ForeignKey("metrics.id", ondelete="CASCADE"), primary_key=True)
+    input_metric_id = Column(Integer, primary_key=True)
+
+
+class MetricChange(Base):
+    """파생 지표 입력의 변경 구간 기록 (파생 시계열 메모의 부분 재계산용)
+
+    range_start/range_end가 NULL이면 해당 방향으로 구간 제한이 없다는 뜻이다 (둘 다 NULL이면 전체).
+    id는 재사용되지 않아야 하므로 AUTOINCREMENT로 만든다.
+    """
+    __tablename__ = "metric_changes"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    metric_id = Column(Integer, nullable=False)
+    range_start = Column(DateTime, nullable=True)
+    range_end = Column(DateTime, nullable=True)  # 포함 (마지막으로 바뀐 timestamp)
+    created_at = Column(DateTime, server_default=func.now())
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, LargeBinary
+from ..database import Base
+
+
+class MetricRollup(Base):
+    """지표 데이터 포인트의 시간/일 단위 요약"""
+    __tablename__ = "metric_rollups"
+    __table_args__ = (
+        Index("ix_metric_rollups_metric_granularity_bucket", "metric_id", "granularity", "bucket_start", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    metric_id = Column(Integer, ForeignKey("metrics.id", ondelete="CASCADE"), nullable=False)
+    granularity = Column(String(10), nullable=False)  # hour / day
+    bucket_start = Column(DateTime, nullable=False)
+
+    # 요약 통계
+    value_count = Column(Integer, nullable=False)
+    value_sum = Column(Float, nullable=False)
+    value_min = Column(Float, nullable=False)
+    value_max = Column(Float, nullable=False)
+    value_sum_squares = Column(Float, nullable=False)
+    visitor_count_sum = Column(Integer, nullable=True)
+    last_value = Column(Float, nullable=True)
+    last_timestamp = Column(DateTime, nullable=False)
+    sketch = Column(LargeBinary, nullable=True)  # 버킷 값 분포의 t-digest (QuantileSketch 직렬화)
@@ -0,0 +1,42 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, LargeBinary
+from sqlalchemy.sql import func
+from ..database import Base
+
+
+class SegmentMembership(Base):
+    """세그먼트 쿼리 실행 결과 (세그먼트별 멤버 ID)"""
+    __tablename__ = "segment_memberships"
+
+    segment_id = Column(Integer, ForeignKey("segments.id", ondelete="CASCADE"), primary_key=True)
+    member_id = Column(String(255), primary_key=True)
+
+
+class SegmentRefresh(Base):
+    """세그먼트별 마지막 실행 상태 (입력이 같고 주기가 지나지 않았으면 재계산 생략)"""
+    __tablename__ = "segment_refreshes"
+
+    segment_id = Column(Integer, ForeignKey("segments.id", ondelete="CASCADE"), primary_key=True)
+    input_hash = Column(String(64), nullable=True)  # 쿼리 + 데이터 소스 파일 상태 해시
+    member_count = Column(Integer, nullable=False, default=0)
+    duration_ms = Column(Float, nullable=True)
+    error = Column(Text, nullable=True)
+    refreshed_at = Column(DateTime, nullable=True)  # 마지막 성공 시각
+    attempted_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+class SegmentMemberKey(Base):
+    """멤버 ID 문자열 -> 비트맵용 정수 ID 사전 (모든 세그먼트가 공유)"""
+    __tablename__ = "segment_member_keys"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    member_id = Column(String(255), nullable=False, unique=True)
+
+
+class SegmentBitmap(Base):
+    """세그먼트 멤버십 압축 비트맵 (Roaring 방식 직렬화, 집합 연산용)"""
+    __tablename__ = "segment_bitmaps"
+
+    segment_id = Column(Integer, ForeignKey("segments.id", ondelete="CASCADE"), primary_key=True)
+    cardinality = Column(Integer, nullable=False, default=0)
+    bitmap = Column(LargeBinary, nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -1,4 +1,4 @@
 # 라우터들을 여기에 임포트
-from . import metrics, segments
+from . import metrics, segments, experiments, search, admin
 
-__all__ = ["metrics", "segments"]
+__all__ = ["metrics", "segments", "experiments", "search", "admin"]
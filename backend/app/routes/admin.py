@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from ..database import get_db
+from ..services.compaction_service import compaction_worker
+from ..services.scheduler import scheduler
+from ..services.segment_execution_service import SegmentExecutionService
+from ..services.stats_service import StatsService
+
+router = APIRouter()
+
+
+@router.get("/compaction")
+def get_compaction_report():
+    """마지막 압축 작업 결과 조회"""
+    return {
+        "interval_seconds": compaction_worker.interval_seconds,
+        "last_report": compaction_worker.last_report
+    }
+
+
+@router.get("/scheduler")
+def get_scheduler_status():
+    """refresh 스케줄러 상태 (큐 길이, 지연, 작업별 실행 시간)"""
+    return scheduler.snapshot()
+
+
+@router.post("/compaction")
+def run_compaction():
+    """보존 기간이 지난 데이터 포인트 압축 즉시 실행"""
+    return compaction_worker.run_once()
+
+
+@router.post("/counters/repair")
+def repair_counters(db: Session = Depends(get_db)):
+    """통계 카운터를 원본 테이블 기준으로 재계산"""
+    drift = StatsService.rebuild(db)
+    return {"repaired": len(drift), "drift": drift}
+
+
+@router.post("/segments/refresh")
+def refresh_segments(force: bool = Query(False), db: Session = Depends(get_db)):
+    """재계산이 필요한 세그먼트 쿼리 일괄 실행"""
+    return {"results": SegmentExecutionService.refresh_due(db, force=force)}
@@ -0,0 +1,73 @@
+import json
+from typing import Type
+from fastapi import HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from ..config import settings
+
+# 일괄 적재 요청 본문 파싱 (JSON 배열 / NDJSON)
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+def _check_row_limit(count: int):
+    if count > settings.ingest_max_rows:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many rows (max {settings.ingest_max_rows})"
+        )
+
+
+def _parse_ndjson_line(line: bytes, line_number: int):
+    try:
+        return json.loads(line)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON at line {line_number}")
+
+
+async def _read_ndjson(request: Request):
+    """NDJSON 본문을 수신하는 대로 한 줄씩 파싱"""
+    rows = []
+    buffer = b""
+    line_number = 0
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                rows.append(_parse_ndjson_line(line, line_number))
+        _check_row_limit(len(rows))
+    if buffer.strip():
+        rows.append(_parse_ndjson_line(buffer, line_number + 1))
+        _check_row_limit(len(rows))
+    return rows
+
+
+async def _read_json_array(request: Request):
+    try:
+        rows = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=400, detail="Request body must be a JSON array")
+    _check_row_limit(len(rows))
+    return rows
+
+
+def bulk_body(model: Type[BaseModel]):
+    """JSON 배열 또는 NDJSON 본문을 model 리스트로 일괄 검증하는 의존성 생성"""
+    adapter = TypeAdapter(list[model])
+
+    async def dependency(request: Request):
+        content_type = request.headers.get("content-type", "").split(";")[0].strip()
+        if content_type in NDJSON_CONTENT_TYPES:
+            rows = await _read_ndjson(request)
+        else:
+            rows = await _read_json_array(request)
+
+        try:
+            return adapter.validate_python(rows)
+        except ValidationError as e:
+            raise RequestValidationError(e.errors())
+
+    return dependency
@@ -1,59 +1,188 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
 from typing import Optional
-from ..database import get_db
-from ..schemas.experiment import ExperimentResponse, ExperimentCreate, ExperimentUpdate, ExperimentListResponse
-from ..services.experiment_service import ExperimentService
+from ..database import get_async_db
+from ..schemas.experiment import (
+    ExperimentResponse,
+    ExperimentCreate,
+    ExperimentUpdate,
+    ExperimentListResponse,
+    EXPERIMENT_SUMMARY_FIELDS,
+    ExperimentObservationIngest,
+    AssignmentBatchRequest,
+    MetricRole
+)
+from ..schemas.metric_data_point import IngestResponse
+from ..services.async_services import (
+    AsyncExperimentService,
+    AsyncExperimentAnalysisService,
+    AsyncExperimentDesignService,
+    AsyncAssignmentService
+)
+from .bulk import bulk_body
+from .projection import fields_query, projected_response
+
 
 router = APIRouter()
 
 
 @router.get("/", response_model=ExperimentListResponse)
-def get_experiments(
+async def get_experiments(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     search: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None),
+    include_total: bool = Query(True),
+    metric_id: Optional[int] = Query(None),
+    role: Optional[MetricRole] = Query(None),
+    fields=Depends(fields_query(ExperimentResponse, EXPERIMENT_SUMMARY_FIELDS)),
+    db=Depends(get_async_db)
 ):
-    """모든 실험 조회"""
-    return ExperimentService.get_all_experiments(
-        db=db,
-        skip=skip,
-        limit=limit,
-        search=search,
-        status=status
-    )
+    """모든 실험 조회 (metric_id/role로 특정 지표를 사용하는 실험만 필터, 기본은 요약 필드)"""
+    try:
+        result = await AsyncExperimentService.get_all_experiments(
+            db=db,
+            skip=skip,
+            limit=limit,
+            search=search,
+            status=status,
+            cursor=cursor,
+            include_total=include_total,
+            metric_id=metric_id,
+            role=role,
+            fields=fields
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return projected_response(result, ExperimentResponse, fields, ExperimentListResponse)
 
 
 @router.get("/{experiment_id}", response_model=ExperimentResponse)
-def get_experiment(experiment_id: int, db: Session = Depends(get_db)):
+async def get_experiment(
+    experiment_id: int,
+    fields=Depends(fields_query(ExperimentResponse)),
+    db=Depends(get_async_db)
+):
     """특정 실험 조회"""
-    experiment = ExperimentService.get_experiment_by_id(db, experiment_id)
+    experiment = await AsyncExperimentService.get_experiment_by_id(db, experiment_id, fields=fields)
     if not experiment:
         raise HTTPException(status_code=404, detail="Experiment not found")
-    return experiment
+    return projected_response(experiment, ExperimentResponse, fields)
+
+
+@router.get("/{experiment_id}/results")
+async def get_experiment_results(experiment_id: int, db=Depends(get_async_db)):
+    """실험 결과 (지표 x 그룹별 리프트, 신뢰구간, p-value, 가드레일 위반)"""
+    try:
+        results = await AsyncExperimentAnalysisService.get_results(db, experiment_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if results is None:
+        raise HTTPException(status_code=404, detail="Experiment not found")
+    return results
+
+
+@router.get("/{experiment_id}/design")
+async def get_experiment_design(
+    experiment_id: int,
+    metric_id: Optional[int] = Query(None),
+    alpha: Optional[float] = Query(None, gt=0, lt=1),
+    power: Optional[float] = Query(None, gt=0, lt=1),
+    mde: Optional[float] = Query(None, gt=0, le=1),
+    baseline_mean: Optional[float] = Query(None),
+    baseline_std: Optional[float] = Query(None, gt=0),
+    aggregate_variance: bool = Query(False, description="비율 지표가 아니면 집계 값의 분산을 단위 분산으로 사용"),
+    db=Depends(get_async_db)
+):
+    """실험 설계 (필요 표본 수, 예상 기간, 검정력 곡선). 쿼리 값은 저장된 설계 값을 덮어씀"""
+    try:
+        design = await AsyncExperimentDesignService.get_design(
+            db,
+            experiment_id,
+            metric_id=metric_id,
+            alpha=alpha,
+            power=power,
+            mde=mde,
+            baseline_mean=baseline_mean,
+            baseline_std=baseline_std,
+            aggregate_variance=aggregate_variance
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if design is None:
+        raise HTTPException(status_code=404, detail="Experiment not found")
+    return design
+
+
+@router.get("/{experiment_id}/assign")
+async def assign_experiment_variant(
+    experiment_id: int,
+    unit_id: str = Query(..., min_length=1, max_length=256),
+    db=Depends(get_async_db)
+):
+    """단위 ID의 실험 그룹 배정 (결정적 해시 기반)"""
+    try:
+        assignment = await AsyncAssignmentService.assign(db, experiment_id, unit_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if assignment is None:
+        raise HTTPException(status_code=404, detail="Experiment not found")
+    return assignment
+
+
+@router.post("/{experiment_id}/assign:batch")
+async def assign_experiment_variants(
+    experiment_id: int,
+    request: AssignmentBatchRequest,
+    db=Depends(get_async_db)
+):
+    """단위 ID 일괄 그룹 배정 (입력 순서대로 그룹 이름, 실험 대상이 아니면 null)"""
+    try:
+        assignments = await AsyncAssignmentService.assign_batch(db, experiment_id, request.unit_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if assignments is None:
+        raise HTTPException(status_code=404, detail="Experiment not found")
+    return assignments
+
+
+@router.post("/{experiment_id}/observations:batch", response_model=IngestResponse)
+async def ingest_experiment_observations(
+    experiment_id: int,
+    observations: list[ExperimentObservationIngest] = Depends(bulk_body(ExperimentObservationIngest)),
+    db=Depends(get_async_db)
+):
+    """실험 관측값 일괄 적재 (JSON 배열 또는 NDJSON)"""
+    try:
+        result = await AsyncExperimentAnalysisService.ingest_observations(
+            db, experiment_id, (observation.model_dump() for observation in observations)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Experiment not found")
+    return result
 
 
 @router.post("/", response_model=ExperimentResponse)
-def create_experiment(experiment: ExperimentCreate, db: Session = Depends(get_db)):
+async def create_experiment(experiment: ExperimentCreate, db=Depends(get_async_db)):
     """새 실험 생성"""
-    return ExperimentService.create_experiment(db, experiment)
+    return await AsyncExperimentService.create_experiment(db, experiment)
 
 
 @router.put("/{experiment_id}", response_model=ExperimentResponse)
-def update_experiment(experiment_id: int, experiment: ExperimentUpdate, db: Session = Depends(get_db)):
+async def update_experiment(experiment_id: int, experiment: ExperimentUpdate, db=Depends(get_async_db)):
     """실험 업데이트"""
-    updated_experiment = ExperimentService.update_experiment(db, experiment_id, experiment)
+    updated_experiment = await AsyncExperimentService.update_experiment(db, experiment_id, experiment)
     if not updated_experiment:
         raise HTTPException(status_code=404, detail="Experiment not found")
     return updated_experiment
 
 
 @router.delete("/{experiment_id}")
-def delete_experiment(experiment_id: int, db: Session = Depends(get_db)):
+async def delete_experiment(experiment_id: int, db=Depends(get_async_db)):
     """실험 삭제"""
-    success = ExperimentService.delete_experiment(db, experiment_id)
+    success = await AsyncExperimentService.delete_experiment(db, experiment_id)
     if not success:
         raise HTTPException(status_code=404, detail="Experiment not found")
     return {"message": "Experiment deleted successfully"}
@@ -1,81 +1,318 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import Optional
-from ..database import get_db
-from ..schemas.metric import MetricResponse, MetricCreate, MetricUpdate, MetricListResponse
-from ..services.metric_service import MetricService
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+from datetime import datetime
+from ..config import settings
+from ..database import get_async_db, get_async_read_db
+from ..schemas.metric import (
+    MetricResponse,
+    MetricCreate,
+    MetricUpdate,
+    MetricListResponse,
+    METRIC_SUMMARY_FIELDS,
+    MetricAlertListResponse,
+    AlertState
+)
+from ..schemas.metric_data_point import (
+    MetricDataPointCreate,
+    MetricDataPointIngest,
+    IngestResponse,
+    TimeBucket,
+    Aggregation,
+    ExportFormat,
+    TimeSeriesBatchRequest
+)
+from ..schemas.experiment import MetricExperimentsResponse, MetricRole
+from ..services.async_services import (
+    AsyncMetricService,
+    AsyncDataPointService,
+    AsyncExperimentService,
+    AsyncAlertService
+)
+from ..services.export_service import EXPORT_FORMATS, ExportService
+from ..services.quantile_service import parse_quantiles
+from ..services.series_transforms import parse_transforms
+from .bulk import bulk_body
+from .projection import fields_query, projected_response
 
 router = APIRouter()
 
 
+def _export_response(metric_ids: List[int], export_format: str, start, end, filename: str):
+    """데이터 포인트 스트리밍 응답 (행 수와 무관하게 배치 크기만큼만 메모리 사용)"""
+    try:
+        ExportService.check_format(export_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    media_type, extension = EXPORT_FORMATS[export_format]
+    return StreamingResponse(
+        ExportService.stream(metric_ids, export_format, start=start, end=end),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{extension}"'}
+    )
+
+
 @router.get("/", response_model=MetricListResponse)
-def get_metrics(
+async def get_metrics(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     search: Optional[str] = Query(None),
     category: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None),
+    include_total: bool = Query(True),
+    fields=Depends(fields_query(MetricResponse, METRIC_SUMMARY_FIELDS)),
+    db=Depends(get_async_db)
 ):
-    """모든 지표 조회"""
-    return MetricService.get_all_metrics(
-        db=db, 
-        skip=skip, 
-        limit=limit,
-        search=search,
-        category=category,
-        status=status
-    )
+    """모든 지표 조회 (기본은 요약 필드, fields=all이면 전체)"""
+    try:
+        result = await AsyncMetricService.get_all_metrics(
+            db=db, 
+            skip=skip, 
+            limit=limit,
+            search=search,
+            category=category,
+            status=status,
+            cursor=cursor,
+            include_total=include_total,
+            fields=fields
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return projected_response(result, MetricResponse, fields, MetricListResponse)
 
 
 @router.get("/stats")
-def get_metrics_stats(db: Session = Depends(get_db)):
+async def get_metrics_stats(db=Depends(get_async_db)):
     """지표 통계 조회"""
-    return MetricService.get_metrics_stats(db)
+    return await AsyncMetricService.get_metrics_stats(db)
+
+
+@router.get("/alerts", response_model=MetricAlertListResponse)
+async def get_alerts(
+    metric_id: Optional[int] = Query(None),
+    state: Optional[AlertState] = Query(None),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
+    db=Depends(get_async_db)
+):
+    """알림 발생/해소 이벤트 피드 (최신 순)"""
+    try:
+        return await AsyncAlertService.get_alerts(db, metric_id=metric_id, state=state, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/export")
+async def export_metrics_data(
+    metric_ids: List[int] = Query(..., min_length=1),
+    format: ExportFormat = Query("csv"),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    db=Depends(get_async_db)
+):
+    """여러 지표의 데이터 포인트 전체 내보내기 (CSV / NDJSON / Arrow IPC 스트리밍)"""
+    missing = await AsyncDataPointService.find_missing_metric_ids(db, metric_ids)
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Metric not found: {missing}")
+    return _export_response(sorted(set(metric_ids)), format, start, end, "metrics")
 
 
 @router.get("/{metric_id}", response_model=MetricResponse)
-def get_metric(metric_id: int, db: Session = Depends(get_db)):
+async def get_metric(
+    metric_id: int,
+    fields=Depends(fields_query(MetricResponse)),
+    db=Depends(get_async_db)
+):
     """특정 지표 조회"""
-    metric = MetricService.get_metric_by_id(db, metric_id)
+    metric = await AsyncMetricService.get_metric_by_id(db, metric_id, fields=fields)
     if not metric:
         raise HTTPException(status_code=404, detail="Metric not found")
-    return metric
+    return projected_response(metric, MetricResponse, fields)
+
+
+@router.get("/{metric_id}/experiments", response_model=MetricExperimentsResponse)
+async def get_metric_experiments(
+    metric_id: int,
+    role: Optional[MetricRole] = Query(None),
+    status: Optional[str] = Query(None),
+    db=Depends(get_async_db)
+):
+    """지표를 사용하는 실험 목록 (역할/상태 필터)"""
+    result = await AsyncExperimentService.get_experiments_by_metric(db, metric_id, role=role, status=status)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Metric not found")
+    return result
+
+
+@router.get("/{metric_id}/alert-rules")
+async def get_metric_alert_rules(metric_id: int, db=Depends(get_async_db)):
+    """alert_settings를 컴파일한 규칙, 해석하지 못한 항목, 현재 평가 상태"""
+    result = await AsyncAlertService.get_alert_rules(db, metric_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Metric not found")
+    return result
 
 
 @router.get("/{metric_id}/timeseries")
-def get_metric_timeseries(
+async def get_metric_timeseries(
     metric_id: int,
-    limit: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db)
+    limit: Optional[int] = Query(None, ge=1, le=settings.timeseries_max_points),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    bucket: Optional[TimeBucket] = Query(None),
+    agg: Aggregation = Query("avg"),
+    transforms: Optional[str] = Query(
+        None, description="쉼표로 구분한 변환 (ma:N, ewma:A, cumsum, pop:N, trend, forecast:N)"
+    ),
+    db=Depends(get_async_db)
 ):
-    """지표의 시계열 데이터 조회"""
-    metric = MetricService.get_metric_by_id(db, metric_id)
-    if not metric:
+    """지표의 시계열 데이터 조회 (기간 / 버킷 집계 / 이동 평균 등 변환)"""
+    try:
+        points = await AsyncMetricService.get_metric_time_series(
+            db,
+            metric_id,
+            limit=limit,
+            start=start,
+            end=end,
+            bucket=bucket,
+            agg=agg,
+            transforms=parse_transforms(transforms)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # 결과가 비었을 때만 지표 존재 여부 확인
+    if not points and await AsyncDataPointService.find_missing_metric_ids(db, [metric_id]):
         raise HTTPException(status_code=404, detail="Metric not found")
+    return points
+
 
-    return MetricService.get_metric_time_series(db, metric_id, limit)
+@router.get("/{metric_id}/quantiles")
+async def get_metric_quantiles(
+    metric_id: int,
+    q: str = Query("0.5,0.95,0.99", description="쉼표로 구분한 분위 (0~1)"),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    db=Depends(get_async_db)
+):
+    """구간 내 원본 값의 분위수 (롤업 버킷별 t-digest 병합)"""
+    try:
+        result = await AsyncMetricService.get_quantiles(db, metric_id, parse_quantiles(q), start=start, end=end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Metric not found")
+    return result
+
+
+@router.get("/{metric_id}/derived")
+async def get_metric_derived_series(
+    metric_id: int,
+    bucket: TimeBucket = Query("day"),
+    agg: Aggregation = Query("avg"),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    db=Depends(get_async_db)
+):
+    """파생 지표 시계열 (calculation_logic 식을 입력 지표의 버킷별 집계값에 적용)"""
+    try:
+        result = await AsyncMetricService.get_derived_series(db, metric_id, bucket=bucket, agg=agg, start=start, end=end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Metric not found")
+    return result
+
+
+@router.get("/{metric_id}/export")
+async def export_metric_data(
+    metric_id: int,
+    format: ExportFormat = Query("csv"),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    db=Depends(get_async_db)
+):
+    """지표의 데이터 포인트 전체 내보내기 (CSV / NDJSON / Arrow IPC 스트리밍)"""
+    if await AsyncDataPointService.find_missing_metric_ids(db, [metric_id]):
+        raise HTTPException(status_code=404, detail="Metric not found")
+    return _export_response([metric_id], format, start, end, f"metric_{metric_id}")
+
+
+@router.post("/timeseries:batch")
+async def get_metrics_timeseries_batch(
+    request: TimeSeriesBatchRequest,
+    db=Depends(get_async_read_db)
+):
+    """여러 지표의 시계열 일괄 조회 (대시보드용, 지표별 컬럼 배열)"""
+    missing = await AsyncDataPointService.find_missing_metric_ids(db, request.metric_ids)
+    series = await AsyncMetricService.get_metric_time_series_batch(
+        db,
+        [metric_id for metric_id in request.metric_ids if metric_id not in missing],
+        limit=request.limit,
+        start=request.start,
+        end=request.end,
+        bucket=request.bucket,
+        agg=request.agg
+    )
+    return {"series": series, "missing": missing}
+
+
+@router.post("/datapoints:batch", response_model=IngestResponse)
+async def ingest_data_points(
+    points: list[MetricDataPointCreate] = Depends(bulk_body(MetricDataPointCreate)),
+    db=Depends(get_async_db)
+):
+    """여러 지표의 데이터 포인트 일괄 적재 (JSON 배열 또는 NDJSON)"""
+    missing = await AsyncDataPointService.find_missing_metric_ids(db, {point.metric_id for point in points})
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Metric not found: {missing}")
+
+    return await AsyncDataPointService.ingest_data_points(db, (point.model_dump() for point in points))
+
+
+@router.post("/{metric_id}/datapoints:batch", response_model=IngestResponse)
+async def ingest_metric_data_points(
+    metric_id: int,
+    points: list[MetricDataPointIngest] = Depends(bulk_body(MetricDataPointIngest)),
+    db=Depends(get_async_db)
+):
+    """단일 지표의 데이터 포인트 일괄 적재 (JSON 배열 또는 NDJSON)"""
+    if await AsyncDataPointService.find_missing_metric_ids(db, [metric_id]):
+        raise HTTPException(status_code=404, detail="Metric not found")
+
+    return await AsyncDataPointService.ingest_data_points(
+        db, ({"metric_id": metric_id, **point.model_dump()} for point in points)
+    )
 
 
 @router.post("/", response_model=MetricResponse)
-def create_metric(metric: MetricCreate, db: Session = Depends(get_db)):
+async def create_metric(metric: MetricCreate, db=Depends(get_async_db)):
     """새 지표 생성"""
-    return MetricService.create_metric(db, metric)
+    try:
+        return await AsyncMetricService.create_metric(db, metric)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.put("/{metric_id}", response_model=MetricResponse)
-def update_metric(metric_id: int, metric: MetricUpdate, db: Session = Depends(get_db)):
+async def update_metric(metric_id: int, metric: MetricUpdate, db=Depends(get_async_db)):
     """지표 업데이트"""
-    updated_metric = MetricService.update_metric(db, metric_id, metric)
+    try:
+        updated_metric = await AsyncMetricService.update_metric(db, metric_id, metric)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not updated_metric:
         raise HTTPException(status_code=404, detail="Metric not found")
     return updated_metric
 
 
 @router.delete("/{metric_id}")
-def delete_metric(metric_id: int, db: Session = Depends(get_db)):
+async def delete_metric(metric_id: int, db=Depends(get_async_db)):
     """지표 삭제"""
-    success = MetricService.delete_metric(db, metric_id)
+    try:
+        success = await AsyncMetricService.delete_metric(db, metric_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not success:
         raise HTTPException(status_code=404, detail="Metric not found")
     return {"message": "Metric deleted successfully"}
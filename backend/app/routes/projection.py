@@ -0,0 +1,33 @@
+from typing import Optional, Sequence, Type
+from fastapi import HTTPException, Query
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from ..schemas.projection import parse_fields, projected_list_model, projected_model
+
+
+def fields_query(model: Type[BaseModel], default: Optional[Sequence[str]] = None):
+    """fields= 쿼리 의존성 (선택한 필드 튜플, 전체면 None, 없는 필드면 400)
+
+    default는 fields를 생략했을 때의 투영 (목록 화면용 요약 필드).
+    """
+    description = "쉼표로 구분한 응답 필드 (all이면 전체)"
+    if default is not None:
+        description += f", 기본값: {','.join(default)}"
+
+    def dependency(fields: Optional[str] = Query(None, description=description)):
+        try:
+            return parse_fields(fields, model, default)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return dependency
+
+
+def projected_response(data, model: Type[BaseModel], fields, list_model: Optional[Type[BaseModel]] = None):
+    """선택한 필드만 직렬화한 응답 (전체면 data를 그대로 반환해 라우트의 response_model로 직렬화)"""
+    if fields is None:
+        return data
+    if list_model is None:
+        response_model = projected_model(model, fields)
+    else:
+        response_model = projected_list_model(list_model, model, fields)
+    return JSONResponse(response_model.model_validate(data, from_attributes=True).model_dump(mode="json"))
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, Query
+from typing import List, Optional
+from ..database import get_async_db
+from ..schemas.search import EntityType, SearchResponse
+from ..services.async_services import AsyncSearchService
+
+
+router = APIRouter()
+
+
+@router.get("/", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1),
+    types: Optional[List[EntityType]] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    db=Depends(get_async_db)
+):
+    """지표/세그먼트/실험 통합 검색 (관련도 순)"""
+    items = await AsyncSearchService.search(db, q, types=types, limit=limit)
+    return {"total": len(items), "items": items}
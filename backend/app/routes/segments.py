@@ -1,65 +1,147 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import Optional
-from ..database import get_db
-from ..schemas.segment import SegmentResponse, SegmentCreate, SegmentUpdate, SegmentListResponse
-from ..services.segment_service import SegmentService
+from typing import List, Optional
+from ..database import get_async_db, get_db
+from ..schemas.segment import (
+    SegmentResponse,
+    SegmentCreate,
+    SegmentUpdate,
+    SegmentListResponse,
+    SEGMENT_SUMMARY_FIELDS,
+    SegmentRefreshResponse,
+    SegmentMembersResponse
+)
+from ..services.async_services import AsyncSegmentService
+from ..services.segment_execution_service import SegmentExecutionService
+from .projection import fields_query, projected_response
+
 
 router = APIRouter()
 
 
 @router.get("/", response_model=SegmentListResponse)
-def get_segments(
+async def get_segments(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     search: Optional[str] = Query(None),
     category: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None),
+    include_total: bool = Query(True),
+    fields=Depends(fields_query(SegmentResponse, SEGMENT_SUMMARY_FIELDS)),
+    db=Depends(get_async_db)
 ):
-    """모든 세그먼트 조회"""
-    return SegmentService.get_all_segments(
-        db=db, 
-        skip=skip, 
-        limit=limit,
-        search=search,
-        category=category
-    )
+    """모든 세그먼트 조회 (기본은 요약 필드, fields=all이면 전체)"""
+    try:
+        result = await AsyncSegmentService.get_all_segments(
+            db=db, 
+            skip=skip, 
+            limit=limit,
+            search=search,
+            category=category,
+            cursor=cursor,
+            include_total=include_total,
+            fields=fields
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return projected_response(result, SegmentResponse, fields, SegmentListResponse)
 
 
 @router.get("/stats")
-def get_segments_stats(db: Session = Depends(get_db)):
+async def get_segments_stats(db=Depends(get_async_db)):
     """세그먼트 통계 조회"""
-    return SegmentService.get_segments_stats(db)
+    return await AsyncSegmentService.get_segments_stats(db)
+
+
+@router.get("/setops")
+async def get_segment_set_operations(
+    left: int = Query(...),
+    right: int = Query(...),
+    db=Depends(get_async_db)
+):
+    """두 세그먼트 멤버십의 합집합/교집합/차집합 크기 (압축 비트맵 연산)"""
+    try:
+        return await AsyncSegmentService.set_operations(db, left, right)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/overlap")
+async def get_segment_overlap(
+    segment_ids: List[int] = Query(..., min_length=1, max_length=100),
+    db=Depends(get_async_db)
+):
+    """세그먼트 N x N 겹침 행렬 (?segment_ids=1&segment_ids=2...)"""
+    try:
+        return await AsyncSegmentService.overlap(db, segment_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
 
 @router.get("/{segment_id}", response_model=SegmentResponse)
-def get_segment(segment_id: int, db: Session = Depends(get_db)):
+async def get_segment(
+    segment_id: int,
+    fields=Depends(fields_query(SegmentResponse)),
+    db=Depends(get_async_db)
+):
     """특정 세그먼트 조회"""
-    segment = SegmentService.get_segment_by_id(db, segment_id)
+    segment = await AsyncSegmentService.get_segment_by_id(db, segment_id, fields=fields)
     if not segment:
         raise HTTPException(status_code=404, detail="Segment not found")
-    return segment
+    return projected_response(segment, SegmentResponse, fields)
+
+
+@router.get("/{segment_id}/members", response_model=SegmentMembersResponse)
+async def get_segment_members(
+    segment_id: int,
+    limit: int = Query(1000, ge=1, le=10000),
+    cursor: Optional[str] = Query(None),
+    db=Depends(get_async_db)
+):
+    """세그먼트 멤버 ID 목록 (마지막 쿼리 실행 결과)"""
+    try:
+        members = await AsyncSegmentService.get_members(db, segment_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if members is None:
+        raise HTTPException(status_code=404, detail="Segment not found")
+    return members
+
+
+@router.post("/{segment_id}/refresh", response_model=SegmentRefreshResponse)
+def refresh_segment(segment_id: int, force: bool = Query(False), db: Session = Depends(get_db)):
+    """세그먼트 쿼리 실행 (입력이 같고 refresh_period 이내면 이전 결과 재사용)
+
+    쿼리 실행은 수 초까지 블로킹되므로 비동기 모드에서도 스레드풀에서 처리한다.
+    """
+    try:
+        result = SegmentExecutionService.refresh_segment(db, segment_id, force=force)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Segment not found")
+    return result
 
 
 @router.post("/", response_model=SegmentResponse)
-def create_segment(segment: SegmentCreate, db: Session = Depends(get_db)):
+async def create_segment(segment: SegmentCreate, db=Depends(get_async_db)):
     """새 세그먼트 생성"""
-    return SegmentService.create_segment(db, segment)
+    return await AsyncSegmentService.create_segment(db, segment)
 
 
 @router.put("/{segment_id}", response_model=SegmentResponse)
-def update_segment(segment_id: int, segment: SegmentUpdate, db: Session = Depends(get_db)):
+async def update_segment(segment_id: int, segment: SegmentUpdate, db=Depends(get_async_db)):
     """세그먼트 업데이트"""
-    updated_segment = SegmentService.update_segment(db, segment_id, segment)
+    updated_segment = await AsyncSegmentService.update_segment(db, segment_id, segment)
     if not updated_segment:
         raise HTTPException(status_code=404, detail="Segment not found")
     return updated_segment
 
 
 @router.delete("/{segment_id}")
-def delete_segment(segment_id: int, db: Session = Depends(get_db)):
+async def delete_segment(segment_id: int, db=Depends(get_async_db)):
     """세그먼트 삭제"""
-    success = SegmentService.delete_segment(db, segment_id)
+    success = await AsyncSegmentService.delete_segment(db, segment_id)
     if not success:
         raise HTTPException(status_code=404, detail="Segment not found")
     return {"message": "Segment deleted successfully"}
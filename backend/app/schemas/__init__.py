@@ -13,6 +13,7 @@ from .segment import (
     SegmentResponse,
     SegmentListResponse
 )
+from .search import SearchHit, SearchResponse
 
 __all__ = [
     "MetricBase",
@@ -24,5 +25,7 @@ __all__ = [
     "SegmentCreate",
     "SegmentUpdate",
     "SegmentResponse",
-    "SegmentListResponse"
+    "SegmentListResponse",
+    "SearchHit",
+    "SearchResponse"
 ]
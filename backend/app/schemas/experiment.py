@@ -1,6 +1,7 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Annotated, List, Literal, Optional
 from datetime import datetime, date
+from ..config import settings
 
 
 class ExperimentBase(BaseModel):
@@ -87,6 +88,44 @@ class ExperimentResponse(ExperimentBase):
         from_attributes = True
 
 
+# 목록 기본 응답 필드 (description / background / expected_impact / variants 등 상세 화면용 필드 제외)
+EXPERIMENT_SUMMARY_FIELDS = (
+    "id", "name", "owner", "team", "experiment_type", "status", "objective", "hypothesis",
+    "primary_metric_ids", "start_date", "end_date", "target_segment_id", "created_at", "updated_at",
+)
+
+
 class ExperimentListResponse(BaseModel):
-    total: int
+    total: Optional[int] = None
     items: list[ExperimentResponse]
+    next_cursor: Optional[str] = None
+
+
+MetricRole = Literal["primary", "secondary", "guardrail"]
+
+
+class MetricExperimentLink(BaseModel):
+    role: MetricRole
+    experiment: ExperimentResponse
+
+
+class MetricExperimentsResponse(BaseModel):
+    """지표를 사용하는 실험 목록 (experiment_metrics 기준)"""
+    metric_id: int
+    items: list[MetricExperimentLink]
+
+
+class ExperimentObservationIngest(BaseModel):
+    """실험 관측값 일괄 적재용 (experiment_id는 경로에서 지정)"""
+    variant: str
+    metric_id: int
+    value: float
+    unit_id: Optional[str] = None
+    timestamp: Optional[datetime] = None
+
+
+class AssignmentBatchRequest(BaseModel):
+    """실험 그룹 일괄 배정 요청 (단위 ID는 experiment_unit 기준 식별자)"""
+    unit_ids: List[Annotated[str, Field(min_length=1, max_length=256)]] = Field(
+        ..., min_length=1, max_length=settings.assignment_batch_max_ids
+    )
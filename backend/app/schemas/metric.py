@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Literal, Optional
 from datetime import datetime
 
 
@@ -17,6 +17,7 @@ class MetricBase(BaseModel):
     alert_settings: Optional[str] = None
     data_source: Optional[str] = None
     aggregation_period: Optional[str] = None
+    higher_is_better: Optional[bool] = None
 
 
 class MetricCreate(BaseModel):
@@ -27,6 +28,7 @@ class MetricCreate(BaseModel):
     priority: str
     calculation_logic: str
     alert_settings: Optional[str] = None
+    higher_is_better: Optional[bool] = None
     status: str = "비활성화"
     version: str = "v1.0.0"
 
@@ -45,6 +47,7 @@ class MetricUpdate(BaseModel):
     alert_settings: Optional[str] = None
     data_source: Optional[str] = None
     aggregation_period: Optional[str] = None
+    higher_is_better: Optional[bool] = None
 
 
 class MetricResponse(MetricBase):
@@ -56,7 +59,37 @@ class MetricResponse(MetricBase):
         from_attributes = True
 
 
+# 목록 기본 응답 필드 (calculation_logic / alert_settings 제외)
+METRIC_SUMMARY_FIELDS = (
+    "id", "name", "description", "value", "unit", "category", "status", "version", "metric_owner",
+    "priority", "data_source", "aggregation_period", "higher_is_better", "created_at", "updated_at",
+)
+
+
 class MetricListResponse(BaseModel):
-    total: int
+    total: Optional[int] = None
     items: list[MetricResponse]
+    next_cursor: Optional[str] = None
+
+
+AlertState = Literal["firing", "resolved"]
+
+
+class MetricAlertResponse(BaseModel):
+    id: int
+    metric_id: int
+    rule: str
+    state: AlertState
+    value: float
+    score: Optional[float] = None
+    expected: Optional[float] = None
+    timestamp: datetime
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
 
+class MetricAlertListResponse(BaseModel):
+    items: list[MetricAlertResponse]
+    next_cursor: Optional[str] = None
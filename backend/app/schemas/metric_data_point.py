@@ -1,5 +1,11 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
+from typing import List, Literal, Optional
+from ..config import settings
+
+TimeBucket = Literal["minute", "hour", "day", "week", "month"]
+Aggregation = Literal["avg", "sum", "min", "max", "count", "last"]
+ExportFormat = Literal["csv", "ndjson", "arrow"]
 
 
 class MetricDataPointBase(BaseModel):
@@ -13,9 +19,49 @@ class MetricDataPointCreate(MetricDataPointBase):
     pass
 
 
+class MetricDataPointIngest(BaseModel):
+    """단일 지표 일괄 적재용 (metric_id는 경로에서 지정)"""
+    value: float
+    visitor_count: int | None = None
+    timestamp: datetime
+
+
 class MetricDataPointResponse(MetricDataPointBase):
     id: int
     created_at: datetime
 
     class Config:
         from_attributes = True
+
+
+class AlertSummary(BaseModel):
+    evaluated: int = 0  # 알림 규칙을 평가한 포인트 수
+    fired: int = 0
+    resolved: int = 0
+
+
+class IngestLineError(BaseModel):
+    """적재하지 않은 행 (line은 요청 본문의 1부터 시작하는 행 번호)"""
+    line: int
+    metric_id: int
+    timestamp: datetime
+    error: str
+
+
+class IngestResponse(BaseModel):
+    written: int
+    rejected: List[IngestLineError] = []
+    metrics: int
+    alerts: AlertSummary = AlertSummary()
+    elapsed_ms: float
+    rows_per_sec: float
+
+
+class TimeSeriesBatchRequest(BaseModel):
+    """여러 지표 시계열 일괄 조회 (기간 / 버킷 / 집계는 공통)"""
+    metric_ids: List[int] = Field(..., min_length=1, max_length=settings.timeseries_batch_max_metrics)
+    limit: Optional[int] = Field(None, ge=1, le=settings.timeseries_max_points)
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    bucket: Optional[TimeBucket] = None
+    agg: Aggregation = "avg"
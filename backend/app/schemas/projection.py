@@ -0,0 +1,56 @@
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple, Type
+from pydantic import BaseModel, ConfigDict, create_model
+
+# fields= 희소 필드셋 (응답 모델의 일부 필드만 담는 모델을 동적으로 생성)
+
+
+def parse_fields(
+    text: Optional[str],
+    model: Type[BaseModel],
+    default: Optional[Sequence[str]] = None
+) -> Optional[Tuple[str, ...]]:
+    """fields= 쿼리 파싱 (쉼표 목록, 없으면 default, "all"이면 전체)
+
+    응답 모델 필드 순서로 정렬한 필드 튜플(id는 항상 포함)을 반환하고, 전체면 None.
+    응답 모델에 없는 필드면 ValueError.
+    """
+    if text is None:
+        if default is None:
+            return None
+        names = set(default)
+    elif text.strip() == "all":
+        return None
+    else:
+        names = {name.strip() for name in text.split(",") if name.strip()}
+        unknown = names - model.model_fields.keys()
+        if unknown:
+            raise ValueError(
+                f"Unknown fields: {', '.join(sorted(unknown))} (available: {', '.join(model.model_fields)})"
+            )
+    names.add("id")
+    return tuple(name for name in model.model_fields if name in names)
+
+
+@lru_cache(maxsize=256)
+def projected_model(model: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """model에서 fields만 남긴 응답 모델"""
+    return create_model(
+        f"{model.__name__}Projection",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (info.annotation, info) for name, info in model.model_fields.items() if name in fields}
+    )
+
+
+@lru_cache(maxsize=256)
+def projected_list_model(
+    list_model: Type[BaseModel],
+    item_model: Type[BaseModel],
+    fields: Tuple[str, ...]
+) -> Type[BaseModel]:
+    """목록 응답 모델의 items를 fields만 남긴 모델로 바꾼 응답 모델"""
+    return create_model(
+        f"{list_model.__name__}Projection",
+        __base__=list_model,
+        items=(list[projected_model(item_model, fields)], ...)
+    )
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import Literal, Optional
+
+EntityType = Literal["metric", "segment", "experiment"]
+
+
+class SearchHit(BaseModel):
+    type: EntityType
+    id: int
+    name: str
+    snippet: Optional[str] = None
+    score: float
+
+
+class SearchResponse(BaseModel):
+    total: int
+    items: list[SearchHit]
@@ -67,7 +67,35 @@ class SegmentResponse(SegmentBase):
         from_attributes = True
 
 
+# 목록 기본 응답 필드 (query / campaigns 제외)
+SEGMENT_SUMMARY_FIELDS = (
+    "id", "name", "description", "segment_owner", "category", "tags", "refresh_period", "customer_count",
+    "metric1_value", "metric1_label", "metric2_value", "metric2_label", "metric3_value", "metric3_label",
+    "metric4_value", "metric4_label", "last_touch_channel", "last_touch_date", "created_at", "updated_at",
+)
+
+
 class SegmentListResponse(BaseModel):
-    total: int
+    total: Optional[int] = None
     items: list[SegmentResponse]
+    next_cursor: Optional[str] = None
+
 
+
+class SegmentRefreshResponse(BaseModel):
+    """세그먼트 쿼리 실행 결과 (refreshed=False면 이전 결과 재사용)"""
+    segment_id: int
+    refreshed: bool
+    member_count: int
+    added: int = 0
+    removed: int = 0
+    duration_ms: Optional[float] = None
+    refreshed_at: Optional[datetime] = None
+
+
+class SegmentMembersResponse(BaseModel):
+    segment_id: int
+    total: int
+    refreshed_at: Optional[datetime] = None
+    items: list[str]
+    next_cursor: Optional[str] = None
@@ -1,5 +1,28 @@
 # 비즈니스 로직 서비스들을 여기에 임포트
 from .metric_service import MetricService
 from .segment_service import SegmentService
+from .data_point_service import DataPointService
+from .async_services import (
+    AsyncMetricService,
+    AsyncSegmentService,
+    AsyncExperimentService,
+    AsyncExperimentAnalysisService,
+    AsyncExperimentDesignService,
+    AsyncAssignmentService,
+    AsyncDataPointService,
+    AsyncSearchService
+)
 
-__all__ = ["MetricService", "SegmentService"]
+__all__ = [
+    "MetricService",
+    "SegmentService",
+    "DataPointService",
+    "AsyncMetricService",
+    "AsyncSegmentService",
+    "AsyncExperimentService",
+    "AsyncExperimentAnalysisService",
+    "AsyncExperimentDesignService",
+    "AsyncAssignmentService",
+    "AsyncDataPointService",
+    "AsyncSearchService"
+]
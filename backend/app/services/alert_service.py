@@ -0,0 +1,349 @@
+import json
+import math
+import operator
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..models.metric import Metric
+from ..models.metric_alert import MetricAlert, MetricAlertState
+from ..models.metric_rollup import MetricRollup
+from .pagination import keyset_paginate
+from .stats_service import StatsService
+from .time_buckets import floor_timestamp
+
+_OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+_SOURCES = ("value", "pct_change", "zscore")
+# 예: value > 100 / pct_change <= -20% / abs(zscore(30)) > 3
+_CLAUSE = re.compile(
+    r"^(?P<abs>abs\s*\(\s*)?(?P<source>value|pct_change|zscore)(?:\s*\(\s*(?P<window>\d+)\s*\))?(?(abs)\s*\))"
+    r"\s*(?P<op>>=|<=|==|!=|>|<)\s*(?P<threshold>[-+]?\d+(?:\.\d+)?)\s*%?$"
+)
+_WARNING = "주의"
+_ACTIVE = "활성화"
+
+
+class AlertRule(NamedTuple):
+    """alert_settings를 컴파일한 규칙 1개"""
+    key: str  # 정규화한 규칙 문자열 (알림 이벤트의 rule)
+    source: str  # value / pct_change(aggregation_period 전 롤업 버킷 평균 대비 %) / zscore(EWMA 기준)
+    absolute: bool
+    op: str
+    threshold: float
+    window: Optional[int]  # zscore EWMA 창 크기 (포인트 수)
+
+    def check(self, score: Optional[float]) -> bool:
+        if score is None:
+            return False
+        return _OPERATORS[self.op](abs(score) if self.absolute else score, self.threshold)
+
+
+def _make_rule(source: str, op: str, threshold: float, absolute: bool = False, window: Optional[int] = None) -> AlertRule:
+    if source not in _SOURCES:
+        raise ValueError(f"Unknown alert source: {source}")
+    if op not in _OPERATORS:
+        raise ValueError(f"Unknown alert operator: {op}")
+    if window is not None and (source != "zscore" or window < 2):
+        raise ValueError("window is only allowed for zscore and must be at least 2")
+    name = f"{source}({window})" if window is not None else source
+    key = f"{'abs(' + name + ')' if absolute else name} {op} {threshold:g}"
+    return AlertRule(key, source, absolute, op, float(threshold), window)
+
+
+def _parse_json_rule(rule) -> AlertRule:
+    if not isinstance(rule, dict):
+        raise ValueError(f"Invalid alert rule: {rule!r}")
+    try:
+        return _make_rule(
+            rule.get("type") or rule.get("source") or "value",
+            rule.get("op", ">"),
+            float(rule["threshold"] if "threshold" in rule else rule["value"]),
+            absolute=bool(rule.get("abs", False)),
+            window=int(rule["window"]) if rule.get("window") is not None else None,
+        )
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Invalid alert rule: {rule!r}") from e
+
+
+@lru_cache(maxsize=4096)
+def compile_alert_settings(text: Optional[str]) -> Tuple[Tuple[AlertRule, ...], Tuple[str, ...]]:
+    """alert_settings 문자열을 규칙 목록으로 컴파일 ((규칙, 해석하지 못한 항목))
+
+    JSON 배열/객체({"rules": [...]}) 또는 `;`/줄바꿈으로 구분한 식을 받는다.
+    해석하지 못한 항목은 무시하고 오류 목록으로 돌려준다 (기존 자유 형식 설정과 호환).
+    """
+    text = (text or "").strip()
+    if not text:
+        return (), ()
+    rules, errors = [], []
+    if text[0] in "[{":
+        try:
+            parsed = json.loads(text)
+        except ValueError:
+            return (), (f"Invalid JSON: {text[:100]}",)
+        items = parsed.get("rules", []) if isinstance(parsed, dict) else parsed
+        for item in items if isinstance(items, list) else [items]:
+            try:
+                rules.append(_parse_json_rule(item))
+            except ValueError as e:
+                errors.append(str(e))
+    else:
+        for clause in re.split(r"[;\n]", text):
+            clause = clause.strip()
+            if not clause:
+                continue
+            match = _CLAUSE.match(clause)
+            if not match:
+                errors.append(f"Unrecognized alert rule: {clause[:100]}")
+                continue
+            try:
+                rules.append(_make_rule(
+                    match["source"], match["op"], float(match["threshold"]),
+                    absolute=bool(match["abs"]),
+                    window=int(match["window"]) if match["window"] else None,
+                ))
+            except ValueError as e:
+                errors.append(str(e))
+    unique = {rule.key: rule for rule in rules}
+    return tuple(unique.values()), tuple(errors)
+
+
+def _ewma_window(rules) -> int:
+    return next((rule.window for rule in rules if rule.window), settings.alert_ewma_window)
+
+
+class _RollingState:
+    """MetricAlertState 행의 메모리 사본 (포인트마다 O(1) 갱신)"""
+    __slots__ = ("n", "mean", "var", "last_value", "last_timestamp", "firing", "status_flagged")
+
+    def __init__(self, row: Optional[MetricAlertState]):
+        self.n = row.n if row else 0
+        self.mean = row.ewma_mean if row else 0.0
+        self.var = row.ewma_var if row else 0.0
+        self.last_value = row.last_value if row else None
+        self.last_timestamp = row.last_timestamp if row else None
+        self.firing = dict.fromkeys(json.loads(row.firing)) if row else {}
+        self.status_flagged = row.status_flagged if row else False
+
+    def update(self, value: float, alpha: float):
+        if self.n == 0:
+            self.mean, self.var = value, 0.0
+        else:
+            # 지수가중 평균/분산 증분 갱신
+            diff = value - self.mean
+            increment = alpha * diff
+            self.mean += increment
+            self.var = (1 - alpha) * (self.var + diff * increment)
+        self.n += 1
+        self.last_value = value
+
+    def row(self, metric_id: int):
+        return {
+            "metric_id": metric_id,
+            "n": self.n,
+            "ewma_mean": self.mean,
+            "ewma_var": self.var,
+            "last_value": self.last_value,
+            "last_timestamp": self.last_timestamp,
+            "firing": json.dumps(list(self.firing), ensure_ascii=False),
+            "status_flagged": self.status_flagged,
+        }
+
+
+def _pct_change_baselines(db: Session, metric_id: int, aggregation_period: Optional[str], timestamps) -> Dict[datetime, float]:
+    """포인트 시각별 pct_change 기준값: aggregation_period만큼 이전 시각이 속한 롤업 버킷의 평균
+
+    1일 미만 주기는 시간별, 그 이상은 일별 롤업을 읽는다 (기준 버킷이 없으면 기준값 없음).
+    """
+    offset = timedelta(seconds=settings.alert_pct_change_seconds.get(
+        aggregation_period or "", settings.alert_pct_change_default_seconds
+    ))
+    granularity = "hour" if offset < timedelta(days=1) else "day"
+    buckets = {timestamp: floor_timestamp(timestamp - offset, granularity) for timestamp in timestamps}
+    if not buckets:
+        return {}
+    means = {
+        bucket_start: value_sum / value_count
+        for bucket_start, value_sum, value_count in db.query(
+            MetricRollup.bucket_start, MetricRollup.value_sum, MetricRollup.value_count
+        ).filter(
+            MetricRollup.metric_id == metric_id,
+            MetricRollup.granularity == granularity,
+            MetricRollup.bucket_start >= min(buckets.values()),
+            MetricRollup.bucket_start <= max(buckets.values()),
+        )
+        if value_count
+    }
+    return {timestamp: means[bucket] for timestamp, bucket in buckets.items() if bucket in means}
+
+
+def _state_upsert():
+    stmt = insert(MetricAlertState.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=["metric_id"],
+        set_={column: stmt.excluded[column] for column in (
+            "n", "ewma_mean", "ewma_var", "last_value", "last_timestamp", "firing", "status_flagged"
+        )},
+    )
+
+
+class AlertService:
+    @staticmethod
+    def evaluate(db: Session, points: Dict[int, List[Tuple]]):
+        """적재된 포인트로 알림 규칙 평가 (지표별 [(timestamp, value), ...], 호출자가 커밋)
+
+        지표별로 시간순으로 한 포인트씩 평가하며, 과거 데이터는 pct_change 기준 롤업 버킷만 읽는다.
+        마지막으로 평가한 시각 이전의 포인트(재적재/백필)는 평가하지 않는다.
+        규칙이 발생/해소될 때만 이벤트를 남기고, 발생 중인 규칙이 있으면 "활성화" 지표를 "주의"로,
+        모두 해소되면 알림으로 바꾼 "주의"를 다시 "활성화"로 되돌린다.
+        반환값은 {"evaluated", "fired", "resolved"} 건수.
+        """
+        summary = {"evaluated": 0, "fired": 0, "resolved": 0}
+        compiled, periods = {}, {}
+        for metric_id, alert_settings, aggregation_period in (
+            db.query(Metric.id, Metric.alert_settings, Metric.aggregation_period)
+            .filter(Metric.id.in_(points.keys()), Metric.alert_settings.isnot(None))
+        ):
+            rules, _ = compile_alert_settings(alert_settings)
+            if rules:
+                compiled[metric_id] = rules
+                periods[metric_id] = aggregation_period
+        if not compiled:
+            return summary
+
+        rows = {row.metric_id: row for row in db.query(MetricAlertState).filter(MetricAlertState.metric_id.in_(compiled))}
+        events, states, flips = [], [], {}
+        for metric_id, rules in compiled.items():
+            state = _RollingState(rows.get(metric_id))
+            alpha = 2 / (_ewma_window(rules) + 1)
+            # 규칙이 바뀌어 더 이상 없는 규칙은 해소 이벤트 없이 제거
+            keys = {rule.key for rule in rules}
+            state.firing = {key: None for key in state.firing if key in keys}
+            previous_firing = bool(state.firing)
+            baselines = _pct_change_baselines(
+                db, metric_id, periods[metric_id], [point[0] for point in points[metric_id]]
+            ) if any(rule.source == "pct_change" for rule in rules) else {}
+            for timestamp, value in sorted(points[metric_id], key=lambda point: point[0]):
+                if value is None or (state.last_timestamp is not None and timestamp <= state.last_timestamp):
+                    continue
+                std = math.sqrt(state.var)
+                baseline = baselines.get(timestamp)
+                scores = {
+                    "value": value,
+                    "pct_change": (value - baseline) / abs(baseline) * 100 if baseline else None,
+                    "zscore": (
+                        (value - state.mean) / std
+                        if state.n >= settings.alert_min_points and std > 0 else None
+                    ),
+                }
+                for rule in rules:
+                    firing = rule.check(scores[rule.source])
+                    if firing == (rule.key in state.firing):
+                        continue
+                    if firing:
+                        state.firing[rule.key] = None
+                        summary["fired"] += 1
+                    else:
+                        del state.firing[rule.key]
+                        summary["resolved"] += 1
+                    events.append({
+                        "metric_id": metric_id,
+                        "rule": rule.key,
+                        "state": "firing" if firing else "resolved",
+                        "value": value,
+                        "score": scores[rule.source],
+                        "expected": state.mean if state.n else None,
+                        "timestamp": timestamp,
+                    })
+                state.update(value, alpha)
+                state.last_timestamp = timestamp
+                summary["evaluated"] += 1
+            if bool(state.firing) != previous_firing or (not state.firing and state.status_flagged):
+                flips[metric_id] = state
+            states.append(state.row(metric_id))
+
+        if states:
+            db.execute(_state_upsert(), states)
+        if events:
+            db.execute(MetricAlert.__table__.insert(), events)
+        if flips:
+            AlertService._apply_status(db, flips)
+        return summary
+
+    @staticmethod
+    def _apply_status(db: Session, flips: Dict[int, _RollingState]):
+        """발생 중인 규칙 유무에 따라 status 변경 (수동으로 정한 상태는 건드리지 않음)"""
+        table = MetricAlertState.__table__
+        for metric in db.query(Metric).filter(Metric.id.in_(flips)):
+            state = flips[metric.id]
+            if state.firing and metric.status == _ACTIVE:
+                status, flagged = _WARNING, True
+            elif not state.firing and state.status_flagged:
+                status, flagged = (_ACTIVE if metric.status == _WARNING else metric.status), False
+            else:
+                continue
+            before = StatsService.metric_counts(metric)
+            metric.status = status
+            StatsService.apply(db, before, StatsService.metric_counts(metric))
+            db.execute(table.update().where(table.c.metric_id == metric.id).values(status_flagged=flagged))
+        db.flush()
+
+    @staticmethod
+    def get_alerts(
+        db: Session,
+        metric_id: Optional[int] = None,
+        state: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ):
+        """알림 이벤트 피드 (최신 순 커서 페이지네이션)"""
+        query = db.query(MetricAlert)
+        if metric_id is not None:
+            query = query.filter(MetricAlert.metric_id == metric_id)
+        if state:
+            query = query.filter(MetricAlert.state == state)
+        items, next_cursor = keyset_paginate(query, [MetricAlert.id], limit, cursor=cursor, descending=True)
+        return {"items": items, "next_cursor": next_cursor}
+
+    @staticmethod
+    def get_alert_rules(db: Session, metric_id: int):
+        """지표의 컴파일된 규칙과 현재 평가 상태. 지표가 없으면 None"""
+        metric = db.query(Metric.alert_settings).filter(Metric.id == metric_id).first()
+        if metric is None:
+            return None
+        rules, errors = compile_alert_settings(metric.alert_settings)
+        row = db.get(MetricAlertState, metric_id)
+        return {
+            "metric_id": metric_id,
+            "rules": [
+                {"rule": rule.key, "source": rule.source, "abs": rule.absolute, "op": rule.op,
+                 "threshold": rule.threshold, "window": rule.window}
+                for rule in rules
+            ],
+            "errors": list(errors),
+            "ewma_window": _ewma_window(rules),
+            "state": {
+                "points": row.n,
+                "ewma_mean": row.ewma_mean,
+                "ewma_std": math.sqrt(row.ewma_var),
+                "last_value": row.last_value,
+                "last_timestamp": row.last_timestamp,
+                "firing": json.loads(row.firing),
+            } if row else None,
+        }
+
+    @staticmethod
+    def delete_metric_alerts(db: Session, metric_id: int):
+        """지표 삭제 시 알림 상태/이벤트 정리 (커밋은 호출자)"""
+        db.query(MetricAlertState).filter(MetricAlertState.metric_id == metric_id).delete(synchronize_session=False)
+        db.query(MetricAlert).filter(MetricAlert.metric_id == metric_id).delete(synchronize_session=False)
@@ -0,0 +1,125 @@
+import threading
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Sequence
+import numpy as np
+from sqlalchemy.orm import Session
+from ..cache import cache
+from ..config import settings
+from ..models.experiment import Experiment
+from .experiment_analysis_service import parse_variants
+
+# 64비트 FNV-1a
+_FNV_OFFSET = 0xCBF29CE484222325
+_FNV_PRIME = 0x100000001B3
+_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+class AllocationTable(NamedTuple):
+    """variants JSON을 컴파일한 배정 테이블"""
+    generation: int  # 컴파일 당시 experiments 무효화 세대
+    prefix: bytes  # 해시 입력 접두사 ("{실험 ID}:{실험 단위}:")
+    names: tuple
+    bucket_variants: np.ndarray  # 버킷 -> 그룹 인덱스 (-1은 실험 대상 아님)
+
+
+# 실험 ID -> 컴파일된 배정 테이블
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+def _fnv1a(data: bytes, state: int = _FNV_OFFSET) -> int:
+    for byte in data:
+        state = ((state ^ byte) * _FNV_PRIME) & _MASK
+    return state
+
+
+@lru_cache(maxsize=65536)
+def _bucket(prefix: bytes, unit_id: str) -> int:
+    """단일 단위 ID의 해시 버킷 (반복 조회는 메모에서 바로 반환)"""
+    return _fnv1a(unit_id.encode("utf-8"), _fnv1a(prefix)) % settings.assignment_buckets
+
+
+def hash_buckets(prefix: bytes, unit_ids: Sequence[str]) -> np.ndarray:
+    """단위 ID 배열의 해시 버킷 (FNV-1a를 바이트 열 단위로 전체 배열에 한 번에 적용)"""
+    encoded = [unit_id.encode("utf-8") for unit_id in unit_ids]
+    lengths = np.fromiter(map(len, encoded), np.int64, len(encoded))
+    width = int(lengths.max()) if len(encoded) else 0
+    matrix = np.frombuffer(
+        b"".join(value.ljust(width, b"\0") for value in encoded), np.uint8
+    ).reshape(len(encoded), width)
+
+    state = np.full(len(encoded), _fnv1a(prefix), np.uint64)
+    prime = np.uint64(_FNV_PRIME)
+    for column in range(width):
+        # uint64 곱셈은 2^64에서 순환하므로 스칼라 구현의 마스킹과 결과가 같다
+        state = np.where(column < lengths, (state ^ matrix[:, column]) * prime, state)
+    return (state % np.uint64(settings.assignment_buckets)).astype(np.int64)
+
+
+def compile_allocation(experiment: Experiment, generation: int) -> AllocationTable:
+    """variants의 traffic_allocation(%)을 누적 버킷 구간으로 변환
+
+    비율 합이 100 미만이면 남는 버킷은 실험 대상에서 제외하고, 100을 넘으면 정규화한다.
+    비율이 하나도 없으면 전체 트래픽을 균등 배분한다.
+    그룹이 2개 미만이면 ValueError.
+    """
+    names, weights = parse_variants(experiment.variants)
+    if len(names) < 2:
+        raise ValueError("Experiment needs at least two variants to assign units")
+
+    share = weights / max(weights.sum(), 100.0)
+    buckets = settings.assignment_buckets
+    ends = np.round(np.cumsum(share) * buckets).astype(np.int64)
+    bucket_variants = np.full(buckets, -1, np.int16)
+    bucket_variants[:ends[-1]] = np.searchsorted(ends, np.arange(ends[-1]), side="right")
+    prefix = f"{experiment.id}:{experiment.experiment_unit or 'User'}:".encode("utf-8")
+    return AllocationTable(generation, prefix, tuple(names), bucket_variants)
+
+
+def get_allocation(db: Session, experiment_id: int) -> Optional[AllocationTable]:
+    """컴파일된 배정 테이블 (실험이 수정되어 experiments 태그가 무효화되면 다시 컴파일)"""
+    generation = cache.generation("experiments")
+    table = _tables.get(experiment_id)
+    if table is not None and table.generation == generation:
+        return table
+    experiment = db.query(Experiment).filter(Experiment.id == experiment_id).first()
+    if not experiment:
+        with _tables_lock:
+            _tables.pop(experiment_id, None)
+        return None
+    table = compile_allocation(experiment, generation)
+    with _tables_lock:
+        _tables[experiment_id] = table
+    return table
+
+
+class AssignmentService:
+    @staticmethod
+    def assign(db: Session, experiment_id: int, unit_id: str):
+        """단일 단위 ID의 그룹 배정 (실험 대상이 아니면 variant는 None)"""
+        table = get_allocation(db, experiment_id)
+        if table is None:
+            return None
+        index = table.bucket_variants[_bucket(table.prefix, unit_id)]
+        return {
+            "experiment_id": experiment_id,
+            "unit_id": unit_id,
+            "variant": table.names[index] if index >= 0 else None,
+        }
+
+    @staticmethod
+    def assign_batch(db: Session, experiment_id: int, unit_ids: List[str]):
+        """단위 ID 배열의 그룹 배정 (입력 순서대로, 단일 배정과 같은 결과)"""
+        table = get_allocation(db, experiment_id)
+        if table is None:
+            return None
+        indexes = table.bucket_variants[hash_buckets(table.prefix, unit_ids)]
+        labels = np.array(table.names + (None,), dtype=object)
+        counts = np.bincount(indexes + 1, minlength=len(table.names) + 1)
+        return {
+            "experiment_id": experiment_id,
+            "variants": list(table.names),
+            "assignments": labels[indexes].tolist(),
+            "counts": dict(zip(table.names, counts[1:].tolist())),
+            "unassigned": int(counts[0]),
+        }
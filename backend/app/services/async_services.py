@@ -0,0 +1,93 @@
+from .alert_service import AlertService
+from .assignment_service import AssignmentService
+from .data_point_service import DataPointService
+from .derived_metric_service import DerivedMetricService
+from .experiment_analysis_service import ExperimentAnalysisService
+from .experiment_design_service import ExperimentDesignService
+from .experiment_service import ExperimentService
+from .metric_service import MetricService
+from .quantile_service import QuantileService
+from .search_service import SearchService
+from .segment_bitmap_service import SegmentBitmapService
+from .segment_execution_service import SegmentExecutionService
+from .segment_service import SegmentService
+
+
+def _delegate(method):
+    """동기 서비스 메서드를 db.run_sync로 실행하는 비동기 메서드로 변환"""
+    async def wrapper(db, *args, **kwargs):
+        return await db.run_sync(method, *args, **kwargs)
+    wrapper.__name__ = method.__name__
+    wrapper.__doc__ = method.__doc__
+    return staticmethod(wrapper)
+
+
+class AsyncMetricService:
+    """MetricService의 비동기 버전"""
+    get_all_metrics = _delegate(MetricService.get_all_metrics)
+    get_metric_by_id = _delegate(MetricService.get_metric_by_id)
+    create_metric = _delegate(MetricService.create_metric)
+    update_metric = _delegate(MetricService.update_metric)
+    delete_metric = _delegate(MetricService.delete_metric)
+    get_metrics_stats = _delegate(MetricService.get_metrics_stats)
+    get_metric_time_series = _delegate(MetricService.get_metric_time_series)
+    get_metric_time_series_batch = _delegate(MetricService.get_metric_time_series_batch)
+    get_derived_series = _delegate(DerivedMetricService.get_series)
+    get_quantiles = _delegate(QuantileService.get_quantiles)
+
+
+class AsyncAlertService:
+    """AlertService의 비동기 버전"""
+    get_alerts = _delegate(AlertService.get_alerts)
+    get_alert_rules = _delegate(AlertService.get_alert_rules)
+
+
+class AsyncSegmentService:
+    """SegmentService의 비동기 버전"""
+    get_all_segments = _delegate(SegmentService.get_all_segments)
+    get_segment_by_id = _delegate(SegmentService.get_segment_by_id)
+    create_segment = _delegate(SegmentService.create_segment)
+    update_segment = _delegate(SegmentService.update_segment)
+    delete_segment = _delegate(SegmentService.delete_segment)
+    get_segments_stats = _delegate(SegmentService.get_segments_stats)
+    get_members = _delegate(SegmentExecutionService.get_members)
+    set_operations = _delegate(SegmentBitmapService.set_operations)
+    overlap = _delegate(SegmentBitmapService.overlap)
+
+
+class AsyncExperimentService:
+    """ExperimentService의 비동기 버전"""
+    get_all_experiments = _delegate(ExperimentService.get_all_experiments)
+    get_experiment_by_id = _delegate(ExperimentService.get_experiment_by_id)
+    get_experiments_by_metric = _delegate(ExperimentService.get_experiments_by_metric)
+    create_experiment = _delegate(ExperimentService.create_experiment)
+    update_experiment = _delegate(ExperimentService.update_experiment)
+    delete_experiment = _delegate(ExperimentService.delete_experiment)
+
+
+class AsyncExperimentAnalysisService:
+    """ExperimentAnalysisService의 비동기 버전"""
+    ingest_observations = _delegate(ExperimentAnalysisService.ingest_observations)
+    get_results = _delegate(ExperimentAnalysisService.get_results)
+
+
+class AsyncAssignmentService:
+    """AssignmentService의 비동기 버전"""
+    assign = _delegate(AssignmentService.assign)
+    assign_batch = _delegate(AssignmentService.assign_batch)
+
+
+class AsyncExperimentDesignService:
+    """ExperimentDesignService의 비동기 버전"""
+    get_design = _delegate(ExperimentDesignService.get_design)
+
+
+class AsyncDataPointService:
+    """DataPointService의 비동기 버전"""
+    find_missing_metric_ids = _delegate(DataPointService.find_missing_metric_ids)
+    ingest_data_points = _delegate(DataPointService.ingest_data_points)
+
+
+class AsyncSearchService:
+    """SearchService의 비동기 버전"""
+    search = _delegate(SearchService.search)
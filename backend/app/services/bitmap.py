@@ -0,0 +1,134 @@
+import struct
+import numpy as np
+
+# Roaring 방식 압축 비트맵 (NumPy 구현)
+#
+# 32비트 ID를 상위 16비트 키별 컨테이너로 나누고, 컨테이너 원소가 4096개 이하이면
+# 정렬된 uint16 배열, 그보다 많으면 65536비트(uint64 x 1024) 비트셋으로 저장한다.
+# 직렬화 형식: 매직(4) + 컨테이너 수(uint32) + 키(uint16 x n) + 원소 수(uint32 x n) + 컨테이너 본문
+
+_MAGIC = b"RBM1"
+ARRAY_MAX = 4096
+_BITSET_WORDS = 1024
+
+
+def _to_bitset(low: np.ndarray) -> np.ndarray:
+    words = np.zeros(_BITSET_WORDS, np.uint64)
+    np.bitwise_or.at(words, low >> 6, np.left_shift(np.uint64(1), (low & 63).astype(np.uint64)))
+    return words
+
+
+def _bitset_values(words: np.ndarray) -> np.ndarray:
+    bits = np.unpackbits(words.view(np.uint8), bitorder="little")
+    return np.flatnonzero(bits).astype(np.uint16)
+
+
+def _bitset_contains(words: np.ndarray, values: np.ndarray) -> np.ndarray:
+    return (words[values >> 6] >> (values & 63).astype(np.uint64)) & np.uint64(1)
+
+
+class Bitmap:
+    """정수 ID 집합 (불변)"""
+    __slots__ = ("keys", "cardinalities", "containers")
+
+    def __init__(self, keys: np.ndarray, cardinalities: np.ndarray, containers: list):
+        self.keys = keys
+        self.cardinalities = cardinalities
+        self.containers = containers
+
+    @classmethod
+    def from_ids(cls, ids) -> "Bitmap":
+        ids = np.unique(np.asarray(ids, dtype=np.uint32))
+        high = (ids >> 16).astype(np.uint16)
+        low = (ids & 0xFFFF).astype(np.uint16)
+        keys, starts, counts = np.unique(high, return_index=True, return_counts=True)
+        containers = []
+        for start, count in zip(starts, counts):
+            values = low[start:start + count]
+            containers.append(values if count <= ARRAY_MAX else _to_bitset(values))
+        return cls(keys, counts.astype(np.uint32), containers)
+
+    @classmethod
+    def deserialize(cls, data: bytes) -> "Bitmap":
+        if data[:4] != _MAGIC:
+            raise ValueError("Invalid bitmap data")
+        (n,) = struct.unpack_from("<I", data, 4)
+        offset = 8
+        keys = np.frombuffer(data, np.uint16, n, offset)
+        offset += 2 * n
+        cardinalities = np.frombuffer(data, np.uint32, n, offset)
+        offset += 4 * n
+        containers = []
+        for cardinality in cardinalities:
+            if cardinality <= ARRAY_MAX:
+                containers.append(np.frombuffer(data, np.uint16, int(cardinality), offset))
+                offset += 2 * int(cardinality)
+            else:
+                containers.append(np.frombuffer(data, np.uint64, _BITSET_WORDS, offset))
+                offset += 8 * _BITSET_WORDS
+        return cls(keys, cardinalities, containers)
+
+    def serialize(self) -> bytes:
+        header = _MAGIC + struct.pack("<I", len(self.keys))
+        return b"".join([
+            header,
+            self.keys.astype("<u2").tobytes(),
+            self.cardinalities.astype("<u4").tobytes(),
+            *(container.tobytes() for container in self.containers),
+        ])
+
+    def __len__(self) -> int:
+        return int(self.cardinalities.sum())
+
+    def to_ids(self) -> np.ndarray:
+        parts = []
+        for key, container in zip(self.keys, self.containers):
+            low = container if container.dtype == np.uint16 else _bitset_values(container)
+            parts.append((np.uint32(key) << np.uint32(16)) | low.astype(np.uint32))
+        return np.concatenate(parts) if parts else np.empty(0, np.uint32)
+
+    def intersection_count(self, other: "Bitmap") -> int:
+        """교집합 크기 (공통 키의 컨테이너끼리만 비교)"""
+        _, mine, theirs = np.intersect1d(self.keys, other.keys, assume_unique=True, return_indices=True)
+        total = 0
+        for i, j in zip(mine, theirs):
+            a, b = self.containers[i], other.containers[j]
+            if a.dtype == np.uint64 and b.dtype == np.uint64:
+                total += int(np.bitwise_count(a & b).sum())
+            elif a.dtype == np.uint64:
+                total += int(_bitset_contains(a, b).sum())
+            elif b.dtype == np.uint64:
+                total += int(_bitset_contains(b, a).sum())
+            else:
+                total += np.intersect1d(a, b, assume_unique=True).size
+        return total
+
+    def apply(self, added, removed) -> "Bitmap":
+        """added를 더하고 removed를 뺀 새 비트맵"""
+        ids = np.union1d(self.to_ids(), np.asarray(added, dtype=np.uint32))
+        return Bitmap.from_ids(np.setdiff1d(ids, np.asarray(removed, dtype=np.uint32), assume_unique=True))
+
+
+def set_operation_counts(left: Bitmap, right: Bitmap) -> dict:
+    """두 집합의 합집합/교집합/차집합 크기"""
+    left_count, right_count = len(left), len(right)
+    both = left.intersection_count(right)
+    return {
+        "left": left_count,
+        "right": right_count,
+        "intersection": both,
+        "union": left_count + right_count - both,
+        "left_only": left_count - both,
+        "right_only": right_count - both,
+    }
+
+
+def overlap_matrix(bitmaps: list) -> np.ndarray:
+    """N x N 교집합 크기 행렬 (대각선은 각 집합 크기, 대칭이므로 절반만 계산)"""
+    n = len(bitmaps)
+    matrix = np.zeros((n, n), np.int64)
+    for i in range(n):
+        matrix[i, i] = len(bitmaps[i])
+        for j in range(i + 1, n):
+            matrix[i, j] = matrix[j, i] = bitmaps[i].intersection_count(bitmaps[j])
+    return matrix
@@ -0,0 +1,211 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+from sqlalchemy import and_, delete, func, or_, select, text
+from sqlalchemy.orm import Session
+from ..cache import invalidate
+from ..config import settings
+from ..database import SessionLocal
+from ..models.metric import Metric
+from ..models.metric_data_point import MetricDataPoint
+from ..models.metric_rollup import MetricRollup
+from .metric_dependency_service import MetricDependencyService
+from .rollup_service import RollupService
+from .time_buckets import floor_timestamp
+
+logger = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def retention_cutoff(aggregation_period: Optional[str], now: Optional[datetime] = None) -> datetime:
+    """원본 데이터 포인트 보존 경계 (이 시각 이전은 일별 롤업만 유지, 일 단위로 내림)"""
+    days = settings.raw_retention_days.get(aggregation_period or "", settings.raw_retention_default_days)
+    return floor_timestamp((now or _utcnow()) - timedelta(days=days), "day")
+
+
+def _delete_in_batches(db: Session, table, *conditions) -> int:
+    """조건에 맞는 행을 배치 단위로 삭제 (배치마다 커밋해 쓰기 잠금을 짧게 유지)"""
+    batch_size = settings.compaction_batch_size
+    deleted = 0
+    while True:
+        batch = select(table.c.id).where(*conditions).limit(batch_size)
+        result = db.execute(delete(table).where(table.c.id.in_(batch)))
+        db.commit()
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
+
+
+def _compact_points(db: Session, metric_id: int, cutoff: datetime) -> int:
+    """cutoff 이전 원본을 일 단위 배치 구간마다 일별 롤업에 반영한 뒤 삭제
+
+    배치 구간은 compaction_batch_size행 정도를 덮는 날들이므로 롤업 재계산(스케치 포함)도
+    한 번에 배치 크기 정도의 행만 읽는다.
+    """
+    point = MetricDataPoint
+    deleted = 0
+    for start, end in RollupService.day_windows(db, metric_id, settings.compaction_batch_size, end=cutoff):
+        # 삭제 전에 일별 롤업이 배치 구간의 원본을 모두 반영하도록 보정
+        RollupService.refresh_range(db, metric_id, start, end - timedelta(microseconds=1), granularities=("day",))
+        db.commit()
+        deleted += _delete_in_batches(db, point.__table__, point.metric_id == metric_id, point.timestamp < end)
+    return deleted
+
+
+def _database_bytes(db: Session) -> int:
+    page_count = db.execute(text("PRAGMA page_count")).scalar()
+    page_size = db.execute(text("PRAGMA page_size")).scalar()
+    return page_count * page_size
+
+
+def _incremental_vacuum(db: Session) -> str:
+    """auto_vacuum=INCREMENTAL인 경우 빈 페이지를 일정 단위씩 파일에서 반환"""
+    if db.execute(text("PRAGMA auto_vacuum")).scalar() != 2:
+        return "skipped"
+    db.commit()
+
+    pages = settings.compaction_vacuum_pages
+    connection = db.get_bind().raw_connection()
+    try:
+        sqlite_connection = connection.driver_connection
+        while sqlite_connection.execute("PRAGMA freelist_count").fetchone()[0] > 0:
+            # sqlite3 모듈의 execute()는 한 페이지만 반환하므로 executescript()로 끝까지 실행
+            sqlite_connection.executescript(f"PRAGMA incremental_vacuum({pages});")
+    finally:
+        connection.close()
+    return "incremental"
+
+
+class CompactionService:
+    @staticmethod
+    def retention_cutoffs(db: Session, metric_ids: Iterable[int]):
+        """지표별 원본 보존 경계 조회"""
+        now = _utcnow()
+        rows = db.query(Metric.id, Metric.aggregation_period).filter(Metric.id.in_(set(metric_ids))).all()
+        return {metric_id: retention_cutoff(period, now) for metric_id, period in rows}
+
+    @staticmethod
+    def raw_boundaries(db: Session, metric_ids: Iterable[int]):
+        """지표별 원본 데이터 포인트가 시작되는 경계 (이전 날은 압축되어 일별 롤업에만 남아 있다)
+
+        min(보존 경계, 가장 오래된 원본 포인트가 속한 날)이다. 압축은 보존 경계 이전의 원본을
+        일 단위로 모두 삭제하므로, 경계 이전은 일별 롤업, 이후는 원본에서 읽으면 겹치거나 빠지는 구간이 없다.
+        """
+        now = _utcnow()
+        oldest = (
+            select(func.min(MetricDataPoint.timestamp))
+            .where(MetricDataPoint.metric_id == Metric.id)
+            .scalar_subquery()
+        )
+        rows = db.query(Metric.id, Metric.aggregation_period, oldest).filter(Metric.id.in_(set(metric_ids))).all()
+        boundaries = {}
+        for metric_id, period, first_timestamp in rows:
+            cutoff = retention_cutoff(period, now)
+            if first_timestamp is not None:
+                cutoff = min(cutoff, floor_timestamp(first_timestamp, "day"))
+            boundaries[metric_id] = cutoff
+        return boundaries
+
+    @staticmethod
+    def compacted_rollup_filters(db: Session, metric_ids: Iterable[int], start=None, end=None):
+        """[start, end) 중 원본이 압축된 구간의 일별 롤업 행 조건 (그런 구간이 없으면 None)
+
+        원본 조회 경로는 이 조건의 롤업 행을 그 날의 포인트로 합쳐 읽는다 (raw_boundaries 참고).
+        """
+        groups = {}
+        for metric_id, boundary in CompactionService.raw_boundaries(db, metric_ids).items():
+            if start is None or start < boundary:
+                groups.setdefault(boundary, []).append(metric_id)
+        if not groups:
+            return None
+        filters = [
+            MetricRollup.granularity == "day",
+            or_(*(
+                and_(MetricRollup.metric_id.in_(ids), MetricRollup.bucket_start < boundary)
+                for boundary, ids in groups.items()
+            )),
+        ]
+        if start is not None:
+            filters.append(MetricRollup.bucket_start >= start)
+        if end is not None:
+            filters.append(MetricRollup.bucket_start < end)
+        return filters
+
+    @staticmethod
+    def compact(db: Session):
+        """보존 기간이 지난 원본 데이터 포인트를 일별 롤업으로 접고 삭제"""
+        started = time.perf_counter()
+        bytes_before = _database_bytes(db)
+        now = _utcnow()
+        deleted_points = 0
+        deleted_rollups = 0
+
+        # 원본/시간별 롤업이 삭제된 구간 (파생 지표 메모 재계산용)
+        changed = {}
+
+        metrics = db.query(Metric.id, Metric.aggregation_period).all()
+        for metric_id, period in metrics:
+            cutoff = retention_cutoff(period, now)
+            deleted = _compact_points(db, metric_id, cutoff)
+            if deleted:
+                deleted_points += deleted
+                changed[metric_id] = (None, cutoff)
+
+            # 보존 기간이 지난 구간은 일별 롤업만 유지
+            deleted = _delete_in_batches(
+                db,
+                MetricRollup.__table__,
+                MetricRollup.metric_id == metric_id,
+                MetricRollup.granularity == "hour",
+                MetricRollup.bucket_start < cutoff,
+            )
+            if deleted:
+                deleted_rollups += deleted
+                changed[metric_id] = (None, cutoff)
+
+        MetricDependencyService.record_changes(db, changed)
+        MetricDependencyService.prune_changes(db)
+        db.commit()
+        if deleted_points or deleted_rollups:
+            invalidate("metrics")
+        vacuum = _incremental_vacuum(db)
+        bytes_after = _database_bytes(db)
+
+        return {
+            "metrics": len(metrics),
+            "deleted_points": deleted_points,
+            "deleted_rollups": deleted_rollups,
+            "vacuum": vacuum,
+            "database_bytes": bytes_after,
+            "reclaimed_bytes": max(bytes_before - bytes_after, 0),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+            "finished_at": _utcnow().isoformat(),
+        }
+
+
+class CompactionWorker:
+    """압축 작업 실행기 (주기 실행은 refresh 스케줄러가 담당)"""
+
+    def __init__(self, interval_minutes: int):
+        self.interval_seconds = interval_minutes * 60
+        self.last_report = None
+        self._lock = threading.Lock()
+
+    def run_once(self):
+        """압축 작업 1회 실행 (동시에 하나만 실행)"""
+        with self._lock:
+            db = SessionLocal()
+            try:
+                self.last_report = CompactionService.compact(db)
+            finally:
+                db.close()
+            logger.info("compaction finished: %s", self.last_report)
+            return self.last_report
+
+
+compaction_worker = CompactionWorker(settings.compaction_interval_minutes)
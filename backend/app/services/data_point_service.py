@@ -0,0 +1,135 @@
+import time
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Iterable
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.sqlite import insert
+from ..cache import invalidate
+from ..config import settings
+from ..models.metric import Metric
+from ..models.metric_data_point import MetricDataPoint
+from .alert_service import AlertService
+from .compaction_service import CompactionService
+from .metric_dependency_service import MetricDependencyService
+from .rollup_service import GRANULARITIES, RollupService
+from .time_buckets import floor_timestamp
+
+
+def _chunked(iterable: Iterable, size: int):
+    """iterable을 size 단위 리스트로 분할"""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def normalize_timestamp(timestamp: datetime) -> datetime:
+    """timezone 정보가 있으면 UTC naive datetime으로 변환 (SQLite 저장 형식과 일치)"""
+    if timestamp.tzinfo is not None:
+        return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+
+def _upsert_statement():
+    """(metric_id, timestamp) 충돌 시 값을 덮어쓰는 INSERT 문"""
+    stmt = insert(MetricDataPoint.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=["metric_id", "timestamp"],
+        set_={
+            "value": stmt.excluded.value,
+            "visitor_count": stmt.excluded.visitor_count,
+        },
+    )
+
+
+class DataPointService:
+    @staticmethod
+    def find_missing_metric_ids(db: Session, metric_ids: Iterable[int]):
+        """존재하지 않는 지표 ID 목록 조회"""
+        requested = set(metric_ids)
+        if not requested:
+            return []
+        existing = {
+            row[0] for row in db.query(Metric.id).filter(Metric.id.in_(requested)).all()
+        }
+        return sorted(requested - existing)
+
+    @staticmethod
+    def ingest_data_points(db: Session, points: Iterable[dict]):
+        """데이터 포인트 일괄 적재
+
+        청크 단위 executemany로 기록하고 전체를 하나의 트랜잭션으로 커밋한다.
+        (metric_id, timestamp)가 같은 포인트는 덮어쓰므로 재시도해도 안전하다.
+        적재된 구간의 롤업과 알림 규칙 평가도 같은 트랜잭션에서 처리한다.
+        원본이 이미 압축된 날의 포인트는 덮어쓸 원본이 없어 중복 집계되므로 기록하지 않고
+        행 번호(1부터)와 함께 rejected로 돌려준다.
+        """
+        started = time.perf_counter()
+        stmt = _upsert_statement()
+        written = 0
+        # 지표별 적재 구간 (최소, 최대 timestamp)
+        ranges = {}
+        # 지표별 적재된 롤업 버킷 {granularity: {bucket_start, ...}}
+        touched = {}
+        # 알림 평가용 지표별 (timestamp, value)
+        observed = {}
+        # 원본 보존 경계 이전이라 기록하지 않은 행
+        rejected = []
+        boundaries = {}
+
+        try:
+            for chunk in _chunked(enumerate(points, start=1), settings.ingest_chunk_size):
+                new_metric_ids = {point["metric_id"] for _, point in chunk} - boundaries.keys()
+                if new_metric_ids:
+                    boundaries.update(CompactionService.raw_boundaries(db, new_metric_ids))
+
+                rows = []
+                for line, point in chunk:
+                    timestamp = normalize_timestamp(point["timestamp"])
+                    boundary = boundaries[point["metric_id"]]
+                    if timestamp < boundary:
+                        rejected.append({
+                            "line": line,
+                            "metric_id": point["metric_id"],
+                            "timestamp": timestamp,
+                            "error": f"Timestamp is before the raw retention boundary {boundary.isoformat()}; "
+                                     "compacted days cannot be corrected",
+                        })
+                        continue
+                    rows.append({
+                        "metric_id": point["metric_id"],
+                        "value": point["value"],
+                        "visitor_count": point.get("visitor_count"),
+                        "timestamp": timestamp,
+                    })
+                if not rows:
+                    continue
+
+                db.execute(stmt, rows)
+                written += len(rows)
+                for row in rows:
+                    low, high = ranges.get(row["metric_id"], (row["timestamp"], row["timestamp"]))
+                    ranges[row["metric_id"]] = (min(low, row["timestamp"]), max(high, row["timestamp"]))
+                    buckets = touched.setdefault(row["metric_id"], {granularity: set() for granularity in GRANULARITIES})
+                    for granularity, starts in buckets.items():
+                        starts.add(floor_timestamp(row["timestamp"], granularity))
+                    observed.setdefault(row["metric_id"], []).append((row["timestamp"], row["value"]))
+
+            for metric_id, buckets in touched.items():
+                RollupService.refresh_buckets(db, metric_id, buckets)
+            MetricDependencyService.record_changes(db, ranges)
+            alerts = AlertService.evaluate(db, observed) if observed else {"evaluated": 0, "fired": 0, "resolved": 0}
+            db.commit()
+            invalidate("metrics")
+        except Exception:
+            db.rollback()
+            raise
+
+        elapsed = time.perf_counter() - started
+        return {
+            "written": written,
+            "rejected": rejected,
+            "metrics": len(ranges),
+            "alerts": alerts,
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "rows_per_sec": round(written / elapsed, 1) if elapsed > 0 else 0.0,
+        }
@@ -0,0 +1,229 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..models.metric import Metric
+from .data_point_service import normalize_timestamp
+from .metric_dependency_service import MetricDependencyService
+from .metric_expressions import Expression, evaluate_expression, parse_expression
+from .metric_service import MetricService
+from .time_buckets import floor_timestamp, shift_bucket
+
+
+class DerivedPlan(NamedTuple):
+    """파생 지표 계산 순서"""
+    metric_id: int
+    expression: Expression
+    leaves: Tuple[int, ...]  # 데이터 포인트를 읽는 입력 지표
+    order: Tuple[Tuple[int, Expression], ...]  # 입력이 먼저 오도록 정렬한 파생 지표 (마지막이 대상 지표)
+
+
+class _MemoEntry(NamedTuple):
+    """(지표, 버킷, 집계)별로 계산해 둔 연속 구간 [start, end)의 파생 시계열"""
+    start: datetime
+    end: datetime
+    timestamps: np.ndarray  # datetime64[us], 정렬됨
+    values: np.ndarray
+    change_id: int  # 반영한 마지막 metric_changes.id
+    synced_at: float
+
+
+# (metric_id, bucket, agg) -> _MemoEntry
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def build_plan(db: Session, metric_id: int) -> Optional[DerivedPlan]:
+    """대상 지표와 참조하는 파생 지표의 식을 읽어 계산 순서 구성
+
+    지표가 없으면 None, 파생 지표가 아니거나 삭제된 지표를 참조하면 ValueError.
+    """
+    logic = dict(db.query(Metric.id, Metric.calculation_logic).filter(Metric.id == metric_id))
+    if metric_id not in logic:
+        return None
+    expressions: Dict[int, Expression] = {}
+    frontier = [metric_id]
+    while frontier:
+        for target_id in frontier:
+            expression = parse_expression(logic.get(target_id))
+            if expression is not None:
+                expressions[target_id] = expression
+        pending = {
+            input_id for target_id in frontier if target_id in expressions
+            for input_id in expressions[target_id].inputs
+        } - logic.keys()
+        logic.update(db.query(Metric.id, Metric.calculation_logic).filter(Metric.id.in_(pending)))
+        missing = pending - logic.keys()
+        if missing:
+            raise ValueError(f"Metric expression references deleted metrics: {sorted(missing)}")
+        frontier = list(pending)
+    if metric_id not in expressions:
+        raise ValueError("Metric is not a derived metric (calculation_logic has no metric[ID] expression)")
+
+    order, state = [], {}
+
+    def visit(node: int):
+        if state.get(node) == "done":
+            return
+        if state.get(node) == "visiting":
+            raise ValueError(f"Circular metric dependency at metric {node}")
+        state[node] = "visiting"
+        for input_id in expressions[node].inputs:
+            if input_id in expressions:
+                visit(input_id)
+        state[node] = "done"
+        order.append((node, expressions[node]))
+
+    visit(metric_id)
+    leaves = sorted({
+        input_id for _, expression in order for input_id in expression.inputs if input_id not in expressions
+    })
+    return DerivedPlan(metric_id, expressions[metric_id], tuple(leaves), tuple(order))
+
+
+def compute_series(db: Session, plan: DerivedPlan, bucket: str, agg: str, start: datetime, end: datetime):
+    """[start, end) 구간 파생 시계열 계산 (입력을 버킷별 agg로 집계 → 같은 버킷끼리 식 적용)
+
+    입력 지표 시계열은 한 번의 쿼리로 읽고, 입력 중 하나라도 값이 없는 버킷은 NaN.
+    """
+    rows = MetricService.series_query(db, plan.leaves, start, end, bucket, agg).all() if plan.leaves else []
+    timestamps = np.unique(np.array([row.timestamp for row in rows], dtype="datetime64[us]"))
+    series = {}
+    for leaf in plan.leaves:
+        series[leaf] = np.full(len(timestamps), np.nan)
+    if rows:
+        metric_ids = np.array([row.metric_id for row in rows])
+        positions = np.searchsorted(timestamps, np.array([row.timestamp for row in rows], dtype="datetime64[us]"))
+        values = np.array([row.value for row in rows], dtype=np.float64)
+        for leaf in plan.leaves:
+            mask = metric_ids == leaf
+            series[leaf][positions[mask]] = values[mask]
+    for metric_id, expression in plan.order:
+        series[metric_id] = evaluate_expression(expression, series, len(timestamps))
+    return timestamps, series[plan.metric_id]
+
+
+def _splice(entry: _MemoEntry, start: datetime, end: datetime, timestamps: np.ndarray, values: np.ndarray) -> _MemoEntry:
+    """메모 구간의 [start, end) 부분을 새로 계산한 값으로 교체 (구간 밖이면 메모 구간을 넓힌다)"""
+    keep = (entry.timestamps < np.datetime64(start, "us")) | (entry.timestamps >= np.datetime64(end, "us"))
+    merged_timestamps = np.concatenate([entry.timestamps[keep], timestamps])
+    merged_values = np.concatenate([entry.values[keep], values])
+    order = np.argsort(merged_timestamps, kind="stable")
+    return entry._replace(
+        start=min(entry.start, start),
+        end=max(entry.end, end),
+        timestamps=merged_timestamps[order],
+        values=merged_values[order],
+    )
+
+
+def _merge_intervals(intervals: List[Tuple[datetime, datetime]]):
+    merged = []
+    for low, high in sorted(intervals):
+        if merged and low <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], high))
+        else:
+            merged.append((low, high))
+    return merged
+
+
+class DerivedMetricService:
+    @staticmethod
+    def get_series(
+        db: Session,
+        metric_id: int,
+        bucket: str = "day",
+        agg: str = "avg",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ):
+        """파생 지표 시계열 (버킷 경계에 맞춘 [start, end), 기본은 최근 derived_default_buckets개 버킷)
+
+        (지표, 버킷, 집계)별로 계산한 구간을 메모하고, 다음 호출에서는 입력 지표의 변경 기록
+        (metric_changes) 중 메모 이후의 구간에 해당하는 버킷만 다시 계산한다.
+        요청 구간이 메모 구간과 이어지면 바깥 부분만 추가로 계산한다.
+        지표가 없으면 None, 파생 지표가 아니거나 구간이 너무 길면 ValueError.
+        """
+        plan = build_plan(db, metric_id)
+        if plan is None:
+            return None
+        started = time.perf_counter()
+
+        end = shift_bucket(floor_timestamp(normalize_timestamp(end or _utcnow()), bucket), bucket)
+        if start is None:
+            start = shift_bucket(end, bucket, -settings.derived_default_buckets)
+        else:
+            start = floor_timestamp(normalize_timestamp(start), bucket)
+        if start >= end:
+            raise ValueError("start must be before end")
+        if start < shift_bucket(end, bucket, -settings.timeseries_max_points):
+            raise ValueError(f"Range exceeds {settings.timeseries_max_points} buckets")
+
+        key = (metric_id, bucket, agg)
+        change_id = MetricDependencyService.last_change_id(db)
+        with _memo_lock:
+            entry = _memo.get(key)
+        recomputed, memo = 0, "miss"
+
+        if entry is not None and time.monotonic() - entry.synced_at > settings.derived_change_retention_hours * 3600:
+            # 메모 이후의 변경 기록이 정리되었을 수 있으므로 다시 계산
+            entry = None
+        if entry is not None:
+            ids = {plan.metric_id, *plan.leaves, *(node for node, _ in plan.order)}
+            dirty = []
+            for low, high in MetricDependencyService.changes_since(db, entry.change_id, ids):
+                low = max(floor_timestamp(low, bucket), entry.start) if low else entry.start
+                high = min(shift_bucket(floor_timestamp(high, bucket), bucket), entry.end) if high else entry.end
+                if low < high:
+                    dirty.append((low, high))
+            for low, high in _merge_intervals(dirty):
+                new_timestamps, new_values = compute_series(db, plan, bucket, agg, low, high)
+                recomputed += len(new_timestamps)
+                entry = _splice(entry, low, high, new_timestamps, new_values)
+            memo = "partial" if dirty else "hit"
+
+            if start > entry.end or end < entry.start:
+                entry = None  # 떨어진 구간은 메모를 새로 만든다
+            else:
+                for low, high in ((start, entry.start), (entry.end, end)):
+                    if low < high:
+                        new_timestamps, new_values = compute_series(db, plan, bucket, agg, low, high)
+                        recomputed += len(new_timestamps)
+                        entry = _splice(entry, low, high, new_timestamps, new_values)
+                        memo = "partial"
+
+        if entry is None:
+            timestamps, values = compute_series(db, plan, bucket, agg, start, end)
+            recomputed = len(timestamps)
+            entry = _MemoEntry(start, end, timestamps, values, change_id, time.monotonic())
+        entry = entry._replace(change_id=change_id, synced_at=time.monotonic())
+        with _memo_lock:
+            _memo[key] = entry
+            _memo.move_to_end(key)
+            while len(_memo) > settings.derived_memo_size:
+                _memo.popitem(last=False)
+
+        selected = (entry.timestamps >= np.datetime64(start, "us")) & (entry.timestamps < np.datetime64(end, "us"))
+        values = entry.values[selected]
+        return {
+            "metric_id": metric_id,
+            "expression": plan.expression.text,
+            "inputs": list(plan.expression.inputs),
+            "bucket": bucket,
+            "agg": agg,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "timestamps": [timestamp.isoformat() for timestamp in entry.timestamps[selected].astype(datetime)],
+            "values": [None if np.isnan(value) else float(value) for value in values],
+            "memo": memo,
+            "recomputed_buckets": recomputed,
+            "computed_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
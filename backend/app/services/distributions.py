@@ -0,0 +1,147 @@
+import numpy as np
+
+# 실험 통계용 분포 함수 (SciPy 없이 NumPy 배열 단위로 계산)
+
+_SQRT2 = np.sqrt(2.0)
+_TINY = 1e-300
+_EPS = 1e-12
+# 자유도가 이보다 크면 t 분포를 정규분포로 근사 (p-value 차이 < 1e-4)
+_NORMAL_DF = 1e5
+
+# Lanczos 근사 계수 (g=7, n=9)
+_LANCZOS = np.array([
+    0.99999999999980993, 676.5203681218851, -1259.1392167224028,
+    771.32342877765313, -176.61502916214059, 12.507343278686905,
+    -0.13857109526572012, 9.9843695780195716e-6, 1.5056327351493116e-7,
+])
+
+# Acklam 역정규분포 근사 계수
+_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+      1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+      6.680131188771972e+01, -1.328068155288572e+01)
+_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+      -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+      3.754408661907416e+00)
+
+
+def _polyval(coefficients, x):
+    result = np.zeros_like(x)
+    for c in coefficients:
+        result = result * x + c
+    return result
+
+
+def erfc(x):
+    """상보 오차함수 (Chebyshev 근사, 상대오차 < 1.2e-7)"""
+    x = np.asarray(x, dtype=float)
+    z = np.abs(x)
+    t = 1.0 / (1.0 + 0.5 * z)
+    poly = _polyval((0.17087277, -0.82215223, 1.48851587, -1.13520398, 0.27886807,
+                     -0.18628806, 0.09678418, 0.37409196, 1.00002368, -1.26551223), t)
+    ans = t * np.exp(-z * z + poly)
+    return np.where(x >= 0, ans, 2.0 - ans)
+
+
+def norm_cdf(x):
+    return 0.5 * erfc(-np.asarray(x, dtype=float) / _SQRT2)
+
+
+def norm_sf(x):
+    return 0.5 * erfc(np.asarray(x, dtype=float) / _SQRT2)
+
+
+def norm_ppf(p):
+    """표준정규분포 분위수 (Acklam 근사, 상대오차 < 1.2e-9)"""
+    p = np.asarray(p, dtype=float)
+    low, high = 0.02425, 1 - 0.02425
+    with np.errstate(divide="ignore", invalid="ignore"):
+        q = np.sqrt(-2 * np.log(np.where(p < low, p, 1 - p)))
+        tail = _polyval(_C, q) / (_polyval(_D, q) * q + 1)
+        r = (p - 0.5) ** 2
+        central = (p - 0.5) * _polyval(_A, r) / (_polyval(_B, r) * r + 1)
+    return np.where(p < low, tail, np.where(p > high, -tail, central))
+
+
+def lgamma(x):
+    """로그 감마 함수 (x >= 0.5, Lanczos 근사)"""
+    x = np.asarray(x, dtype=float) - 1.0
+    series = np.full_like(x, _LANCZOS[0])
+    for i in range(1, len(_LANCZOS)):
+        series = series + _LANCZOS[i] / (x + i)
+    t = x + 7.5
+    return 0.5 * np.log(2 * np.pi) + (x + 0.5) * np.log(t) - t + np.log(series)
+
+
+def _beta_continued_fraction(a, b, x, max_iterations=300):
+    """정규화 불완전 베타 함수의 연분수 (modified Lentz, 배열 전체가 수렴하면 종료)"""
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c = np.ones_like(x)
+    d = 1.0 - qab * x / qap
+    d = 1.0 / np.where(np.abs(d) < _TINY, _TINY, d)
+    h = d
+    for m in range(1, max_iterations + 1):
+        m2 = 2 * m
+        for aa in (m * (b - m) * x / ((qam + m2) * (a + m2)),
+                   -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))):
+            d = 1.0 + aa * d
+            d = 1.0 / np.where(np.abs(d) < _TINY, _TINY, d)
+            c = 1.0 + aa / c
+            c = np.where(np.abs(c) < _TINY, _TINY, c)
+            delta = d * c
+            h = h * delta
+        if np.all(np.abs(delta - 1.0) < _EPS):
+            break
+    return h
+
+
+def betainc(a, b, x):
+    """정규화 불완전 베타 함수 I_x(a, b)"""
+    a, b, x = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (a, b, x)))
+    x = np.clip(x, 0.0, 1.0)
+    # 연분수가 빨리 수렴하는 쪽으로 대칭 변환
+    swap = x > (a + 1.0) / (a + b + 2.0)
+    aa, bb, xx = np.where(swap, b, a), np.where(swap, a, b), np.where(swap, 1.0 - x, x)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        front = np.exp(
+            lgamma(aa + bb) - lgamma(aa) - lgamma(bb) + aa * np.log(xx) + bb * np.log1p(-xx)
+        )
+        value = front * _beta_continued_fraction(aa, bb, xx) / aa
+    value = np.where(xx <= 0.0, 0.0, value)
+    return np.where(swap, 1.0 - value, value)
+
+
+def t_sf_two_sided(t, df):
+    """Student t 양측 p-value P(|T| > |t|)"""
+    t, df = np.broadcast_arrays(np.asarray(t, dtype=float), np.asarray(df, dtype=float))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exact = betainc(df / 2.0, 0.5, df / (df + t * t))
+    return np.where(df > _NORMAL_DF, 2.0 * norm_sf(np.abs(t)), exact)
+
+
+def t_cdf(t, df):
+    t = np.asarray(t, dtype=float)
+    tail = 0.5 * t_sf_two_sided(t, df)
+    return np.where(t >= 0, 1.0 - tail, tail)
+
+
+def t_pdf(t, df):
+    t, df = np.asarray(t, dtype=float), np.asarray(df, dtype=float)
+    log_norm = lgamma((df + 1) / 2) - lgamma(df / 2) - 0.5 * np.log(df * np.pi)
+    return np.exp(log_norm - (df + 1) / 2 * np.log1p(t * t / df))
+
+
+def t_ppf(p, df):
+    """Student t 분위수 (Cornish-Fisher 전개 후 Newton 보정, 자유도 1까지 상대오차 < 1e-8)"""
+    p, df = np.broadcast_arrays(np.asarray(p, dtype=float), np.asarray(df, dtype=float))
+    z = norm_ppf(p)
+    z2 = z * z
+    t = (z
+         + z * (z2 + 1) / (4 * df)
+         + z * ((5 * z2 + 16) * z2 + 3) / (96 * df ** 2)
+         + z * (((3 * z2 + 19) * z2 + 17) * z2 - 15) / (384 * df ** 3)
+         + z * ((((79 * z2 + 776) * z2 + 1482) * z2 - 1920) * z2 - 945) / (92160 * df ** 4))
+    for _ in range(6):
+        t = t - (t_cdf(t, df) - p) / t_pdf(t, df)
+    return np.where(df > _NORMAL_DF, z, t)
@@ -0,0 +1,428 @@
+import json
+import math
+import time
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from ..cache import invalidate
+from ..config import settings
+from ..models.experiment import Experiment
+from ..models.experiment_accumulator import ExperimentAccumulator
+from ..models.experiment_observation import ExperimentObservation
+from ..models.metric import Metric
+from .data_point_service import _chunked, normalize_timestamp
+from .distributions import norm_ppf, norm_sf, t_ppf, t_sf_two_sided
+
+METRIC_ROLES = ("primary", "secondary", "guardrail")
+
+
+def parse_id_list(raw: Optional[str]) -> List[int]:
+    """JSON 배열 문자열('[1, "2"]')을 정수 ID 목록으로 변환"""
+    if not raw:
+        return []
+    try:
+        values = json.loads(raw)
+    except ValueError:
+        return []
+    ids = []
+    for value in values if isinstance(values, list) else []:
+        try:
+            ids.append(int(value))
+        except (TypeError, ValueError):
+            continue
+    return ids
+
+
+def parse_variants(raw: Optional[str]) -> Tuple[List[str], np.ndarray]:
+    """variants JSON에서 (그룹 이름 목록, traffic_allocation(%) 배열) 추출 (첫 번째가 대조군)
+
+    문자열 항목은 비율이 없는 그룹으로 본다. 비율이 없거나 잘못된 그룹은 0(트래픽 없음)이고,
+    모든 그룹의 비율이 0이면 전체 트래픽을 균등 배분한다. 중복된 이름은 처음 것만 쓴다.
+    """
+    try:
+        variants = json.loads(raw) if raw else []
+    except ValueError:
+        variants = []
+    names, weights = [], []
+    for variant in variants if isinstance(variants, list) else []:
+        name = variant.get("name") if isinstance(variant, dict) else variant
+        if not isinstance(name, str) or name in names:
+            continue
+        names.append(name)
+        try:
+            weight = float(variant.get("traffic_allocation") or 0) if isinstance(variant, dict) else 0.0
+        except (TypeError, ValueError):
+            weight = 0.0
+        weights.append(weight if math.isfinite(weight) and weight > 0 else 0.0)
+    weights = np.array(weights, dtype=float)
+    if names and weights.sum() <= 0:
+        weights = np.full(len(names), 100 / len(names))
+    return names, weights
+
+
+def parse_variant_names(raw: Optional[str]) -> List[str]:
+    """variants JSON에서 그룹 이름 목록 추출 (첫 번째가 대조군)"""
+    return parse_variants(raw)[0]
+
+
+def metric_roles(experiment: Experiment) -> dict:
+    """실험에 연결된 지표 ID -> 역할 (여러 역할이면 primary > secondary > guardrail)"""
+    roles = {}
+    for role in METRIC_ROLES:
+        for metric_id in parse_id_list(getattr(experiment, f"{role}_metric_ids")):
+            roles.setdefault(metric_id, role)
+    return roles
+
+
+def _batch_moments(keys: List[tuple], values):
+    """적재 청크의 그룹별 n, 평균, M2, 최소/최대, 0/1 외 관측값 수 (NumPy two-pass)"""
+    positions = {}
+    group_index = np.fromiter((positions.setdefault(key, len(positions)) for key in keys), np.int64, len(keys))
+    size = len(positions)
+    n = np.bincount(group_index, minlength=size)
+    mean = np.bincount(group_index, weights=values, minlength=size) / n
+    m2 = np.bincount(group_index, weights=(values - mean[group_index]) ** 2, minlength=size)
+    non_binary = np.bincount(group_index, weights=(values != 0) & (values != 1), minlength=size)
+    minimum = np.full(size, np.inf)
+    maximum = np.full(size, -np.inf)
+    np.minimum.at(minimum, group_index, values)
+    np.maximum.at(maximum, group_index, values)
+    return [
+        {
+            "metric_id": metric_id,
+            "variant": variant,
+            "n": int(n[i]),
+            "mean": float(mean[i]),
+            "m2": float(m2[i]),
+            "min_value": float(minimum[i]),
+            "max_value": float(maximum[i]),
+            "non_binary": int(non_binary[i]),
+        }
+        for (metric_id, variant), i in positions.items()
+    ]
+
+
+def _merge_statement():
+    """누적값과 청크 통계량을 Chan의 병렬 공식으로 병합하는 upsert
+
+    SET 절의 컬럼 참조는 모두 갱신 전 값이므로 n, 평균, M2를 한 문장에서 병합할 수 있다.
+    """
+    stmt = insert(ExperimentAccumulator)
+    current = ExperimentAccumulator.__table__.c
+    batch = stmt.excluded
+    total = current.n + batch.n
+    delta = batch.mean - current.mean
+    return stmt.on_conflict_do_update(
+        index_elements=["experiment_id", "metric_id", "variant"],
+        set_={
+            "n": total,
+            "mean": current.mean + delta * batch.n / total,
+            "m2": current.m2 + batch.m2 + delta * delta * current.n * batch.n / total,
+            "min_value": func.min(current.min_value, batch.min_value),
+            "max_value": func.max(current.max_value, batch.max_value),
+            "non_binary": current.non_binary + batch.non_binary,
+            "updated_at": func.now(),
+        }
+    )
+
+
+def _load_accumulators(db: Session, experiment_id: int, metric_ids: List[int], variants: List[str]):
+    """누적 통계량을 (지표 수, 그룹 수) 배열로 조회 (관측값 수와 무관하게 지표 x 그룹 행만 읽음)"""
+    rows = db.query(
+        ExperimentAccumulator.metric_id,
+        ExperimentAccumulator.variant,
+        ExperimentAccumulator.n,
+        ExperimentAccumulator.mean,
+        ExperimentAccumulator.m2,
+        ExperimentAccumulator.non_binary
+    ).filter(ExperimentAccumulator.experiment_id == experiment_id).all()
+
+    shape = (len(metric_ids), len(variants))
+    n, mean, m2, non_binary = np.zeros(shape), np.full(shape, np.nan), np.zeros(shape), np.zeros(shape)
+    metric_position = {metric_id: i for i, metric_id in enumerate(metric_ids)}
+    variant_position = {name: i for i, name in enumerate(variants)}
+    for metric_id, variant, count, group_mean, group_m2, group_non_binary in rows:
+        if metric_id not in metric_position or variant not in variant_position:
+            continue
+        index = (metric_position[metric_id], variant_position[variant])
+        n[index], mean[index], m2[index], non_binary[index] = count, group_mean, group_m2, group_non_binary
+    # 모든 그룹의 관측값이 0/1이면 비율 지표로 보고 z-검정을 사용
+    is_proportion = non_binary.sum(axis=1) == 0
+    return n, mean, m2, is_proportion
+
+
+def compare_variants(n, mean, m2, is_proportion, alpha: float):
+    """대조군(0번 열) 대비 각 실험군의 차이, 리프트, 신뢰구간, p-value
+
+    모든 입력은 (지표 수, 그룹 수) 배열이며 지표 x 실험군 전체를 한 번에 계산한다.
+    연속형 지표는 Welch t-검정, 비율 지표는 two-proportion z-검정을 사용한다.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance = m2 / (n - 1)
+        nc, nt = n[:, :1], n[:, 1:]
+        mc, mt = mean[:, :1], mean[:, 1:]
+        vc, vt = variance[:, :1], variance[:, 1:]
+        diff = mt - mc
+
+        # Welch t-검정
+        a, b = vt / nt, vc / nc
+        se = np.sqrt(a + b)
+        df = (a + b) ** 2 / (a ** 2 / (nt - 1) + b ** 2 / (nc - 1))
+        p_t = t_sf_two_sided(diff / se, df)
+        margin_t = t_ppf(1 - alpha / 2, df) * se
+
+        # 비율 z-검정 (검정은 합동 표준오차, 구간은 비합동 표준오차)
+        pooled = (mt * nt + mc * nc) / (nt + nc)
+        se_pooled = np.sqrt(pooled * (1 - pooled) * (1 / nt + 1 / nc))
+        p_z = 2 * norm_sf(np.abs(diff / se_pooled))
+        margin_z = norm_ppf(1 - alpha / 2) * np.sqrt(mt * (1 - mt) / nt + mc * (1 - mc) / nc)
+
+        proportion = is_proportion[:, None]
+        p_value = np.where(proportion, p_z, p_t)
+        margin = np.where(proportion, margin_z, margin_t)
+        lift = diff / mc
+        scale = np.abs(mc)
+
+        return {
+            "std": np.sqrt(variance),
+            "diff": diff,
+            "lift": lift,
+            "ci_low": diff - margin,
+            "ci_high": diff + margin,
+            "lift_ci_low": (diff - margin) / scale,
+            "lift_ci_high": (diff + margin) / scale,
+            "p_value": p_value,
+            "significant": p_value < alpha,
+        }
+
+
+def sequential_test(n, mean, m2, alpha: float, mde: float):
+    """mSPRT (정규 혼합 사전분포) 기반 always-valid p-value와 신뢰 시퀀스
+
+    매 조회 시점마다 확인해도 1종 오류가 alpha로 유지되므로, 통계량이
+    경계(1/alpha)를 넘으면 이력 재계산 없이 조기 종료를 판단할 수 있다.
+    혼합 분포 분산은 (MDE x 대조군 평균)^2 로 둔다.
+    """
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        variance = m2 / (n - 1)
+        diff = mean[:, 1:] - mean[:, :1]
+        v = variance[:, 1:] / n[:, 1:] + variance[:, :1] / n[:, :1]
+        tau2 = (mde * np.abs(mean[:, :1])) ** 2
+        log_likelihood_ratio = 0.5 * np.log(v / (v + tau2)) + tau2 * diff ** 2 / (2 * v * (v + tau2))
+        half_width = np.sqrt(v * (v + tau2) / tau2 * (np.log((v + tau2) / v) - 2 * np.log(alpha)))
+        return {
+            "log_likelihood_ratio": log_likelihood_ratio,
+            "always_valid_p": np.minimum(1.0, np.exp(-log_likelihood_ratio)),
+            "cs_low": diff - half_width,
+            "cs_high": diff + half_width,
+            "boundary_crossed": log_likelihood_ratio >= -np.log(alpha),
+        }
+
+
+def _number(value):
+    """NaN/inf는 JSON에서 null로"""
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+
+class ExperimentAnalysisService:
+    @staticmethod
+    def ingest_observations(db: Session, experiment_id: int, observations: Iterable[dict]):
+        """실험 관측값 일괄 적재 (전체를 하나의 트랜잭션으로 커밋)
+
+        원본 관측값을 기록하면서 청크별 통계량을 (실험, 지표, 그룹) 누적값에 병합한다.
+        연결되지 않은 지표나 정의되지 않은 그룹의 관측값이 있으면 ValueError.
+        실험이 없으면 None.
+        """
+        experiment = db.query(Experiment).filter(Experiment.id == experiment_id).first()
+        if not experiment:
+            return None
+        metric_ids = set(metric_roles(experiment))
+        variants = set(parse_variant_names(experiment.variants))
+
+        started = time.perf_counter()
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        merge = _merge_statement()
+        written = 0
+        seen_metrics = set()
+        try:
+            for chunk in _chunked(observations, settings.ingest_chunk_size):
+                rows = []
+                for observation in chunk:
+                    if observation["metric_id"] not in metric_ids:
+                        raise ValueError(f"Metric {observation['metric_id']} is not linked to this experiment")
+                    if observation["variant"] not in variants:
+                        raise ValueError(f"Unknown variant: {observation['variant']}")
+                    rows.append({
+                        "experiment_id": experiment_id,
+                        "metric_id": observation["metric_id"],
+                        "variant": observation["variant"],
+                        "unit_id": observation.get("unit_id"),
+                        "value": observation["value"],
+                        "timestamp": normalize_timestamp(observation["timestamp"]) if observation.get("timestamp") else now,
+                    })
+                    seen_metrics.add(observation["metric_id"])
+                db.execute(ExperimentObservation.__table__.insert(), rows)
+
+                moments = _batch_moments(
+                    [(row["metric_id"], row["variant"]) for row in rows],
+                    np.fromiter((row["value"] for row in rows), float, len(rows))
+                )
+                db.execute(merge, [{"experiment_id": experiment_id, **moment} for moment in moments])
+                written += len(rows)
+            db.commit()
+            invalidate(f"experiments:{experiment_id}")
+        except Exception:
+            db.rollback()
+            raise
+
+        elapsed = time.perf_counter() - started
+        return {
+            "written": written,
+            "metrics": len(seen_metrics),
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "rows_per_sec": round(written / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+
+    @staticmethod
+    def rebuild_accumulators(db: Session, experiment_id: Optional[int] = None):
+        """원본 관측값으로부터 누적 통계량 재계산 (그룹 평균 후 편차제곱합을 구하는 two-pass)"""
+        observation = ExperimentObservation
+        filters = [] if experiment_id is None else [observation.experiment_id == experiment_id]
+        groups = (
+            select(
+                observation.experiment_id,
+                observation.metric_id,
+                observation.variant,
+                func.count().label("n"),
+                func.avg(observation.value).label("mean"),
+                func.min(observation.value).label("min_value"),
+                func.max(observation.value).label("max_value"),
+                func.sum(case((observation.value.in_((0, 1)), 0), else_=1)).label("non_binary")
+            )
+            .where(*filters)
+            .group_by(observation.experiment_id, observation.metric_id, observation.variant)
+            .subquery("groups")
+        )
+        deviation = observation.value - groups.c.mean
+        m2 = (
+            select(func.sum(deviation * deviation))
+            .where(
+                observation.experiment_id == groups.c.experiment_id,
+                observation.metric_id == groups.c.metric_id,
+                observation.variant == groups.c.variant
+            )
+            .scalar_subquery()
+        )
+
+        accumulators = db.query(ExperimentAccumulator)
+        if experiment_id is not None:
+            accumulators = accumulators.filter(ExperimentAccumulator.experiment_id == experiment_id)
+        accumulators.delete(synchronize_session=False)
+        db.execute(
+            insert(ExperimentAccumulator).from_select(
+                ["experiment_id", "metric_id", "variant", "n", "mean", "m2", "min_value", "max_value", "non_binary"],
+                select(
+                    groups.c.experiment_id, groups.c.metric_id, groups.c.variant, groups.c.n, groups.c.mean,
+                    m2, groups.c.min_value, groups.c.max_value, groups.c.non_binary
+                )
+            )
+        )
+        db.commit()
+        invalidate("experiments")
+
+    @staticmethod
+    def get_results(db: Session, experiment_id: int):
+        """실험 결과 계산 (누적 통계량으로 지표 x 그룹을 NumPy로 일괄 계산)
+
+        첫 번째 그룹을 대조군으로 보고 나머지 그룹과 비교한다.
+        가드레일 지표는 Metric.higher_is_better 기준으로 나빠지는 방향의 단측 검정이 유의하면 위반으로 표시한다.
+        주 지표가 순차 검정 경계를 넘거나, 가드레일이 나빠지는 방향으로 경계를 넘으면 조기 종료를 권고한다.
+        실험이 없으면 None, 그룹이 2개 미만이면 ValueError.
+        """
+        experiment = db.query(Experiment).filter(Experiment.id == experiment_id).first()
+        if not experiment:
+            return None
+        variants = parse_variant_names(experiment.variants)
+        if len(variants) < 2:
+            raise ValueError("Experiment needs a control and at least one treatment variant")
+        roles = metric_roles(experiment)
+        metric_ids = list(roles)
+        alpha = experiment.significance_level or 0.05
+        mde = experiment.minimum_detectable_effect or settings.sequential_default_mde
+
+        started = time.perf_counter()
+        n, mean, m2, is_proportion = _load_accumulators(db, experiment_id, metric_ids, variants)
+        stats = compare_variants(n, mean, m2, is_proportion, alpha)
+        sequential = sequential_test(n, mean, m2, alpha, mde)
+        # 지표 방향 (higher_is_better가 없으면 높을수록 좋은 지표로 본다)
+        directions = dict(db.query(Metric.id, Metric.higher_is_better).filter(Metric.id.in_(metric_ids)))
+        higher_is_better = np.array([directions.get(metric_id) is not False for metric_id in metric_ids])[:, None]
+        stats["harmful"] = np.where(higher_is_better, stats["diff"] < 0, stats["diff"] > 0)
+        stats["degraded"] = stats["harmful"] & (stats["p_value"] / 2 < alpha)
+        return ExperimentAnalysisService._format_results(
+            experiment, variants, metric_ids, roles, alpha, n, mean, is_proportion, stats, sequential, started
+        )
+
+    @staticmethod
+    def _format_results(
+        experiment, variants, metric_ids, roles, alpha, n, mean, is_proportion, stats, sequential, started
+    ):
+        metrics = []
+        breaches = []
+        stop_reasons = []
+        for i, metric_id in enumerate(metric_ids):
+            role = roles[metric_id]
+            rows = [{
+                "variant": variants[0],
+                "n": int(n[i, 0]),
+                "mean": _number(mean[i, 0]),
+                "std": _number(stats["std"][i, 0]),
+            }]
+            guardrail_breached = False
+            for j, name in enumerate(variants[1:]):
+                significant = bool(stats["significant"][i, j])
+                boundary_crossed = bool(sequential["boundary_crossed"][i, j])
+                rows.append({
+                    "variant": name,
+                    "n": int(n[i, j + 1]),
+                    "mean": _number(mean[i, j + 1]),
+                    "std": _number(stats["std"][i, j + 1]),
+                    **{
+                        key: _number(stats[key][i, j])
+                        for key in ("diff", "lift", "ci_low", "ci_high", "lift_ci_low", "lift_ci_high", "p_value")
+                    },
+                    "significant": significant,
+                    "sequential": {
+                        "always_valid_p": _number(sequential["always_valid_p"][i, j]),
+                        "cs_low": _number(sequential["cs_low"][i, j]),
+                        "cs_high": _number(sequential["cs_high"][i, j]),
+                        "boundary_crossed": boundary_crossed,
+                    },
+                })
+                if role == "guardrail" and stats["degraded"][i, j]:
+                    guardrail_breached = True
+                    breaches.append({"metric_id": metric_id, "variant": name})
+                if boundary_crossed and (role == "primary" or role == "guardrail" and stats["harmful"][i, j]):
+                    stop_reasons.append({"metric_id": metric_id, "variant": name, "role": role})
+            metrics.append({
+                "metric_id": metric_id,
+                "role": role,
+                "test": "proportion_z" if is_proportion[i] else "welch_t",
+                "variants": rows,
+                "guardrail_breached": guardrail_breached,
+            })
+
+        return {
+            "experiment_id": experiment.id,
+            "control": variants[0],
+            "variants": variants,
+            "alpha": alpha,
+            "metrics": metrics,
+            "guardrail_breaches": breaches,
+            "early_stop": {"recommended": bool(stop_reasons), "reasons": stop_reasons},
+            "computed_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
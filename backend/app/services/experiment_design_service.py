@@ -0,0 +1,206 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import List, Optional
+import numpy as np
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+from ..cache import cache
+from ..config import settings
+from ..models.experiment import Experiment
+from ..models.metric import Metric
+from .experiment_analysis_service import _number, parse_id_list, parse_variants
+from .metric_service import MetricService
+from .distributions import norm_cdf, norm_ppf
+
+# 지표별 기준선 통계 메모 ((metric_id, 기간) -> (metrics 무효화 세대, 통계))
+_baselines = OrderedDict()
+_baselines_lock = threading.Lock()
+
+
+def _load_baseline(db: Session, metric_id: int, window_days: int):
+    """최근 window_days 동안의 데이터 포인트로 기준선 평균/분산/일 방문자 수 계산
+
+    단위가 %이거나 값이 [0, 1]인 지표는 비율 지표로 보고, 방문자 수 가중 전환율의 베르누이 분산
+    p(1 - p)를 단위 분산으로 쓴다 (% 지표는 p = 값 / 100). 그 외 지표는 집계 값의 분산만 알 수 있으므로
+    variance를 "aggregate"로 표시한다. 압축으로 원본이 삭제된 날은 일별 롤업 값을 그 날의 포인트로 읽는다.
+    """
+    unit = db.query(Metric.unit).filter(Metric.id == metric_id).scalar()
+    series = MetricService.raw_series_query(db, [metric_id], None, None, None, "avg").subquery()
+    latest = db.query(func.max(series.c.timestamp)).scalar()
+    if latest is None:
+        return None
+    value, visitors = series.c.value, series.c.visitor_count
+    counted = visitors > 0
+    points, mean, mean_square, min_value, max_value, weighted_sum, visitor_sum, visitor_days = db.query(
+        func.count(),
+        func.avg(value),
+        func.avg(value * value),
+        func.min(value),
+        func.max(value),
+        func.sum(case((counted, value * visitors))),
+        func.sum(case((counted, visitors))),
+        func.count(func.distinct(case((counted, func.date(series.c.timestamp)))))
+    ).filter(series.c.timestamp > latest - timedelta(days=window_days)).one()
+
+    scale = 100.0 if unit == "%" else 1.0
+    is_proportion = min_value >= 0 and max_value <= scale and (unit == "%" or max_value <= 1)
+    if is_proportion:
+        if visitor_sum:
+            mean = weighted_sum / visitor_sum
+        rate = mean / scale
+        std = scale * math.sqrt(max(rate * (1 - rate), 0.0))
+    else:
+        std = math.sqrt(max(mean_square - mean * mean, 0.0) * points / max(points - 1, 1))
+    return {
+        "metric_id": metric_id,
+        "mean": mean,
+        "std": std,
+        "unit": unit,
+        "is_proportion": is_proportion,
+        "variance": "bernoulli" if is_proportion else "aggregate",
+        "points": points,
+        "daily_visitors": visitor_sum / visitor_days if visitor_days else None,
+        "window_days": window_days,
+    }
+
+
+def get_baseline(db: Session, metric_id: int, window_days: int):
+    """기준선 통계 (지표 데이터가 바뀌어 metrics 태그가 무효화될 때까지 메모)"""
+    key = (metric_id, window_days)
+    generation = cache.generation("metrics")
+    with _baselines_lock:
+        memo = _baselines.get(key)
+        if memo is not None and memo[0] == generation:
+            _baselines.move_to_end(key)
+            return memo[1]
+    baseline = _load_baseline(db, metric_id, window_days)
+    with _baselines_lock:
+        _baselines[key] = (generation, baseline)
+        _baselines.move_to_end(key)
+        while len(_baselines) > settings.design_baseline_memo_size:
+            _baselines.popitem(last=False)
+    return baseline
+
+
+def power_grid(effects, totals, std: float, control_weight: float, treatment_weight: float, alpha: float):
+    """(효과 크기 x 전체 표본 수) 검정력 행렬 (양측 z-검정, 브로드캐스팅 한 번으로 계산)"""
+    effects = np.asarray(effects, dtype=float)[:, None]
+    totals = np.asarray(totals, dtype=float)[None, :]
+    z_alpha = norm_ppf(1 - alpha / 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        se = std * np.sqrt(1 / (totals * control_weight) + 1 / (totals * treatment_weight))
+        shift = effects / se
+    return norm_cdf(shift - z_alpha) + norm_cdf(-shift - z_alpha)
+
+
+def required_totals(effects, std: float, control_weight: float, treatment_weight: float, alpha: float, power: float):
+    """효과 크기별로 필요한 전체 표본 수 (모든 그룹 합계)"""
+    effects = np.asarray(effects, dtype=float)
+    z = norm_ppf(1 - alpha / 2) + norm_ppf(power)
+    with np.errstate(divide="ignore"):
+        return np.ceil(z ** 2 * std ** 2 * (1 / control_weight + 1 / treatment_weight) / effects ** 2)
+
+
+def _numbers(values) -> List:
+    return [_number(value) for value in np.ravel(values)]
+
+
+class ExperimentDesignService:
+    @staticmethod
+    def get_design(
+        db: Session,
+        experiment_id: int,
+        metric_id: Optional[int] = None,
+        alpha: Optional[float] = None,
+        power: Optional[float] = None,
+        mde: Optional[float] = None,
+        baseline_mean: Optional[float] = None,
+        baseline_std: Optional[float] = None,
+        aggregate_variance: bool = False
+    ):
+        """실험 설계 (필요 표본 수, 예상 기간, MDE x 표본 수 검정력 곡선)
+
+        인자로 주어진 값은 실험에 저장된 유의수준/검정력/MDE와 기준선을 덮어쓴다 (UI 슬라이더용).
+        MDE는 기준선 평균 대비 상대값이며, 가장 트래픽이 적은 실험군과 대조군 비교 기준으로 계산한다.
+        비율 지표가 아니면 단위 분산을 알 수 없으므로 baseline_std를 주거나 aggregate_variance로
+        집계 값의 분산을 쓰겠다고 명시해야 한다. 트래픽 비율이 0인 그룹은 계산에서 제외한다.
+        실험이 없으면 None, 기준선이나 배분 비율로 계산할 수 없으면 ValueError.
+        """
+        experiment = db.query(Experiment).filter(Experiment.id == experiment_id).first()
+        if not experiment:
+            return None
+        started = time.perf_counter()
+        alpha = alpha or experiment.significance_level or 0.05
+        power = power or experiment.statistical_power or 0.8
+        mde = mde or experiment.minimum_detectable_effect or settings.sequential_default_mde
+        if metric_id is None:
+            primary = parse_id_list(experiment.primary_metric_ids)
+            if not primary:
+                raise ValueError("Experiment has no primary metric")
+            metric_id = primary[0]
+
+        baseline = get_baseline(db, metric_id, settings.design_baseline_days)
+        if baseline is None and (baseline_mean is None or baseline_std is None):
+            raise ValueError(f"No baseline data for metric {metric_id}")
+        baseline = dict(baseline or {"metric_id": metric_id, "unit": None, "is_proportion": False, "points": 0,
+                                     "daily_visitors": None, "window_days": settings.design_baseline_days})
+        if baseline_mean is not None:
+            baseline["mean"] = baseline_mean
+            if baseline["is_proportion"] and baseline_std is None:
+                scale = 100.0 if baseline["unit"] == "%" else 1.0
+                rate = baseline_mean / scale
+                baseline["std"] = scale * math.sqrt(max(rate * (1 - rate), 0.0))
+        if baseline_std is not None:
+            baseline["std"] = baseline_std
+            baseline["variance"] = "given"
+        if baseline["variance"] == "aggregate" and not aggregate_variance:
+            raise ValueError(
+                f"Metric {metric_id} is not a proportion metric, so its per-unit variance is unknown; "
+                "pass baseline_std or aggregate_variance=true to use the variance of its aggregated values"
+            )
+        if not baseline["mean"]:
+            raise ValueError("Baseline mean must be non-zero for a relative MDE")
+
+        names, weights = parse_variants(experiment.variants)
+        if len(names) < 2:
+            names, weights = ["Control", "Treatment"], np.array([50.0, 50.0])
+        weights = weights / weights.sum()
+        treatment_weights = weights[1:][weights[1:] > 0]
+        if weights[0] <= 0 or not len(treatment_weights):
+            raise ValueError("Control and at least one treatment variant need a traffic allocation")
+        control_weight, treatment_weight = weights[0], treatment_weights.min()
+        std, scale = baseline["std"], abs(baseline["mean"])
+
+        total = int(required_totals([mde * scale], std, control_weight, treatment_weight, alpha, power)[0])
+        mde_curve = np.geomspace(mde / 4, mde * 4, settings.design_grid_size)
+        total_curve = np.unique(np.ceil(np.geomspace(max(total / 10, 2), total * 10, settings.design_grid_size)))
+        daily_visitors = baseline["daily_visitors"]
+
+        return {
+            "experiment_id": experiment.id,
+            "metric_id": metric_id,
+            "alpha": alpha,
+            "power": power,
+            "mde": mde,
+            "baseline": baseline,
+            "allocation": dict(zip(names, weights.tolist())),
+            "sample_size": {
+                "total": total,
+                "per_variant": {name: int(math.ceil(total * weight)) for name, weight in zip(names, weights)},
+                "estimated_days": math.ceil(total / daily_visitors) if daily_visitors else None,
+            },
+            "curves": {
+                "mde": mde_curve.tolist(),
+                "required_total": _numbers(
+                    required_totals(mde_curve * scale, std, control_weight, treatment_weight, alpha, power)
+                ),
+                "total": total_curve.tolist(),
+                "power": power_grid(
+                    mde_curve * scale, total_curve, std, control_weight, treatment_weight, alpha
+                ).tolist(),
+            },
+            "computed_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
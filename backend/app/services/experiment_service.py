@@ -1,7 +1,28 @@
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, Sequence
+from ..cache import invalidate
 from ..models.experiment import Experiment
+from ..models.experiment_accumulator import ExperimentAccumulator
+from ..models.experiment_metric import ExperimentMetric
+from ..models.metric import Metric
+from ..models.experiment_observation import ExperimentObservation
 from ..schemas.experiment import ExperimentCreate, ExperimentUpdate
+from .experiment_analysis_service import METRIC_ROLES, parse_id_list
+from .pagination import keyset_paginate
+from .projection import load_fields
+from .search_service import SearchService
+
+
+def metric_links(experiment):
+    """*_metric_ids JSON을 experiment_metrics 행 목록으로 변환 (Experiment 또는 같은 컬럼을 가진 행)"""
+    links = set()
+    for role in METRIC_ROLES:
+        for metric_id in parse_id_list(getattr(experiment, f"{role}_metric_ids")):
+            links.add((metric_id, role))
+    return [
+        {"experiment_id": experiment.id, "metric_id": metric_id, "role": role}
+        for metric_id, role in sorted(links)
+    ]
 
 
 class ExperimentService:
@@ -11,38 +32,95 @@ class ExperimentService:
         skip: int = 0,
         limit: int = 100,
         search: Optional[str] = None,
-        status: Optional[str] = None
+        status: Optional[str] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        metric_id: Optional[int] = None,
+        role: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
     ):
-        """모든 실험 조회"""
-        query = db.query(Experiment)
+        """모든 실험 조회 (최신 생성 순, OFFSET 또는 커서 페이지네이션)"""
+        query = load_fields(db.query(Experiment), Experiment, fields)
 
-        # 검색 필터
+        # 검색 필터 (FTS5 인덱스)
         if search:
-            query = query.filter(
-                (Experiment.name.contains(search)) |
-                (Experiment.description.contains(search))
-            )
+            query = query.filter(Experiment.id.in_(SearchService.match_ids("experiment", search)))
 
         # 상태 필터
         if status:
             query = query.filter(Experiment.status == status)
 
-        total = query.count()
-        items = query.order_by(Experiment.created_at.desc()).offset(skip).limit(limit).all()
+        # 지표/역할 필터 (experiment_metrics 인덱스)
+        if metric_id is not None or role:
+            links = db.query(ExperimentMetric.experiment_id)
+            if metric_id is not None:
+                links = links.filter(ExperimentMetric.metric_id == metric_id)
+            if role:
+                links = links.filter(ExperimentMetric.role == role)
+            query = query.filter(Experiment.id.in_(links))
+
+        total = query.count() if include_total else None
+        items, next_cursor = keyset_paginate(
+            query,
+            [Experiment.created_at, Experiment.id],
+            limit,
+            skip=skip,
+            cursor=cursor,
+            descending=True
+        )
 
-        return {"total": total, "items": items}
+        return {"total": total, "items": items, "next_cursor": next_cursor}
 
     @staticmethod
-    def get_experiment_by_id(db: Session, experiment_id: int):
+    def get_experiment_by_id(db: Session, experiment_id: int, fields: Optional[Sequence[str]] = None):
         """ID로 실험 조회"""
-        return db.query(Experiment).filter(Experiment.id == experiment_id).first()
+        return load_fields(db.query(Experiment), Experiment, fields).filter(Experiment.id == experiment_id).first()
+
+    @staticmethod
+    def get_experiments_by_metric(
+        db: Session,
+        metric_id: int,
+        role: Optional[str] = None,
+        status: Optional[str] = None
+    ):
+        """지표를 사용하는 실험 목록 (역할별, 최신 생성 순). 지표가 없으면 None"""
+        if not db.query(Metric.id).filter(Metric.id == metric_id).first():
+            return None
+        query = (
+            db.query(ExperimentMetric.role, Experiment)
+            .join(Experiment, Experiment.id == ExperimentMetric.experiment_id)
+            .filter(ExperimentMetric.metric_id == metric_id)
+        )
+        if role:
+            query = query.filter(ExperimentMetric.role == role)
+        if status:
+            query = query.filter(Experiment.status == status)
+        rows = query.order_by(Experiment.created_at.desc(), Experiment.id.desc()).all()
+        return {
+            "metric_id": metric_id,
+            "items": [{"role": link_role, "experiment": experiment} for link_role, experiment in rows],
+        }
+
+    @staticmethod
+    def sync_metric_links(db: Session, experiment: Experiment):
+        """실험의 지표 JSON 필드를 experiment_metrics에 반영 (커밋은 호출자)"""
+        db.query(ExperimentMetric).filter(
+            ExperimentMetric.experiment_id == experiment.id
+        ).delete(synchronize_session=False)
+        links = metric_links(experiment)
+        if links:
+            db.execute(ExperimentMetric.__table__.insert(), links)
 
     @staticmethod
     def create_experiment(db: Session, experiment: ExperimentCreate):
         """새 실험 생성"""
         db_experiment = Experiment(**experiment.model_dump())
         db.add(db_experiment)
+        db.flush()
+        ExperimentService.sync_metric_links(db, db_experiment)
+        SearchService.index_entity(db, "experiment", db_experiment)
         db.commit()
+        invalidate("experiments")
         db.refresh(db_experiment)
         return db_experiment
 
@@ -57,7 +135,11 @@ class ExperimentService:
         for key, value in update_data.items():
             setattr(db_experiment, key, value)
 
+        if any(f"{role}_metric_ids" in update_data for role in METRIC_ROLES):
+            ExperimentService.sync_metric_links(db, db_experiment)
+        SearchService.index_entity(db, "experiment", db_experiment)
         db.commit()
+        invalidate("experiments")
         db.refresh(db_experiment)
         return db_experiment
 
@@ -68,6 +150,17 @@ class ExperimentService:
         if not db_experiment:
             return False
 
+        SearchService.remove_entity(db, "experiment", experiment_id)
+        db.query(ExperimentObservation).filter(
+            ExperimentObservation.experiment_id == experiment_id
+        ).delete(synchronize_session=False)
+        db.query(ExperimentAccumulator).filter(
+            ExperimentAccumulator.experiment_id == experiment_id
+        ).delete(synchronize_session=False)
+        db.query(ExperimentMetric).filter(
+            ExperimentMetric.experiment_id == experiment_id
+        ).delete(synchronize_session=False)
         db.delete(db_experiment)
         db.commit()
+        invalidate("experiments")
         return True
@@ -0,0 +1,179 @@
+import csv
+import io
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Iterator, Optional, Sequence
+from sqlalchemy import String, literal_column, select, type_coerce, union_all
+from ..config import settings
+from ..database import ReadSessionLocal
+from ..models.metric_data_point import MetricDataPoint
+from ..models.metric_rollup import MetricRollup
+from .compaction_service import CompactionService
+from .data_point_service import normalize_timestamp
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ("metric_id", "timestamp", "value", "visitor_count")
+
+# 형식별 (미디어 타입, 파일 확장자)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrow"),
+}
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ValueError("Arrow export requires the optional 'pyarrow' package")
+    return pyarrow
+
+
+def _iso(timestamp: str) -> str:
+    """SQLite 저장 형식('YYYY-mm-dd HH:MM:SS.ffffff')을 ISO 8601로 변환"""
+    return timestamp.replace(" ", "T", 1)
+
+
+def _csv_chunks(batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(COLUMNS)
+    for rows in batches:
+        writer.writerows((metric_id, _iso(ts), value, visitor_count) for metric_id, ts, value, visitor_count in rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def _ndjson_chunks(batches):
+    for rows in batches:
+        yield "".join(
+            json.dumps({"metric_id": metric_id, "timestamp": _iso(ts), "value": value, "visitor_count": visitor_count})
+            + "\n"
+            for metric_id, ts, value, visitor_count in rows
+        ).encode("utf-8")
+
+
+class _Drain:
+    """pyarrow 스트림 writer가 쓴 바이트를 배치마다 꺼내기 위한 파일 객체"""
+
+    def __init__(self):
+        self.chunks = []
+        self.closed = False
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def _arrow_chunks(batches):
+    pa = _require_pyarrow()
+    schema = pa.schema([
+        ("metric_id", pa.int64()),
+        ("timestamp", pa.timestamp("us")),
+        ("value", pa.float64()),
+        ("visitor_count", pa.int64()),
+    ])
+    drain = _Drain()
+    writer = pa.ipc.new_stream(pa.PythonFile(drain, mode="w"), schema)
+    for rows in batches:
+        metric_ids, timestamps, values, visitor_counts = zip(*rows)
+        writer.write_batch(pa.record_batch([
+            pa.array(metric_ids, pa.int64()),
+            pa.array(timestamps, pa.string()).cast(pa.timestamp("us")),
+            pa.array(values, pa.float64()),
+            pa.array(visitor_counts, pa.int64()),
+        ], schema=schema))
+        yield drain.take()
+    writer.close()
+    yield drain.take()
+
+
+_ENCODERS = {"csv": _csv_chunks, "ndjson": _ndjson_chunks, "arrow": _arrow_chunks}
+
+
+class ExportService:
+    @staticmethod
+    def check_format(export_format: str):
+        """지원하지 않는 형식이나 선택 의존성이 없으면 ValueError"""
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {export_format}")
+        if export_format == "arrow":
+            _require_pyarrow()
+
+    @staticmethod
+    def stream(
+        metric_ids: Sequence[int],
+        export_format: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Iterator[bytes]:
+        """데이터 포인트를 (metric_id, timestamp) 순서로 배치 단위 인코딩하여 스트리밍
+
+        요청 세션은 응답 전송 전에 닫히므로 전용 읽기 세션을 열고,
+        yield_per 커서로 export_batch_size 행씩만 메모리에 올린다.
+        압축으로 원본이 삭제된 날은 일별 롤업(그 날의 평균값, 방문자 합계)을 한 행으로 내보낸다.
+        """
+        start = normalize_timestamp(start) if start else None
+        end = normalize_timestamp(end) if end else None
+        timestamp = MetricDataPoint.timestamp
+        filters = [MetricDataPoint.metric_id.in_(metric_ids)]
+        if start:
+            filters.append(timestamp >= start)
+        if end:
+            filters.append(timestamp < end)
+        query = select(
+            MetricDataPoint.metric_id.label("metric_id"),
+            # 행마다 datetime 파싱을 피하기 위해 저장된 문자열 그대로 조회
+            type_coerce(timestamp, String).label("timestamp"),
+            MetricDataPoint.value.label("value"),
+            MetricDataPoint.visitor_count.label("visitor_count")
+        ).where(*filters)
+
+        db = ReadSessionLocal()
+        started = time.perf_counter()
+        rows_sent = 0
+        try:
+            compacted = CompactionService.compacted_rollup_filters(db, metric_ids, start, end)
+            if compacted is not None:
+                rollup = MetricRollup
+                query = union_all(query, select(
+                    rollup.metric_id,
+                    type_coerce(rollup.bucket_start, String),
+                    rollup.value_sum / rollup.value_count,
+                    rollup.visitor_count_sum
+                ).where(*compacted)).subquery()
+                query = select(query)
+            query = query.order_by(literal_column("metric_id"), literal_column("timestamp")).execution_options(
+                yield_per=settings.export_batch_size
+            )
+
+            def batches():
+                nonlocal rows_sent
+                for rows in db.execute(query).partitions():
+                    rows_sent += len(rows)
+                    yield rows
+
+            yield from _ENCODERS[export_format](batches())
+        finally:
+            db.close()
+            elapsed = time.perf_counter() - started
+            logger.info(
+                "export %s: %d rows in %.2fs (%.0f rows/sec)",
+                export_format, rows_sent, elapsed, rows_sent / elapsed if elapsed > 0 else 0
+            )
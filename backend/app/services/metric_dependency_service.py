@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..models.metric import Metric
+from ..models.metric_dependency import MetricChange, MetricDependency
+from .metric_expressions import parse_expression
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class MetricDependencyService:
+    @staticmethod
+    def sync_dependencies(db: Session, metric: Metric):
+        """calculation_logic 식의 입력 지표로 의존 그래프 갱신 (호출자가 커밋)
+
+        식이 잘못되었거나, 없는 지표를 참조하거나, 순환 참조가 생기면 ValueError.
+        이 지표의 파생 시계열 메모를 전부 다시 계산하도록 변경도 기록한다 (식을 저장할 때마다 호출).
+        """
+        expression = parse_expression(metric.calculation_logic)
+        inputs = set(expression.inputs) if expression else set()
+        if inputs:
+            missing = inputs - {row[0] for row in db.query(Metric.id).filter(Metric.id.in_(inputs))}
+            if missing:
+                raise ValueError(f"Metric expression references unknown metrics: {sorted(missing)}")
+            cycle = MetricDependencyService._find_cycle(db, metric.id, inputs)
+            if cycle:
+                raise ValueError("Circular metric dependency: " + " -> ".join(map(str, cycle)))
+
+        current = {
+            row[0] for row in
+            db.query(MetricDependency.input_metric_id).filter(MetricDependency.metric_id == metric.id)
+        }
+        if current != inputs:
+            table = MetricDependency.__table__
+            db.execute(table.delete().where(table.c.metric_id == metric.id))
+            if inputs:
+                db.execute(table.insert(), [{"metric_id": metric.id, "input_metric_id": input_id} for input_id in inputs])
+        db.add(MetricChange(metric_id=metric.id))
+
+    @staticmethod
+    def _find_cycle(db: Session, metric_id: int, inputs: Iterable[int]) -> Optional[List[int]]:
+        """입력 지표에서 의존 간선을 따라가 metric_id로 돌아오는 경로 (없으면 None)"""
+        parents = {input_id: metric_id for input_id in inputs}
+        frontier = list(parents)
+        while frontier and metric_id not in parents:
+            rows = db.query(MetricDependency.metric_id, MetricDependency.input_metric_id).filter(
+                MetricDependency.metric_id.in_(frontier)
+            ).all()
+            frontier = []
+            for source, target in rows:
+                if target not in parents:
+                    parents[target] = source
+                    frontier.append(target)
+        if metric_id not in parents:
+            return None
+        path, node = [metric_id], parents[metric_id]
+        while node != metric_id:
+            path.append(node)
+            node = parents[node]
+        path.append(metric_id)
+        return path[::-1]
+
+    @staticmethod
+    def record_changes(db: Session, ranges: Dict[int, Tuple[datetime, datetime]]):
+        """파생 지표의 입력으로 쓰이는 지표만 변경 구간 기록 (호출자가 커밋)"""
+        if not ranges:
+            return
+        used = {
+            row[0] for row in
+            db.query(MetricDependency.input_metric_id).filter(MetricDependency.input_metric_id.in_(ranges)).distinct()
+        }
+        if used:
+            db.execute(MetricChange.__table__.insert(), [
+                {"metric_id": metric_id, "range_start": ranges[metric_id][0], "range_end": ranges[metric_id][1]}
+                for metric_id in sorted(used)
+            ])
+
+    @staticmethod
+    def last_change_id(db: Session) -> int:
+        return db.query(func.max(MetricChange.id)).scalar() or 0
+
+    @staticmethod
+    def changes_since(db: Session, change_id: int, metric_ids: Iterable[int]):
+        """change_id 이후 metric_ids의 변경 구간 [(range_start, range_end), ...]"""
+        return db.query(MetricChange.range_start, MetricChange.range_end).filter(
+            MetricChange.id > change_id, MetricChange.metric_id.in_(set(metric_ids))
+        ).all()
+
+    @staticmethod
+    def prune_changes(db: Session) -> int:
+        """보존 기간이 지난 변경 기록 삭제 (호출자가 커밋)"""
+        cutoff = _utcnow() - timedelta(hours=settings.derived_change_retention_hours)
+        return db.query(MetricChange).filter(MetricChange.created_at < cutoff).delete(synchronize_session=False)
+
+    @staticmethod
+    def delete_metric_dependencies(db: Session, metric_id: int):
+        """지표 삭제 시 의존 간선 정리 (커밋은 호출자)
+
+        이 지표를 입력으로 쓰는 파생 지표가 있으면 삭제하지 않고 ValueError.
+        """
+        dependents = sorted(
+            row[0] for row in
+            db.query(MetricDependency.metric_id).filter(MetricDependency.input_metric_id == metric_id)
+        )
+        if dependents:
+            raise ValueError(f"Metric is an input of derived metrics {dependents}; change or delete them first")
+        db.query(MetricDependency).filter(MetricDependency.metric_id == metric_id).delete(synchronize_session=False)
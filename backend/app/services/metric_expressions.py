@@ -0,0 +1,106 @@
+import ast
+import operator
+import re
+from functools import lru_cache
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+import numpy as np
+
+# calculation_logic의 파생 지표 식 (예: metric[12] / metric[7] * 100)
+#
+# 숫자, 지표 참조 metric[ID], 사칙연산/거듭제곱/부호, abs/min/max만 허용한다.
+# 배열 연산으로 평가하므로 버킷 배열 전체를 한 번에 계산하며, 결측값(NaN)은 결과에 전파된다.
+
+_REFERENCE = re.compile(r"\bmetric\s*\[")
+_BINARY = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+}
+_UNARY = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+_FUNCTIONS = {
+    "abs": (np.abs, 1),
+    "min": (np.minimum, 2),
+    "max": (np.maximum, 2),
+}
+
+Evaluator = Callable[[Dict[int, np.ndarray]], np.ndarray]
+
+
+class Expression(NamedTuple):
+    """컴파일된 파생 지표 식"""
+    text: str
+    inputs: Tuple[int, ...]  # 참조하는 지표 ID (등장 순서, 중복 제거)
+    evaluate: Evaluator  # {지표 ID: 값 배열} -> 값 배열
+
+
+def is_expression(text: Optional[str]) -> bool:
+    """calculation_logic이 파생 지표 식인지 (지표 참조가 있으면 식으로 본다)"""
+    return bool(text and _REFERENCE.search(text))
+
+
+def _compile(node, inputs: list) -> Evaluator:
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        # 상수도 float64로 계산해야 거듭제곱 오버플로나 0으로 나누기가 예외 대신 inf/NaN이 된다
+        try:
+            value = np.float64(node.value)
+        except OverflowError:
+            raise ValueError(f"Numeric constant is too large: {str(node.value)[:20]}...")
+        return lambda series: value
+    if isinstance(node, ast.Subscript):
+        if not (isinstance(node.value, ast.Name) and node.value.id == "metric"):
+            raise ValueError("Only metric[ID] references are allowed")
+        index = node.slice
+        if not (isinstance(index, ast.Constant) and type(index.value) is int and index.value > 0):
+            raise ValueError("metric[] reference must be a positive integer ID")
+        metric_id = index.value
+        if metric_id not in inputs:
+            inputs.append(metric_id)
+        return lambda series: series[metric_id]
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+        function = _BINARY[type(node.op)]
+        left, right = _compile(node.left, inputs), _compile(node.right, inputs)
+        return lambda series: function(left(series), right(series))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY:
+        function = _UNARY[type(node.op)]
+        operand = _compile(node.operand, inputs)
+        return lambda series: function(operand(series))
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in _FUNCTIONS:
+        function, arity = _FUNCTIONS[node.func.id]
+        if len(node.args) != arity or node.keywords:
+            raise ValueError(f"{node.func.id}() takes {arity} argument(s)")
+        args = [_compile(arg, inputs) for arg in node.args]
+        return lambda series: function(*(arg(series) for arg in args))
+    raise ValueError(f"Unsupported expression element: {ast.dump(node)[:60]}")
+
+
+@lru_cache(maxsize=4096)
+def parse_expression(text: Optional[str]) -> Optional[Expression]:
+    """calculation_logic을 컴파일 (식이 아니면 None, 식인데 잘못되었으면 ValueError)"""
+    if not is_expression(text):
+        return None
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid metric expression: {e.msg}")
+    inputs = []
+    evaluate = _compile(tree.body, inputs)
+    expression = Expression(text.strip(), tuple(inputs), evaluate)
+    # 저장 시점에 한 번 평가해 조회 시점에 예외가 나는 식을 거부한다
+    try:
+        evaluate_expression(expression, {metric_id: np.ones(1) for metric_id in inputs}, 1)
+    except (ArithmeticError, TypeError) as e:
+        raise ValueError(f"Invalid metric expression: {e}")
+    return expression
+
+
+def evaluate_expression(expression: Expression, series: Dict[int, np.ndarray], length: int) -> np.ndarray:
+    """버킷 배열 전체에 식 적용 (0으로 나누기 등 정의되지 않는 값은 NaN)"""
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        values = np.broadcast_to(np.asarray(expression.evaluate(series), dtype=np.float64), (length,)).copy()
+    values[~np.isfinite(values)] = np.nan
+    return values
@@ -1,8 +1,68 @@
+import threading
+from collections import OrderedDict
 from sqlalchemy.orm import Session
-from typing import Optional
+from sqlalchemy import and_, false, func, literal, literal_column, or_, select, true, union_all
+from typing import Dict, NamedTuple, Optional, Sequence
+from datetime import datetime
+import numpy as np
+from ..cache import cache, invalidate
+from ..config import settings
 from ..models.metric import Metric
 from ..models.metric_data_point import MetricDataPoint
+from ..models.metric_rollup import MetricRollup
 from ..schemas.metric import MetricCreate, MetricUpdate
+from .alert_service import AlertService
+from .compaction_service import CompactionService
+from .data_point_service import normalize_timestamp
+from .metric_dependency_service import MetricDependencyService
+from .pagination import keyset_paginate
+from .projection import load_fields
+from .rollup_service import RollupService
+from .search_service import SearchService
+from .series_transforms import Transform, apply_transforms, bucket_positions
+from .stats_service import StatsService
+from .time_buckets import bucket_expression, floor_timestamp, shift_bucket
+
+
+class _SeriesEntry(NamedTuple):
+    """변환 요청용 버킷 시계열과 계산해 둔 변환 결과"""
+    generation: int  # metrics 무효화 세대
+    points: list
+    timestamps: np.ndarray  # datetime64[us]
+    positions: np.ndarray  # 버킷 번호
+    values: np.ndarray
+    columns: Dict[Transform, np.ndarray]
+
+
+# (metric_id, limit, start, end, bucket, agg) -> _SeriesEntry
+_series_memo = OrderedDict()
+_series_memo_lock = threading.Lock()
+
+
+def _aggregate_value(agg: str):
+    """원본 데이터 포인트 집계 SQL 표현식"""
+    value = MetricDataPoint.value
+    return {
+        "avg": func.avg(value),
+        "sum": func.sum(value),
+        "min": func.min(value),
+        "max": func.max(value),
+        "count": func.count(value),
+        # SQLite는 MAX()와 함께 조회한 bare 컬럼을 최댓값 행에서 가져온다
+        "last": value,
+    }[agg]
+
+
+def _aggregate_rollup(agg: str, rows=MetricRollup):
+    """롤업 행 재집계 SQL 표현식 (rows는 롤업 요약 컬럼을 가진 테이블/서브쿼리 컬럼)"""
+    return {
+        "avg": func.sum(rows.value_sum) / func.sum(rows.value_count),
+        "sum": func.sum(rows.value_sum),
+        "min": func.min(rows.value_min),
+        "max": func.max(rows.value_max),
+        "count": func.sum(rows.value_count),
+        "last": rows.last_value,
+    }[agg]
 
 
 class MetricService:
@@ -13,17 +73,17 @@ class MetricService:
         limit: int = 100,
         search: Optional[str] = None,
         category: Optional[str] = None,
-        status: Optional[str] = None
+        status: Optional[str] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        fields: Optional[Sequence[str]] = None
     ):
-        """모든 지표 조회"""
-        query = db.query(Metric)
+        """모든 지표 조회 (id 순, OFFSET 또는 커서 페이지네이션)"""
+        query = load_fields(db.query(Metric), Metric, fields)
         
-        # 검색 필터
+        # 검색 필터 (FTS5 인덱스)
         if search:
-            query = query.filter(
-                (Metric.name.contains(search)) | 
-                (Metric.description.contains(search))
-            )
+            query = query.filter(Metric.id.in_(SearchService.match_ids("metric", search)))
         
         # 카테고리 필터
         if category:
@@ -33,86 +93,410 @@ class MetricService:
         if status:
             query = query.filter(Metric.status == status)
         
-        total = query.count()
-        items = query.offset(skip).limit(limit).all()
-        
-        return {"total": total, "items": items}
+        total = query.count() if include_total else None
+        items, next_cursor = keyset_paginate(
+            query, [Metric.id], limit, skip=skip, cursor=cursor
+        )
+
+        return {"total": total, "items": items, "next_cursor": next_cursor}
 
     @staticmethod
-    def get_metric_by_id(db: Session, metric_id: int):
+    def get_metric_by_id(db: Session, metric_id: int, fields: Optional[Sequence[str]] = None):
         """ID로 지표 조회"""
-        return db.query(Metric).filter(Metric.id == metric_id).first()
+        return load_fields(db.query(Metric), Metric, fields).filter(Metric.id == metric_id).first()
 
     @staticmethod
     def create_metric(db: Session, metric: MetricCreate):
-        """새 지표 생성"""
+        """새 지표 생성 (calculation_logic 식이 잘못되었으면 ValueError)"""
         db_metric = Metric(**metric.model_dump())
         db.add(db_metric)
+        db.flush()
+        try:
+            MetricDependencyService.sync_dependencies(db, db_metric)
+        except ValueError:
+            db.rollback()
+            raise
+        SearchService.index_entity(db, "metric", db_metric)
+        StatsService.apply(db, after=StatsService.metric_counts(db_metric))
         db.commit()
+        invalidate("metrics")
         db.refresh(db_metric)
         return db_metric
 
     @staticmethod
     def update_metric(db: Session, metric_id: int, metric: MetricUpdate):
-        """지표 업데이트"""
+        """지표 업데이트 (calculation_logic 식이 잘못되었거나 순환 참조가 생기면 ValueError)"""
         db_metric = db.query(Metric).filter(Metric.id == metric_id).first()
         if not db_metric:
             return None
         
+        before = StatsService.metric_counts(db_metric)
         update_data = metric.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_metric, key, value)
+        if "calculation_logic" in update_data:
+            try:
+                MetricDependencyService.sync_dependencies(db, db_metric)
+            except ValueError:
+                db.rollback()
+                raise
         
+        SearchService.index_entity(db, "metric", db_metric)
+        StatsService.apply(db, before, StatsService.metric_counts(db_metric))
         db.commit()
+        invalidate("metrics")
         db.refresh(db_metric)
         return db_metric
 
+    @staticmethod
+    def refresh_value(db: Session, metric_id: int):
+        """지표 현재 값(value)을 가장 최근 데이터 포인트 값으로 갱신 (값이 같으면 기록하지 않음)"""
+        latest = (
+            db.query(MetricDataPoint.value)
+            .filter(MetricDataPoint.metric_id == metric_id)
+            .order_by(MetricDataPoint.timestamp.desc())
+            .limit(1)
+            .scalar()
+        )
+        if latest is None:
+            return False
+        updated = (
+            db.query(Metric)
+            .filter(Metric.id == metric_id, Metric.value.is_distinct_from(latest))
+            .update({Metric.value: latest}, synchronize_session=False)
+        )
+        if updated:
+            db.commit()
+            invalidate("metrics")
+        return bool(updated)
+
     @staticmethod
     def delete_metric(db: Session, metric_id: int):
-        """지표 삭제"""
+        """지표 삭제 (파생 지표의 입력이면 ValueError)"""
         db_metric = db.query(Metric).filter(Metric.id == metric_id).first()
         if not db_metric:
             return False
         
+        MetricDependencyService.delete_metric_dependencies(db, metric_id)
+        RollupService.delete_metric_rollups(db, metric_id)
+        AlertService.delete_metric_alerts(db, metric_id)
+        SearchService.remove_entity(db, "metric", metric_id)
+        StatsService.apply(db, before=StatsService.metric_counts(db_metric))
         db.delete(db_metric)
         db.commit()
+        invalidate("metrics")
         return True
 
     @staticmethod
     def get_metrics_stats(db: Session):
-        """지표 통계 조회"""
-        total_metrics = db.query(Metric).count()
-        active_metrics = db.query(Metric).filter(Metric.status == "활성화").count()
-        inactive_metrics = db.query(Metric).filter(Metric.status == "비활성화").count()
-        warning_metrics = db.query(Metric).filter(Metric.status == "주의").count()
+        """지표 통계 조회 (카운터 테이블)"""
+        counters = StatsService.get_counters(db, "metric", "metric.status")
 
         return {
-            "total": total_metrics,
-            "active": active_metrics,
-            "inactive": inactive_metrics,
-            "warning": warning_metrics
+            "total": counters.get(("metric", "total"), 0),
+            "active": counters.get(("metric.status", "활성화"), 0),
+            "inactive": counters.get(("metric.status", "비활성화"), 0),
+            "warning": counters.get(("metric.status", "주의"), 0)
         }
 
     @staticmethod
-    def get_metric_time_series(db: Session, metric_id: int, limit: int = 30):
-        """지표의 시계열 데이터 조회"""
-        data_points = (
-            db.query(MetricDataPoint)
-            .filter(MetricDataPoint.metric_id == metric_id)
-            .order_by(MetricDataPoint.timestamp.desc())
-            .limit(limit)
-            .all()
+    def get_metric_time_series(
+        db: Session,
+        metric_id: int,
+        limit: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        bucket: Optional[str] = None,
+        agg: str = "avg",
+        transforms: Sequence[Transform] = ()
+    ):
+        """지표의 시계열 데이터 조회
+
+        bucket이 주어지면 SQL GROUP BY로 버킷별 집계값을 반환한다.
+        hour 이상의 버킷은 원본 대신 가장 굵은 롤업 테이블을 재집계한다.
+        limit은 최근 N개 포인트(버킷)이며, 기간 없이 호출하면 최근 30개를 반환한다.
+        transforms가 주어지면 포인트마다 변환 결과 필드를 추가한다 (_transformed_series).
+        """
+        if limit is None:
+            limit = 30 if start is None else settings.timeseries_max_points
+        if transforms:
+            return MetricService._transformed_series(db, metric_id, limit, start, end, bucket, agg, transforms)
+
+        query = MetricService.series_query(db, [metric_id], start, end, bucket, agg)
+
+        # 최신 순으로 limit개를 읽은 뒤 시간순으로 뒤집는다
+        rows = query.order_by(literal_column("timestamp").desc()).limit(limit).all()
+        rows.reverse()
+        return MetricService._series_points(rows)
+
+    @staticmethod
+    def _transformed_series(db: Session, metric_id: int, limit: int, start, end, bucket, agg, transforms):
+        """버킷 시계열에 변환(이동 평균, EWMA 등) 결과 필드를 붙여 반환
+
+        버킷 시계열과 변환 결과는 지표 데이터가 바뀌어 metrics 태그가 무효화될 때까지 메모하므로,
+        같은 시계열에 다른 변환을 요청하면 쿼리 없이 빠진 변환만 계산한다.
+        forecast는 마지막 버킷 뒤에 value가 null인 예측 포인트를 추가한다 (bucket 필요).
+        """
+        forecast = next((transform for transform in transforms if transform.name == "forecast"), None)
+        if forecast and bucket is None:
+            raise ValueError("forecast transform requires a bucket")
+
+        key = (
+            metric_id, limit, normalize_timestamp(start) if start else None,
+            normalize_timestamp(end) if end else None, bucket, agg
+        )
+        generation = cache.generation("metrics")
+        with _series_memo_lock:
+            entry = _series_memo.get(key)
+        if entry is None or entry.generation != generation:
+            rows = MetricService.series_query(db, [metric_id], start, end, bucket, agg).order_by(
+                literal_column("timestamp").desc()
+            ).limit(limit).all()
+            rows.reverse()
+            timestamps = np.array([row.timestamp for row in rows], dtype="datetime64[us]")
+            entry = _SeriesEntry(
+                generation,
+                MetricService._series_points(rows),
+                timestamps,
+                bucket_positions(timestamps, bucket),
+                np.array([row.value for row in rows], dtype=np.float64),
+                {},
+            )
+        missing = [transform for transform in transforms if transform not in entry.columns]
+        if missing:
+            # 모든 변환을 같은 배열에서 한 번에 계산
+            entry = entry._replace(
+                columns={**entry.columns, **apply_transforms(entry.positions, entry.values, missing)}
+            )
+        with _series_memo_lock:
+            _series_memo[key] = entry
+            _series_memo.move_to_end(key)
+            while len(_series_memo) > settings.timeseries_memo_size:
+                _series_memo.popitem(last=False)
+
+        columns = {
+            transform.key: [None if np.isnan(value) else value for value in entry.columns[transform].tolist()]
+            for transform in transforms
+        }
+        points = [
+            {**point, **{name: column[index] for name, column in columns.items()}}
+            for index, point in enumerate(entry.points)
+        ]
+        if forecast and points:
+            last = entry.timestamps[-1].astype(datetime)
+            for step, value in enumerate(columns[forecast.key][len(points):], start=1):
+                points.append({
+                    "timestamp": shift_bucket(last, bucket, step).isoformat(),
+                    "value": None,
+                    "visitor_count": None,
+                    **{name: None for name in columns},
+                    forecast.key: value,
+                })
+        return points
+
+    @staticmethod
+    def get_metric_time_series_batch(
+        db: Session,
+        metric_ids: Sequence[int],
+        limit: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        bucket: Optional[str] = None,
+        agg: str = "avg"
+    ):
+        """여러 지표의 시계열을 한 번의 쿼리로 조회 (지표별 컬럼 배열)
+
+        limit은 지표별 최근 N개이며 ROW_NUMBER() 윈도 함수로 한 쿼리 안에서 자른다.
+        데이터가 없는 지표는 빈 배열로 반환한다.
+        """
+        if limit is None:
+            limit = 30 if start is None else settings.timeseries_max_points
+        metric_ids = list(dict.fromkeys(metric_ids))
+
+        series = MetricService.series_query(db, metric_ids, start, end, bucket, agg).subquery()
+        ranked = select(
+            series,
+            func.row_number().over(
+                partition_by=series.c.metric_id, order_by=series.c.timestamp.desc()
+            ).label("rank")
+        ).subquery()
+        rows = db.execute(
+            select(ranked.c.metric_id, ranked.c.timestamp, ranked.c.value, ranked.c.visitor_count)
+            .where(ranked.c.rank <= limit)
+            .order_by(ranked.c.metric_id, ranked.c.timestamp)
         )
 
-        # 시간순으로 정렬 (오래된 것부터)
-        data_points.reverse()
+        result = {
+            metric_id: {"timestamps": [], "values": [], "visitor_counts": []}
+            for metric_id in metric_ids
+        }
+        for metric_id, timestamp, value, visitor_count in rows:
+            columns = result[metric_id]
+            columns["timestamps"].append(timestamp.isoformat())
+            columns["values"].append(value)
+            columns["visitor_counts"].append(visitor_count)
+        return result
+
+    @staticmethod
+    def series_query(db: Session, metric_ids: Sequence[int], start, end, bucket: Optional[str], agg: str):
+        """(metric_id, timestamp, value, visitor_count) 시계열 쿼리 (정렬 없음)"""
+        granularity = RollupService.granularity_for(bucket)
+        if granularity:
+            return MetricService._rollup_series_query(db, metric_ids, granularity, start, end, bucket, agg)
+        return MetricService.raw_series_query(db, metric_ids, start, end, bucket, agg)
+
+    @staticmethod
+    def raw_series_query(db: Session, metric_ids: Sequence[int], start, end, bucket: Optional[str], agg: str):
+        """원본 데이터 포인트 쿼리 ((metric_id, timestamp) 인덱스 구간 스캔)
+
+        압축으로 원본이 삭제된 날은 일별 롤업 행을 그 날의 포인트(버킷)로 대신해 UNION ALL로 합친다.
+        """
+        start = normalize_timestamp(start) if start else None
+        end = normalize_timestamp(end) if end else None
+        query = MetricService._raw_points_query(db, metric_ids, start, end, bucket, agg)
+        compacted = CompactionService.compacted_rollup_filters(db, metric_ids, start, end)
+        if compacted is None:
+            return query
+
+        rollup = MetricRollup
+        value = {
+            "avg": rollup.value_sum / rollup.value_count,
+            "sum": rollup.value_sum,
+            "min": rollup.value_min,
+            "max": rollup.value_max,
+            "count": rollup.value_count,
+            "last": rollup.last_value,
+        }["avg" if bucket is None else agg]
+        columns = [
+            rollup.metric_id,
+            rollup.bucket_start.label("timestamp"),
+            value.label("value"),
+            rollup.visitor_count_sum.label("visitor_count"),
+        ]
+        if bucket is not None and agg == "last":
+            columns.append(rollup.last_timestamp)
+        combined = union_all(query.statement, select(*columns).where(*compacted)).subquery()
+        return db.query(combined.c.metric_id, combined.c.timestamp, combined.c.value, combined.c.visitor_count)
+
+    @staticmethod
+    def _raw_points_query(db: Session, metric_ids: Sequence[int], start, end, bucket: Optional[str], agg: str):
+        timestamp = MetricDataPoint.timestamp
+        filters = [MetricDataPoint.metric_id.in_(metric_ids)]
+        if start:
+            filters.append(timestamp >= start)
+        if end:
+            filters.append(timestamp < end)
 
+        if bucket is None:
+            return (
+                db.query(
+                    MetricDataPoint.metric_id,
+                    timestamp.label("timestamp"),
+                    MetricDataPoint.value.label("value"),
+                    MetricDataPoint.visitor_count.label("visitor_count")
+                )
+                .filter(*filters)
+            )
+
+        bucket_start = bucket_expression(timestamp, bucket).label("timestamp")
+        columns = [
+            MetricDataPoint.metric_id,
+            bucket_start,
+            _aggregate_value(agg).label("value"),
+            func.sum(MetricDataPoint.visitor_count).label("visitor_count")
+        ]
+        if agg == "last":
+            columns.append(func.max(timestamp))
+        return (
+            db.query(*columns)
+            .filter(*filters)
+            .group_by(MetricDataPoint.metric_id, bucket_start)
+        )
+
+    @staticmethod
+    def _rollup_series_query(
+        db: Session, metric_ids: Sequence[int], granularity: str, start, end, bucket: str, agg: str
+    ):
+        """롤업 행을 요청 버킷으로 재집계하는 쿼리
+
+        start/end가 롤업 단위 경계에 맞지 않으면 걸친 가장자리 구간은 원본 데이터 포인트를 롤업 행과
+        같은 모양으로 읽어 합치므로, 원본 경로와 같은 [start, end) 범위를 집계한다.
+        압축으로 원본이 삭제된 가장자리 날은 그 날의 일별 롤업 전체를 쓴다.
+        """
+        start = normalize_timestamp(start) if start else None
+        end = normalize_timestamp(end) if end else None
+        # 롤업 행으로 온전히 덮이는 [inner_start, inner_end)와 원본에서 읽을 가장자리 구간
+        inner_start = start and floor_timestamp(start, granularity)
+        if inner_start and inner_start < start:
+            inner_start = shift_bucket(inner_start, granularity)
+        inner_end = end and floor_timestamp(end, granularity)
+        if inner_start and inner_end and inner_start >= inner_end:
+            edges, inner = [(start, end)], None
+        else:
+            edges = [(low, high) for low, high in ((start, inner_start), (inner_end, end)) if low and low < high]
+            inner = [MetricRollup.bucket_start >= inner_start] if inner_start else []
+            if inner_end:
+                inner.append(MetricRollup.bucket_start < inner_end)
+
+        rollup = MetricRollup
+        selected = [and_(true(), *inner)] if inner is not None else []
+        if edges and granularity == "day":
+            compacted = CompactionService.compacted_rollup_filters(
+                db, metric_ids, floor_timestamp(start, "day") if start else None, end
+            )
+            if compacted is not None:
+                selected.append(and_(*compacted))
+        rows = select(
+            rollup.metric_id,
+            rollup.bucket_start,
+            rollup.value_sum,
+            rollup.value_count,
+            rollup.value_min,
+            rollup.value_max,
+            rollup.last_value,
+            rollup.last_timestamp,
+            rollup.visitor_count_sum
+        ).where(rollup.metric_id.in_(metric_ids), rollup.granularity == granularity, or_(false(), *selected))
+        if edges:
+            point = MetricDataPoint
+            rows = union_all(rows, select(
+                point.metric_id,
+                point.timestamp,
+                point.value,
+                literal(1),
+                point.value,
+                point.value,
+                point.value,
+                point.timestamp,
+                point.visitor_count
+            ).where(
+                point.metric_id.in_(metric_ids),
+                or_(*(and_(point.timestamp >= low, point.timestamp < high) for low, high in edges))
+            ))
+        rows = rows.subquery()
+
+        bucket_start = bucket_expression(rows.c.bucket_start, bucket).label("timestamp")
+        columns = [
+            rows.c.metric_id,
+            bucket_start,
+            _aggregate_rollup(agg, rows.c).label("value"),
+            func.sum(rows.c.visitor_count_sum).label("visitor_count")
+        ]
+        if agg == "last":
+            columns.append(func.max(rows.c.last_timestamp))
+        return (
+            db.query(*columns)
+            .group_by(rows.c.metric_id, bucket_start)
+        )
+
+    @staticmethod
+    def _series_points(rows):
+        """(metric_id, timestamp, value, visitor_count) 행을 응답 형식으로 변환"""
         return [
             {
-                "timestamp": point.timestamp.isoformat(),
-                "value": point.value,
-                "visitor_count": point.visitor_count
+                "timestamp": row.timestamp.isoformat(),
+                "value": row.value,
+                "visitor_count": row.visitor_count
             }
-            for point in data_points
+            for row in rows
         ]
-
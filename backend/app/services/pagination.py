@@ -0,0 +1,63 @@
+import base64
+import binascii
+import json
+from typing import Optional
+from sqlalchemy import Date, DateTime, String, tuple_, type_coerce
+
+
+def encode_cursor(values) -> str:
+    """정렬 키 값을 불투명한 커서 문자열로 인코딩"""
+    raw = json.dumps(list(values), separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    """커서 문자열을 정렬 키 값으로 디코딩 (형식이 잘못되면 ValueError)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def _cursor_column(column):
+    # 날짜 컬럼은 저장된 문자열 그대로 비교해야 포맷 차이로 행이 누락/중복되지 않는다
+    if isinstance(column.type, (Date, DateTime)):
+        return type_coerce(column, String)
+    return column
+
+
+def keyset_paginate(
+    query,
+    sort_columns,
+    limit: int,
+    skip: int = 0,
+    cursor: Optional[str] = None,
+    descending: bool = False
+):
+    """(정렬 키, id) 기준 페이지 조회
+
+    sort_columns의 마지막은 고유 컬럼(id)이어야 한다.
+    cursor가 있으면 OFFSET 대신 정렬 키 이후부터 인덱스로 탐색한다.
+    반환값은 (items, next_cursor)이며 다음 페이지가 없으면 next_cursor는 None이다.
+    """
+    key_columns = [_cursor_column(column) for column in sort_columns]
+    order_by = [column.desc() if descending else column.asc() for column in key_columns]
+    query = query.add_columns(*key_columns).order_by(*order_by)
+
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != len(key_columns):
+            raise ValueError("Invalid cursor")
+        keys = tuple_(*key_columns)
+        query = query.filter(keys < tuple_(*values) if descending else keys > tuple_(*values))
+    elif skip:
+        query = query.offset(skip)
+
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = encode_cursor(rows[limit - 1][1:]) if len(rows) > limit else None
+    return [row[0] for row in rows[:limit]], next_cursor
@@ -0,0 +1,18 @@
+from typing import Optional, Sequence
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only, noload
+
+
+def load_fields(query, entity, fields: Optional[Sequence[str]]):
+    """fields에 있는 컬럼만 읽도록 쿼리 옵션 적용 (None이면 그대로)
+
+    나머지 컬럼은 지연 로드(defer)되고, 요청하지 않은 관계는 조인/로드하지 않는다.
+    """
+    if fields is None:
+        return query
+    mapper = inspect(entity)
+    columns = [mapper.column_attrs[name].class_attribute for name in fields if name in mapper.column_attrs]
+    skipped = [
+        relationship.class_attribute for relationship in mapper.relationships if relationship.key not in fields
+    ]
+    return query.options(load_only(*columns), *(noload(attribute) for attribute in skipped))
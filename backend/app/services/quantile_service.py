@@ -0,0 +1,101 @@
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Sequence
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..models.metric import Metric
+from ..models.metric_rollup import MetricRollup
+from .compaction_service import CompactionService
+from .data_point_service import normalize_timestamp
+from .quantile_sketch import QuantileSketch
+from .time_buckets import floor_timestamp
+
+
+def parse_quantiles(text: str) -> List[float]:
+    """쉼표로 구분한 분위 목록 파싱 (예: 0.5,0.95,0.99, 0~1 밖이거나 숫자가 아니면 ValueError)"""
+    try:
+        qs = [float(part) for part in text.split(",") if part.strip()]
+    except ValueError:
+        raise ValueError(f"Invalid quantiles: {text}")
+    if not qs or any(not 0 <= q <= 1 for q in qs):
+        raise ValueError("Quantiles must be between 0 and 1")
+    return qs
+
+
+def _ceil_timestamp(timestamp: datetime, granularity: str) -> datetime:
+    floored = floor_timestamp(timestamp, granularity)
+    step = timedelta(hours=1) if granularity == "hour" else timedelta(days=1)
+    return floored if floored == timestamp else floored + step
+
+
+class QuantileService:
+    @staticmethod
+    def get_quantiles(
+        db: Session,
+        metric_id: int,
+        qs: Sequence[float],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ):
+        """[start, end) 구간 원본 값의 분위수 (롤업 버킷 스케치 병합, 기본은 최근 30일)
+
+        구간은 시간 단위로 넓혀 맞추고, 온전히 포함된 날은 일별 스케치, 나머지는 시간별 스케치를 쓴다.
+        시간별 롤업이 압축으로 삭제된 보존 기간 밖의 날은 일별 스케치로 대신한다.
+        걸리는 시간은 포인트 수가 아니라 버킷 수에 비례한다.
+        지표가 없으면 None.
+        """
+        if not db.query(Metric.id).filter(Metric.id == metric_id).first():
+            return None
+        started = time.perf_counter()
+        end = _ceil_timestamp(normalize_timestamp(end) if end else datetime.now(timezone.utc).replace(tzinfo=None), "hour")
+        start = floor_timestamp(normalize_timestamp(start), "hour") if start else end - timedelta(days=30)
+        if start >= end:
+            raise ValueError("start must be before end")
+
+        cutoff = CompactionService.retention_cutoffs(db, [metric_id])[metric_id]
+        day_start, day_end = _ceil_timestamp(start, "day"), floor_timestamp(end, "day")
+        ranges = []  # (granularity, 시작, 끝)
+        if day_start < day_end:
+            ranges.append(("day", day_start, day_end))
+            edges = [(start, day_start), (day_end, end)]
+        else:
+            edges = [(start, end)]
+        for low, high in edges:
+            if low >= high:
+                continue
+            if low < cutoff:
+                # 보존 기간 밖은 시간별 롤업이 없으므로 그 날 전체의 일별 스케치 사용
+                ranges.append(("day", floor_timestamp(low, "day"), min(_ceil_timestamp(high, "day"), cutoff)))
+                low = max(low, cutoff)
+            if low < high:
+                ranges.append(("hour", low, high))
+
+        sketches, buckets, unsketched = [], 0, 0
+        for granularity, low, high in ranges:
+            rows = db.query(MetricRollup.sketch, MetricRollup.value_count).filter(
+                MetricRollup.metric_id == metric_id,
+                MetricRollup.granularity == granularity,
+                MetricRollup.bucket_start >= low,
+                MetricRollup.bucket_start < high,
+            )
+            for sketch, count in rows:
+                buckets += 1
+                if sketch is None:
+                    unsketched += count
+                else:
+                    sketches.append(QuantileSketch.deserialize(sketch))
+
+        merged = QuantileSketch.merge(sketches, settings.sketch_compression)
+        values = merged.quantiles(qs).tolist() if merged else [None] * len(qs)
+        return {
+            "metric_id": metric_id,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "count": int(merged.count) if merged else 0,
+            "min": merged.min if merged else None,
+            "max": merged.max if merged else None,
+            "quantiles": {f"{q:g}": value for q, value in zip(qs, values)},
+            "buckets": buckets,
+            "unsketched_points": unsketched,  # 스케치 없이 롤업만 남은 버킷의 포인트 수 (분위수에 미반영)
+            "computed_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
@@ -0,0 +1,245 @@
+from datetime import datetime, timedelta
+from typing import Optional
+import numpy as np
+from sqlalchemy import bindparam, func, literal, select, true
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from ..cache import invalidate
+from ..config import settings
+from ..models.metric_data_point import MetricDataPoint
+from ..models.metric_rollup import MetricRollup
+from .quantile_sketch import QuantileSketch
+from .time_buckets import bucket_delta, bucket_expression, floor_timestamp
+
+# 유지하는 롤업 단위
+GRANULARITIES = ("hour", "day")
+
+# 요청 버킷별로 읽을 수 있는 가장 굵은 롤업 단위 (minute는 원본 데이터 사용)
+_ROLLUP_FOR_BUCKET = {
+    "hour": "hour",
+    "day": "day",
+    "week": "day",
+    "month": "day",
+}
+
+_SUMMARY_COLUMNS = (
+    "value_count",
+    "value_sum",
+    "value_min",
+    "value_max",
+    "value_sum_squares",
+    "visitor_count_sum",
+    "last_timestamp",
+)
+
+
+def _upsert_rollups(
+    db: Session,
+    granularity: str,
+    metric_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+):
+    """원본 데이터 포인트를 집계해 [start, end) 구간의 롤업 행을 덮어쓴다"""
+    point = MetricDataPoint
+    bucket_start = bucket_expression(point.timestamp, granularity)
+
+    filters = []
+    if metric_id is not None:
+        filters.append(point.metric_id == metric_id)
+    if start is not None:
+        filters.append(point.timestamp >= start)
+    if end is not None:
+        filters.append(point.timestamp < end)
+
+    summary = (
+        select(
+            point.metric_id,
+            literal(granularity),
+            bucket_start,
+            func.count(point.value),
+            func.sum(point.value),
+            func.min(point.value),
+            func.max(point.value),
+            func.sum(point.value * point.value),
+            func.sum(point.visitor_count),
+            func.max(point.timestamp),
+        )
+        # INSERT ... SELECT ... ON CONFLICT 구문 모호성 방지를 위해 WHERE를 항상 포함
+        .where(*(filters or [true()]))
+        .group_by(point.metric_id, bucket_start)
+    )
+
+    stmt = insert(MetricRollup.__table__).from_select(
+        ["metric_id", "granularity", "bucket_start", *_SUMMARY_COLUMNS], summary
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["metric_id", "granularity", "bucket_start"],
+        set_={column: stmt.excluded[column] for column in _SUMMARY_COLUMNS},
+    )
+    db.execute(stmt)
+
+    # 버킷의 마지막 값은 last_timestamp 행에서 (metric_id, timestamp) 인덱스로 조회
+    last_value = (
+        select(point.value)
+        .where(point.metric_id == MetricRollup.metric_id, point.timestamp == MetricRollup.last_timestamp)
+        .scalar_subquery()
+    )
+    query = db.query(MetricRollup).filter(MetricRollup.granularity == granularity)
+    if metric_id is not None:
+        query = query.filter(MetricRollup.metric_id == metric_id)
+    if start is not None:
+        query = query.filter(MetricRollup.bucket_start >= floor_timestamp(start, granularity))
+    if end is not None:
+        query = query.filter(MetricRollup.bucket_start < end)
+    query.update({MetricRollup.last_value: last_value}, synchronize_session=False)
+
+    metric_ids = [metric_id] if metric_id is not None else [
+        row[0] for row in db.query(MetricRollup.metric_id).filter(MetricRollup.granularity == granularity).distinct()
+    ]
+    for target_id in metric_ids:
+        _update_sketches(db, granularity, target_id, start, end)
+
+
+# numpy datetime64 단위 (버킷 내림)
+_NUMPY_UNITS = {"hour": "datetime64[h]", "day": "datetime64[D]"}
+
+
+def _update_sketches(db: Session, granularity: str, metric_id: int, start: Optional[datetime], end: Optional[datetime]):
+    """[start, end) 구간 원본 값으로 버킷별 분위수 스케치를 만들어 롤업 행에 기록
+
+    (metric_id, timestamp) 인덱스 순서로 읽어 같은 버킷의 연속 구간을 한 번에 압축한다.
+    """
+    point = MetricDataPoint
+    query = db.query(point.timestamp, point.value).filter(point.metric_id == metric_id)
+    if start is not None:
+        query = query.filter(point.timestamp >= start)
+    if end is not None:
+        query = query.filter(point.timestamp < end)
+    rows = query.order_by(point.timestamp).all()
+    if not rows:
+        return
+
+    timestamps = np.array([row[0] for row in rows], dtype="datetime64[us]")
+    values = np.array([row[1] for row in rows], dtype=np.float64)
+    buckets = timestamps.astype(_NUMPY_UNITS[granularity])
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(values)]
+    table = MetricRollup.__table__
+    db.execute(
+        table.update().where(
+            table.c.metric_id == metric_id,
+            table.c.granularity == granularity,
+            table.c.bucket_start == bindparam("bucket"),
+        ).values(sketch=bindparam("sketch")),
+        [
+            {
+                "bucket": buckets[low].astype("datetime64[us]").astype(datetime),
+                "sketch": QuantileSketch.from_values(values[low:high], settings.sketch_compression).serialize(),
+            }
+            for low, high in zip(starts, ends)
+        ],
+    )
+
+
+def _bucket_runs(starts, granularity: str):
+    """버킷 시작 시각들을 연속 구간 [(start, end), ...]으로 묶음"""
+    delta = bucket_delta(granularity)
+    runs = []
+    for start in sorted(starts):
+        if runs and runs[-1][1] == start:
+            runs[-1][1] = start + delta
+        else:
+            runs.append([start, start + delta])
+    return [(start, end) for start, end in runs]
+
+
+class RollupService:
+    @staticmethod
+    def granularity_for(bucket: Optional[str]):
+        """요청 버킷을 만족하는 가장 굵은 롤업 단위 (없으면 None)"""
+        return _ROLLUP_FOR_BUCKET.get(bucket)
+
+    @staticmethod
+    def refresh_range(
+        db: Session,
+        metric_id: int,
+        start: datetime,
+        end: datetime,
+        granularities=GRANULARITIES
+    ):
+        """start ~ end 시각이 속한 롤업 버킷만 재계산 (호출자가 커밋)"""
+        for granularity in granularities:
+            _upsert_rollups(
+                db,
+                granularity,
+                metric_id=metric_id,
+                start=floor_timestamp(start, granularity),
+                end=floor_timestamp(end, granularity) + bucket_delta(granularity),
+            )
+
+    @staticmethod
+    def refresh_buckets(db: Session, metric_id: int, buckets):
+        """단위별 버킷 시작 시각 집합 {granularity: {bucket_start, ...}}의 롤업만 재계산 (호출자가 커밋)
+
+        연속한 버킷은 한 구간으로 묶어 구간마다 한 번씩 집계한다.
+        """
+        for granularity, starts in buckets.items():
+            for start, end in _bucket_runs(starts, granularity):
+                _upsert_rollups(db, granularity, metric_id=metric_id, start=start, end=end)
+
+    @staticmethod
+    def day_windows(db: Session, metric_id: int, batch_size: int, end: Optional[datetime] = None):
+        """지표의 원본 포인트(end 이전)를 batch_size행 정도씩 덮는 일 단위 구간 [(start, end), ...]을 차례로 생성
+
+        구간은 가장 오래된 날부터 batch_size번째 행이 속한 날까지이며, 다음 구간은 호출자가
+        이전 구간을 처리한 뒤에 조회하므로 처리 중 삭제된 행도 반영된다.
+        """
+        point = MetricDataPoint
+        start = None
+        while True:
+            filters = [point.metric_id == metric_id]
+            if start is not None:
+                filters.append(point.timestamp >= start)
+            if end is not None:
+                filters.append(point.timestamp < end)
+            oldest = db.query(func.min(point.timestamp)).filter(*filters).scalar()
+            if oldest is None:
+                return
+            last = (
+                db.query(point.timestamp)
+                .filter(*filters)
+                .order_by(point.timestamp)
+                .offset(batch_size - 1)
+                .limit(1)
+                .scalar()
+            )
+            if last is None:
+                last = db.query(func.max(point.timestamp)).filter(*filters).scalar()
+            start = floor_timestamp(oldest, "day")
+            window_end = floor_timestamp(last, "day") + timedelta(days=1)
+            if end is not None:
+                window_end = min(window_end, end)
+            yield start, window_end
+            start = window_end
+
+    @staticmethod
+    def rebuild(db: Session, metric_id: Optional[int] = None):
+        """원본 데이터 포인트로부터 롤업(분위수 스케치 포함) 재계산
+
+        지표별로 rollup_rebuild_batch_size행 정도의 일 단위 구간씩 재계산하고 커밋해
+        한 번에 읽는 원본 행과 쓰기 잠금 시간을 제한한다.
+        """
+        metric_ids = [metric_id] if metric_id is not None else [
+            row[0] for row in db.query(MetricDataPoint.metric_id).distinct()
+        ]
+        for target_id in metric_ids:
+            for start, end in RollupService.day_windows(db, target_id, settings.rollup_rebuild_batch_size):
+                RollupService.refresh_range(db, target_id, start, end - timedelta(microseconds=1))
+                db.commit()
+        invalidate("metrics")
+
+    @staticmethod
+    def delete_metric_rollups(db: Session, metric_id: int):
+        """지표의 롤업 삭제 (호출자가 커밋)"""
+        db.query(MetricRollup).filter(MetricRollup.metric_id == metric_id).delete(synchronize_session=False)
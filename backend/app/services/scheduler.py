@@ -0,0 +1,283 @@
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Tuple
+from ..config import settings
+from ..database import SessionLocal
+from ..models.metric import Metric
+from ..models.segment import Segment
+from .compaction_service import compaction_worker
+from .metric_service import MetricService
+from .segment_execution_service import SegmentExecutionService
+
+logger = logging.getLogger(__name__)
+
+JobKey = Tuple[str, Optional[int]]  # (작업 종류, 대상 ID)
+
+
+class JobContext:
+    """작업 1회 실행 환경 (세션, 쓰기 슬롯, 제한 시간)
+
+    제한 시간이 지나면 스케줄러가 interrupt()로 실행 중인 SQLite 쿼리를 중단시킨다.
+    """
+
+    def __init__(self, writers: threading.BoundedSemaphore, timeout_seconds: float):
+        self.deadline = time.monotonic() + timeout_seconds
+        self.interrupted = False
+        self._writers = writers
+        self._sessions = []
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def remaining_seconds(self) -> float:
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    def session(self):
+        db = SessionLocal()
+        connection = db.connection().connection.dbapi_connection
+        with self._lock:
+            self._sessions.append(db)
+            self._connections.append(connection)
+        return db
+
+    @contextmanager
+    def writer(self):
+        """동시 쓰기 작업 수 제한 (남은 시간 안에 슬롯을 얻지 못하면 TimeoutError)"""
+        if not self._writers.acquire(timeout=self.remaining_seconds()):
+            raise TimeoutError("Timed out waiting for a writer slot")
+        try:
+            yield
+        finally:
+            self._writers.release()
+
+    def interrupt(self):
+        with self._lock:
+            self.interrupted = True
+            for connection in self._connections:
+                connection.interrupt()
+
+    def close(self):
+        with self._lock:
+            for db in self._sessions:
+                db.close()
+            self._sessions.clear()
+            self._connections.clear()
+
+
+class Job:
+    """주기 작업과 실행 통계"""
+
+    def __init__(self, key: JobKey, interval_seconds: float, run: Callable[[JobContext], object]):
+        self.key = key
+        self.interval_seconds = interval_seconds
+        self.run = run
+        self.next_run = time.monotonic() + random.uniform(0, _jitter(interval_seconds) or interval_seconds)
+        self.state = "idle"  # idle / queued / running
+        self.scheduled_at = None
+        self.context = None
+        self.runs = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.last_error = None
+        self.last_result = None
+        self.last_lag = None
+        self.last_duration = None
+        self.total_duration = 0.0
+
+    def snapshot(self, now: float):
+        kind, target_id = self.key
+        return {
+            "kind": kind,
+            "target_id": target_id,
+            "state": self.state,
+            "interval_seconds": self.interval_seconds,
+            "next_run_in_seconds": round(self.next_run - now, 3) if self.state == "idle" else None,
+            "runs": self.runs,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "last_error": self.last_error,
+            "last_lag_seconds": _rounded(self.last_lag),
+            "last_duration_ms": _rounded(self.last_duration and self.last_duration * 1000),
+            "avg_duration_ms": round(self.total_duration / self.runs * 1000, 3) if self.runs else None,
+        }
+
+
+def _jitter(interval_seconds: float) -> float:
+    return min(interval_seconds * settings.scheduler_jitter_fraction, settings.scheduler_max_jitter_seconds)
+
+
+def _rounded(value):
+    return round(value, 3) if value is not None else None
+
+
+def _segment_job(segment_id: int):
+    def run(context: JobContext):
+        return SegmentExecutionService.refresh_segment(
+            context.session(),
+            segment_id,
+            timeout_ms=int(min(context.remaining_seconds() * 1000, settings.segment_query_timeout_ms)),
+            write_guard=context.writer
+        )
+    return run
+
+
+def _metric_job(metric_id: int):
+    def run(context: JobContext):
+        db = context.session()
+        with context.writer():
+            return MetricService.refresh_value(db, metric_id)
+    return run
+
+
+def _compaction_job(context: JobContext):
+    with context.writer():
+        return compaction_worker.run_once()
+
+
+class RefreshScheduler:
+    """refresh_period / aggregation_period를 주기 작업으로 바꿔 실행하는 프로세스 내 스케줄러
+
+    계획 스레드 1개가 만기 작업을 고정 크기 스레드풀에 넣고, 쓰기는 세마포어로 동시 실행 수를 제한한다.
+    요청 처리 스레드풀과 분리되어 있어 작업이 밀려도 요청 처리 스레드를 점유하지 않는다.
+    """
+
+    def __init__(self):
+        self._jobs: Dict[JobKey, Job] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._executor = None
+        self._writers = threading.BoundedSemaphore(settings.scheduler_max_writers)
+        self._last_sync = None
+        self.started_at = None
+
+    def start(self):
+        if not settings.scheduler_enabled or self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._executor = ThreadPoolExecutor(max_workers=settings.scheduler_workers, thread_name_prefix="refresh-job")
+        self._thread = threading.Thread(target=self._loop, name="refresh-scheduler", daemon=True)
+        self.started_at = time.monotonic()
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        with self._lock:
+            for job in self._jobs.values():
+                if job.context is not None:
+                    job.context.interrupt()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._executor = None
+
+    def sync_jobs(self):
+        """세그먼트/지표 목록으로 작업 추가, 주기 변경, 삭제"""
+        desired = {}
+        db = SessionLocal()
+        try:
+            # 데이터 소스가 없으면 세그먼트 작업은 만들지 않는다
+            segments = db.query(Segment.id, Segment.refresh_period).filter(Segment.query.isnot(None))
+            for segment_id, period in segments if os.path.exists(settings.segment_source_path) else []:
+                interval = settings.segment_refresh_seconds.get(period or "", settings.segment_refresh_default_seconds)
+                desired[("segment", segment_id)] = (interval, _segment_job(segment_id))
+            # 지표 값 작업은 사용자가 입력한 value를 덮어쓰므로 설정으로 켠 경우에만 만든다
+            metrics = db.query(Metric.id, Metric.aggregation_period)
+            for metric_id, period in metrics if settings.scheduler_refresh_metric_values else []:
+                interval = settings.metric_refresh_seconds.get(period or "", settings.metric_refresh_default_seconds)
+                desired[("metric", metric_id)] = (interval, _metric_job(metric_id))
+        finally:
+            db.close()
+        if compaction_worker.interval_seconds > 0:
+            desired[("compaction", None)] = (compaction_worker.interval_seconds, _compaction_job)
+
+        with self._lock:
+            for key in list(self._jobs):
+                if key not in desired and self._jobs[key].state == "idle":
+                    del self._jobs[key]
+            for key, (interval, run) in desired.items():
+                job = self._jobs.get(key)
+                if job is None:
+                    self._jobs[key] = Job(key, interval, run)
+                elif job.interval_seconds != interval:
+                    job.interval_seconds = interval
+                    job.next_run = min(job.next_run, time.monotonic() + interval)
+        self._last_sync = time.monotonic()
+
+    def tick(self):
+        """만기 작업 제출 + 제한 시간을 넘긴 작업 중단"""
+        now = time.monotonic()
+        if self._last_sync is None or now - self._last_sync >= settings.scheduler_sync_seconds:
+            self.sync_jobs()
+        with self._lock:
+            for job in self._jobs.values():
+                if job.state == "idle" and job.next_run <= now:
+                    job.state = "queued"
+                    job.scheduled_at = job.next_run
+                    self._executor.submit(self._execute, job)
+                elif job.state == "running" and job.context.deadline < now and not job.context.interrupted:
+                    logger.warning("refresh job %s exceeded %ss, interrupting", job.key, settings.scheduler_job_timeout_seconds)
+                    job.timeouts += 1
+                    job.context.interrupt()
+
+    def snapshot(self):
+        """큐 길이, 지연, 실행 시간 등 스케줄러 상태"""
+        now = time.monotonic()
+        with self._lock:
+            jobs = [job.snapshot(now) for job in self._jobs.values()]
+            overdue = [now - job.next_run for job in self._jobs.values() if job.state == "idle" and job.next_run < now]
+            queued = [now - job.scheduled_at for job in self._jobs.values() if job.state == "queued"]
+        lags = [job["last_lag_seconds"] for job in jobs if job["last_lag_seconds"] is not None]
+        return {
+            "running": self._thread is not None,
+            "workers": settings.scheduler_workers,
+            "max_writers": settings.scheduler_max_writers,
+            "jobs_total": len(jobs),
+            "queue_depth": len(queued),
+            "running_jobs": sum(1 for job in jobs if job["state"] == "running"),
+            "max_queue_wait_seconds": round(max(queued + overdue, default=0.0), 3),
+            "avg_lag_seconds": round(sum(lags) / len(lags), 3) if lags else None,
+            "max_lag_seconds": max(lags, default=None),
+            "jobs": sorted(jobs, key=lambda job: (job["kind"], job["target_id"] or 0)),
+        }
+
+    def _loop(self):
+        while not self._stop_event.wait(settings.scheduler_tick_seconds):
+            try:
+                self.tick()
+            except Exception:
+                logger.exception("refresh scheduler tick failed")
+
+    def _execute(self, job: Job):
+        context = JobContext(self._writers, settings.scheduler_job_timeout_seconds)
+        started = time.monotonic()
+        with self._lock:
+            job.state = "running"
+            job.context = context
+            job.last_lag = started - job.scheduled_at
+        try:
+            job.last_result = job.run(context)
+            job.last_error = None
+        except Exception as e:
+            job.failures += 1
+            job.last_error = "Timed out" if context.interrupted else str(e)
+            logger.warning("refresh job %s failed: %s", job.key, job.last_error)
+        finally:
+            context.close()
+            duration = time.monotonic() - started
+            with self._lock:
+                job.runs += 1
+                job.last_duration = duration
+                job.total_duration += duration
+                job.context = None
+                job.state = "idle"
+                job.next_run = time.monotonic() + job.interval_seconds + random.uniform(0, _jitter(job.interval_seconds))
+
+
+scheduler = RefreshScheduler()
@@ -0,0 +1,175 @@
+import logging
+import re
+from typing import Iterable, Optional
+from sqlalchemy import Integer, column, false, literal_column, select, table, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, lazyload
+from ..cache import invalidate
+from ..models.experiment import Experiment
+from ..models.metric import Metric
+from ..models.segment import Segment
+
+logger = logging.getLogger(__name__)
+
+# 엔티티별 검색 대상 필드 (제목, 본문)
+_ENTITIES = {
+    "metric": (Metric, "name", ("description", "calculation_logic", "category", "data_source", "metric_owner")),
+    "segment": (Segment, "name", ("description", "tags", "query", "category", "segment_owner")),
+    "experiment": (Experiment, "name", ("description", "objective", "hypothesis", "background", "expected_impact", "owner", "team")),
+}
+ENTITY_TYPES = tuple(_ENTITIES)
+
+# rowid = entity_id * 4 + 타입 코드 (행 단위 갱신/삭제를 rowid 탐색으로 처리)
+_TYPE_CODES = {"metric": 1, "segment": 2, "experiment": 3}
+
+# 제목 > 본문 > 한글 bigram 순 가중치 (entity_type, entity_id는 UNINDEXED)
+_BM25 = "bm25(search_index, 0, 0, 10.0, 2.0, 1.0)"
+
+_HANGUL_RUN = re.compile(r"[가-힣]{3,}")
+_TOKEN = re.compile(r"[\w]+", re.UNICODE)
+
+search_index = table(
+    "search_index",
+    column("rowid", Integer),
+    column("entity_type"),
+    column("entity_id", Integer),
+    column("title"),
+    column("body"),
+    column("grams"),
+)
+
+CREATE_SEARCH_INDEX = """
+CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+    entity_type UNINDEXED,
+    entity_id UNINDEXED,
+    title,
+    body,
+    grams,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '1 2 3'
+)
+"""
+
+
+def _hangul_bigrams(*texts: Optional[str]) -> str:
+    """붙여 쓴 한글 단어의 부분 일치 검색을 위한 bigram 열 (예: 결제전환율 -> 결제 제전 전환 환율)"""
+    grams = []
+    for value in texts:
+        for run in _HANGUL_RUN.findall(value or ""):
+            grams.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return " ".join(grams)
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """사용자 검색어를 FTS5 MATCH 식으로 변환 (모든 단어 AND, 각 단어는 접두어 검색)"""
+    clauses = []
+    for token in _TOKEN.findall(query or ""):
+        clause = f'"{token}"*'
+        if _HANGUL_RUN.fullmatch(token):
+            # 단어 중간에 포함된 경우도 bigram 구문으로 매칭
+            bigrams = " ".join(token[i:i + 2] for i in range(len(token) - 1))
+            clause = f'({clause} OR grams : "{bigrams}")'
+        clauses.append(clause)
+    return " AND ".join(clauses) or None
+
+
+def _match(match_query: str):
+    return literal_column("search_index").op("MATCH")(match_query)
+
+
+def _document(entity_type: str, obj):
+    _, title_field, body_fields = _ENTITIES[entity_type]
+    title = getattr(obj, title_field) or ""
+    body = "\n".join(str(value) for field in body_fields if (value := getattr(obj, field)))
+    return {
+        "rowid": obj.id * 4 + _TYPE_CODES[entity_type],
+        "entity_type": entity_type,
+        "entity_id": obj.id,
+        "title": title,
+        "body": body,
+        "grams": _hangul_bigrams(title, body),
+    }
+
+
+class SearchService:
+    @staticmethod
+    def index_entity(db: Session, entity_type: str, obj):
+        """엔티티 검색 문서 추가/갱신 (호출자가 커밋, obj.id가 있어야 함)"""
+        SearchService.remove_entity(db, entity_type, obj.id)
+        db.execute(search_index.insert(), _document(entity_type, obj))
+
+    @staticmethod
+    def remove_entity(db: Session, entity_type: str, entity_id: int):
+        """엔티티 검색 문서 삭제 (호출자가 커밋)"""
+        db.execute(
+            search_index.delete().where(search_index.c.rowid == entity_id * 4 + _TYPE_CODES[entity_type])
+        )
+
+    @staticmethod
+    def match_ids(entity_type: str, query: str):
+        """검색어에 매칭되는 엔티티 ID 서브쿼리 (검색할 단어가 없으면(예: %%%) 아무것도 매칭하지 않음)"""
+        match_query = build_match_query(query)
+        if match_query is None:
+            return select(search_index.c.entity_id).where(false())
+        return (
+            select(search_index.c.entity_id)
+            .where(_match(match_query), search_index.c.entity_type == entity_type)
+        )
+
+    @staticmethod
+    def search(db: Session, query: str, types: Optional[Iterable[str]] = None, limit: int = 20):
+        """지표/세그먼트/실험 통합 검색 (관련도 순)"""
+        match_query = build_match_query(query)
+        if match_query is None:
+            return []
+
+        rank = literal_column(_BM25)
+        stmt = (
+            select(
+                search_index.c.entity_type,
+                search_index.c.entity_id,
+                search_index.c.title,
+                literal_column("snippet(search_index, 3, '[', ']', '…', 12)"),
+                rank,
+            )
+            .where(_match(match_query))
+            .order_by(rank)
+            .limit(limit)
+        )
+        if types:
+            stmt = stmt.where(search_index.c.entity_type.in_(list(types)))
+
+        return [
+            {
+                "type": entity_type,
+                "id": entity_id,
+                "name": title,
+                "snippet": snippet,
+                "score": round(-score, 4),
+            }
+            for entity_type, entity_id, title, snippet, score in db.execute(stmt)
+        ]
+
+    @staticmethod
+    def rebuild(db: Session):
+        """전체 검색 인덱스 재생성"""
+        db.execute(search_index.delete())
+        db.commit()
+        for entity_type, (model, _, _) in _ENTITIES.items():
+            try:
+                query = db.query(model).options(lazyload("*")).yield_per(1000)
+                documents = [_document(entity_type, obj) for obj in query]
+            except OperationalError:
+                # 모델과 스키마가 다른 오래된 테이블은 건너뛴다
+                db.rollback()
+                logger.warning("search index: skipped %s (table schema is out of date)", entity_type)
+                continue
+            if documents:
+                db.execute(search_index.insert(), documents)
+            db.commit()
+        invalidate("metrics", "segments", "experiments")
+
+
+def create_search_index(connection):
+    """FTS5 가상 테이블 생성 (없을 때만)"""
+    connection.execute(text(CREATE_SEARCH_INDEX))
@@ -0,0 +1,129 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Optional
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from ..cache import cache, invalidate
+from ..models.segment import Segment
+from ..models.segment_membership import SegmentBitmap, SegmentMemberKey, SegmentMembership
+from .bitmap import Bitmap, overlap_matrix, set_operation_counts
+from .data_point_service import _chunked
+
+# IN 목록 하나에 넣는 멤버 ID 수 (SQLite 바인드 변수 상한 이내)
+_KEY_CHUNK = 10000
+# 역직렬화한 비트맵 메모 (segment_id -> (segments 무효화 세대, 비트맵))
+_MEMO_SIZE = 256
+_bitmaps = OrderedDict()
+_bitmaps_lock = threading.Lock()
+
+
+def member_keys(db: Session, member_ids: Iterable[str]) -> np.ndarray:
+    """멤버 ID 문자열을 정수 키로 변환 (처음 보는 ID는 사전에 추가, 호출자가 커밋)"""
+    keys = []
+    stmt = insert(SegmentMemberKey.__table__).on_conflict_do_nothing(index_elements=["member_id"])
+    for chunk in _chunked(member_ids, _KEY_CHUNK):
+        db.execute(stmt, [{"member_id": member_id} for member_id in chunk])
+        keys.extend(
+            row[0] for row in
+            db.query(SegmentMemberKey.id).filter(SegmentMemberKey.member_id.in_(chunk))
+        )
+    return np.array(keys, dtype=np.uint32)
+
+
+def _store(db: Session, segment_id: int, bitmap: Bitmap):
+    stmt = insert(SegmentBitmap.__table__)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["segment_id"],
+        set_={"cardinality": stmt.excluded.cardinality, "bitmap": stmt.excluded.bitmap, "updated_at": func.now()},
+    ), {"segment_id": segment_id, "cardinality": len(bitmap), "bitmap": bitmap.serialize()})
+
+
+class SegmentBitmapService:
+    @staticmethod
+    def apply_diff(db: Session, segment_id: int, added: Iterable[str], removed: Iterable[str]):
+        """멤버십 변경분만 키로 변환해 비트맵 갱신 (호출자가 커밋)"""
+        row = db.get(SegmentBitmap, segment_id)
+        bitmap = Bitmap.deserialize(row.bitmap) if row else Bitmap.from_ids([])
+        _store(db, segment_id, bitmap.apply(member_keys(db, added), member_keys(db, removed)))
+
+    @staticmethod
+    def rebuild(db: Session, segment_id: Optional[int] = None):
+        """segment_memberships 행으로부터 비트맵 재생성"""
+        query = db.query(SegmentMembership.segment_id).distinct()
+        if segment_id is not None:
+            query = query.filter(SegmentMembership.segment_id == segment_id)
+        for (target_id,) in query.all():
+            members = [
+                row[0] for row in
+                db.query(SegmentMembership.member_id).filter(SegmentMembership.segment_id == target_id)
+            ]
+            _store(db, target_id, Bitmap.from_ids(member_keys(db, members)))
+        db.commit()
+        invalidate("segments")
+
+    @staticmethod
+    def delete_segment_bitmap(db: Session, segment_id: int):
+        """세그먼트 삭제 시 비트맵 정리 (커밋은 호출자)"""
+        db.query(SegmentBitmap).filter(SegmentBitmap.segment_id == segment_id).delete(synchronize_session=False)
+
+    @staticmethod
+    def get_bitmaps(db: Session, segment_ids: List[int]):
+        """세그먼트별 비트맵 (세그먼트가 바뀔 때까지 역직렬화 결과를 메모)
+
+        없는 세그먼트가 있으면 ValueError, 아직 실행되지 않은 세그먼트는 빈 집합.
+        """
+        generation = cache.generation("segments")
+        result, missing = {}, []
+        with _bitmaps_lock:
+            for segment_id in segment_ids:
+                memo = _bitmaps.get(segment_id)
+                if memo is not None and memo[0] == generation:
+                    result[segment_id] = memo[1]
+                else:
+                    missing.append(segment_id)
+        if missing:
+            existing = {row[0] for row in db.query(Segment.id).filter(Segment.id.in_(missing))}
+            unknown = sorted(set(missing) - existing)
+            if unknown:
+                raise ValueError(f"Segment not found: {unknown}")
+            rows = dict(
+                db.query(SegmentBitmap.segment_id, SegmentBitmap.bitmap).filter(SegmentBitmap.segment_id.in_(missing))
+            )
+            with _bitmaps_lock:
+                for segment_id in missing:
+                    data = rows.get(segment_id)
+                    bitmap = Bitmap.deserialize(data) if data else Bitmap.from_ids([])
+                    result[segment_id] = bitmap
+                    _bitmaps[segment_id] = (generation, bitmap)
+                    _bitmaps.move_to_end(segment_id)
+                while len(_bitmaps) > _MEMO_SIZE:
+                    _bitmaps.popitem(last=False)
+        return [result[segment_id] for segment_id in segment_ids]
+
+    @staticmethod
+    def set_operations(db: Session, left_id: int, right_id: int):
+        """두 세그먼트의 합집합/교집합/차집합 멤버 수"""
+        started = time.perf_counter()
+        left, right = SegmentBitmapService.get_bitmaps(db, [left_id, right_id])
+        return {
+            "left_segment_id": left_id,
+            "right_segment_id": right_id,
+            **set_operation_counts(left, right),
+            "computed_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+
+    @staticmethod
+    def overlap(db: Session, segment_ids: List[int]):
+        """N x N 겹침 행렬 (matrix[i][j] = i, j 세그먼트 공통 멤버 수, 대각선은 세그먼트 크기)"""
+        started = time.perf_counter()
+        segment_ids = list(dict.fromkeys(segment_ids))
+        matrix = overlap_matrix(SegmentBitmapService.get_bitmaps(db, segment_ids))
+        return {
+            "segment_ids": segment_ids,
+            "sizes": np.diag(matrix).tolist(),
+            "matrix": matrix.tolist(),
+            "computed_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
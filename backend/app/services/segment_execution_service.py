@@ -0,0 +1,251 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import bindparam
+from sqlalchemy.orm import Session
+from ..cache import invalidate
+from ..config import settings
+from ..models.segment import Segment
+from ..models.segment_membership import SegmentMembership, SegmentRefresh
+from .data_point_service import _chunked
+from .pagination import keyset_paginate
+from .segment_bitmap_service import SegmentBitmapService
+from .stats_service import StatsService
+
+logger = logging.getLogger(__name__)
+
+# 세그먼트 쿼리에 허용하는 SQLite 작업 (그 외 ATTACH/PRAGMA/쓰기 등은 모두 거부)
+_ALLOWED_ACTIONS = {
+    sqlite3.SQLITE_SELECT,
+    sqlite3.SQLITE_READ,
+    sqlite3.SQLITE_FUNCTION,
+    getattr(sqlite3, "SQLITE_RECURSIVE", 33),
+}
+# progress handler 호출 간격 (VM 명령 수)
+_PROGRESS_STEPS = 10000
+
+# 세그먼트별 실행 잠금 (같은 세그먼트 동시 재계산 방지)
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def _authorizer(action, arg1, arg2, database, trigger):
+    return sqlite3.SQLITE_OK if action in _ALLOWED_ACTIONS else sqlite3.SQLITE_DENY
+
+
+def _read_only_uri(path: str) -> str:
+    return f"file:{path}?mode=ro"
+
+
+def source_paths():
+    """데이터 소스 파일 목록 (별칭, 경로). 기본 소스가 없으면 ValueError"""
+    if not os.path.exists(settings.segment_source_path):
+        raise ValueError("Segment data source is not configured")
+    return [("main", settings.segment_source_path)] + sorted(settings.segment_source_attach.items())
+
+
+def source_fingerprint() -> str:
+    """데이터 소스 파일(WAL 포함)의 크기/수정 시각 (내용이 바뀌면 달라짐)"""
+    parts = []
+    for alias, path in source_paths():
+        for suffix in ("", "-wal"):
+            try:
+                stat = os.stat(path + suffix)
+            except FileNotFoundError:
+                continue
+            parts.append(f"{alias}:{suffix}:{stat.st_size}:{stat.st_mtime_ns}")
+    return "|".join(parts)
+
+
+def open_sandbox(timeout_ms: int):
+    """읽기 전용 + 권한 제한 + 실행 시간 제한이 걸린 데이터 소스 연결"""
+    conn = sqlite3.connect(_read_only_uri(settings.segment_source_path), uri=True, check_same_thread=False)
+    try:
+        for alias, path in source_paths()[1:]:
+            conn.execute("ATTACH DATABASE ? AS " + _quote_identifier(alias), (_read_only_uri(path),))
+        conn.execute("PRAGMA query_only = ON")
+        deadline = time.monotonic() + timeout_ms / 1000
+        # 0이 아닌 값을 반환하면 SQLite가 쿼리를 중단 (sqlite3.OperationalError: interrupted)
+        conn.set_progress_handler(lambda: time.monotonic() > deadline, _PROGRESS_STEPS)
+        conn.set_authorizer(_authorizer)
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+
+def _quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def run_segment_query(query: str, timeout_ms: Optional[int] = None, max_members: Optional[int] = None):
+    """세그먼트 쿼리를 샌드박스에서 실행하여 첫 번째 컬럼의 멤버 ID 집합 반환
+
+    SELECT 1개 문장만 허용하며, 시간 초과/권한 위반/SQL 오류/멤버 수 초과는 ValueError.
+    """
+    query = (query or "").strip().rstrip(";").strip()
+    if not query:
+        raise ValueError("Segment has no query")
+    max_members = max_members or settings.segment_max_members
+    conn = open_sandbox(timeout_ms or settings.segment_query_timeout_ms)
+    try:
+        cursor = conn.execute(query)
+        members = set()
+        while rows := cursor.fetchmany(10000):
+            members.update(str(row[0]) for row in rows if row[0] is not None)
+            if len(members) > max_members:
+                raise ValueError(f"Segment query returned more than {max_members} members")
+        return members
+    except (sqlite3.DatabaseError, sqlite3.Warning) as e:
+        message = "Segment query timed out" if "interrupted" in str(e) else f"Segment query failed: {e}"
+        raise ValueError(message)
+    finally:
+        conn.close()
+
+
+def _segment_lock(segment_id: int) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(segment_id, threading.Lock())
+
+
+def _now():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def refresh_interval(segment: Segment) -> timedelta:
+    seconds = settings.segment_refresh_seconds.get(segment.refresh_period or "", settings.segment_refresh_default_seconds)
+    return timedelta(seconds=seconds)
+
+
+class SegmentExecutionService:
+    @staticmethod
+    def refresh_segment(
+        db: Session,
+        segment_id: int,
+        force: bool = False,
+        timeout_ms: Optional[int] = None,
+        write_guard=nullcontext
+    ):
+        """세그먼트 쿼리 실행 후 멤버십/customer_count 갱신
+
+        쿼리와 데이터 소스가 마지막 실행과 같고 refresh_period가 지나지 않았으면 재계산하지 않는다.
+        멤버십은 이전 결과와의 차이(추가/삭제)만 기록하며, 기록 구간은 write_guard() 안에서 실행한다.
+        세그먼트가 없으면 None, 실행에 실패하면 상태에 오류를 남기고 ValueError.
+        """
+        segment = db.query(Segment).filter(Segment.id == segment_id).first()
+        if not segment:
+            return None
+
+        with _segment_lock(segment_id):
+            state = db.get(SegmentRefresh, segment_id)
+            input_hash = hashlib.sha256(
+                f"{segment.query or ''}\0{source_fingerprint()}".encode("utf-8")
+            ).hexdigest()
+            now = _now()
+            if (
+                not force and state is not None and state.error is None
+                and state.input_hash == input_hash and state.refreshed_at is not None
+                and now - state.refreshed_at < refresh_interval(segment)
+            ):
+                return SegmentExecutionService._report(segment_id, state, refreshed=False)
+
+            started = time.perf_counter()
+            try:
+                members = run_segment_query(segment.query, timeout_ms=timeout_ms)
+            except ValueError as e:
+                with write_guard():
+                    state = state or SegmentRefresh(segment_id=segment_id, member_count=0)
+                    state.error = str(e)
+                    state.attempted_at = now
+                    db.add(state)
+                    db.commit()
+                raise
+
+            with write_guard():
+                existing = {
+                    row[0] for row in
+                    db.query(SegmentMembership.member_id).filter(SegmentMembership.segment_id == segment_id)
+                }
+                added, removed = members - existing, existing - members
+                table = SegmentMembership.__table__
+                for chunk in _chunked(sorted(removed), settings.ingest_chunk_size):
+                    db.execute(
+                        table.delete().where(table.c.segment_id == segment_id, table.c.member_id == bindparam("member")),
+                        [{"member": member} for member in chunk]
+                    )
+                for chunk in _chunked(sorted(added), settings.ingest_chunk_size):
+                    db.execute(table.insert(), [{"segment_id": segment_id, "member_id": member} for member in chunk])
+                SegmentBitmapService.apply_diff(db, segment_id, added, removed)
+
+                before = StatsService.segment_counts(segment)
+                segment.customer_count = len(members)
+                StatsService.apply(db, before, StatsService.segment_counts(segment))
+
+                state = state or SegmentRefresh(segment_id=segment_id)
+                state.input_hash = input_hash
+                state.member_count = len(members)
+                state.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+                state.error = None
+                state.refreshed_at = now
+                state.attempted_at = now
+                db.add(state)
+                db.commit()
+            invalidate("segments")
+            logger.info(
+                "segment %d refreshed: %d members (+%d / -%d) in %.1fms",
+                segment_id, len(members), len(added), len(removed), state.duration_ms
+            )
+            return SegmentExecutionService._report(segment_id, state, refreshed=True, added=len(added), removed=len(removed))
+
+    @staticmethod
+    def refresh_due(db: Session, force: bool = False):
+        """쿼리가 있는 모든 세그먼트 중 재계산이 필요한 것만 실행 (세그먼트별 결과 목록)"""
+        results = []
+        segment_ids = [row[0] for row in db.query(Segment.id).filter(Segment.query.isnot(None)).order_by(Segment.id)]
+        for segment_id in segment_ids:
+            try:
+                results.append(SegmentExecutionService.refresh_segment(db, segment_id, force=force))
+            except ValueError as e:
+                results.append({"segment_id": segment_id, "refreshed": False, "error": str(e)})
+        return results
+
+    @staticmethod
+    def get_members(db: Session, segment_id: int, limit: int = 1000, cursor: Optional[str] = None):
+        """세그먼트 멤버 ID 목록 (member_id 순 커서 페이지네이션). 세그먼트가 없으면 None"""
+        if not db.query(Segment.id).filter(Segment.id == segment_id).first():
+            return None
+        state = db.get(SegmentRefresh, segment_id)
+        query = db.query(SegmentMembership.member_id).filter(SegmentMembership.segment_id == segment_id)
+        items, next_cursor = keyset_paginate(query, [SegmentMembership.member_id], limit, cursor=cursor)
+        return {
+            "segment_id": segment_id,
+            "total": state.member_count if state else 0,
+            "refreshed_at": state.refreshed_at if state else None,
+            "items": items,
+            "next_cursor": next_cursor,
+        }
+
+    @staticmethod
+    def delete_segment_members(db: Session, segment_id: int):
+        """세그먼트 삭제 시 멤버십/실행 상태/비트맵 정리 (커밋은 호출자)"""
+        db.query(SegmentMembership).filter(SegmentMembership.segment_id == segment_id).delete(synchronize_session=False)
+        db.query(SegmentRefresh).filter(SegmentRefresh.segment_id == segment_id).delete(synchronize_session=False)
+        SegmentBitmapService.delete_segment_bitmap(db, segment_id)
+
+    @staticmethod
+    def _report(segment_id: int, state: SegmentRefresh, refreshed: bool, added: int = 0, removed: int = 0):
+        return {
+            "segment_id": segment_id,
+            "refreshed": refreshed,
+            "member_count": state.member_count,
+            "added": added,
+            "removed": removed,
+            "duration_ms": state.duration_ms,
+            "refreshed_at": state.refreshed_at,
+        }
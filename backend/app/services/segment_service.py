@@ -1,8 +1,13 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import Optional
+from typing import Optional, Sequence
+from ..cache import invalidate
 from ..models.segment import Segment
 from ..schemas.segment import SegmentCreate, SegmentUpdate
+from .pagination import keyset_paginate
+from .projection import load_fields
+from .search_service import SearchService
+from .segment_execution_service import SegmentExecutionService
+from .stats_service import StatsService
 
 
 class SegmentService:
@@ -12,38 +17,44 @@ class SegmentService:
         skip: int = 0, 
         limit: int = 100,
         search: Optional[str] = None,
-        category: Optional[str] = None
+        category: Optional[str] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        fields: Optional[Sequence[str]] = None
     ):
-        """모든 세그먼트 조회"""
-        query = db.query(Segment)
+        """모든 세그먼트 조회 (id 순, OFFSET 또는 커서 페이지네이션)"""
+        query = load_fields(db.query(Segment), Segment, fields)
         
-        # 검색 필터
+        # 검색 필터 (FTS5 인덱스)
         if search:
-            query = query.filter(
-                (Segment.name.contains(search)) | 
-                (Segment.description.contains(search))
-            )
+            query = query.filter(Segment.id.in_(SearchService.match_ids("segment", search)))
         
         # 카테고리 필터
         if category:
             query = query.filter(Segment.category == category)
         
-        total = query.count()
-        items = query.offset(skip).limit(limit).all()
-        
-        return {"total": total, "items": items}
+        total = query.count() if include_total else None
+        items, next_cursor = keyset_paginate(
+            query, [Segment.id], limit, skip=skip, cursor=cursor
+        )
+
+        return {"total": total, "items": items, "next_cursor": next_cursor}
 
     @staticmethod
-    def get_segment_by_id(db: Session, segment_id: int):
+    def get_segment_by_id(db: Session, segment_id: int, fields: Optional[Sequence[str]] = None):
         """ID로 세그먼트 조회"""
-        return db.query(Segment).filter(Segment.id == segment_id).first()
+        return load_fields(db.query(Segment), Segment, fields).filter(Segment.id == segment_id).first()
 
     @staticmethod
     def create_segment(db: Session, segment: SegmentCreate):
         """새 세그먼트 생성"""
         db_segment = Segment(**segment.model_dump())
         db.add(db_segment)
+        db.flush()
+        SearchService.index_entity(db, "segment", db_segment)
+        StatsService.apply(db, after=StatsService.segment_counts(db_segment))
         db.commit()
+        invalidate("segments")
         db.refresh(db_segment)
         return db_segment
 
@@ -54,11 +65,15 @@ class SegmentService:
         if not db_segment:
             return None
         
+        before = StatsService.segment_counts(db_segment)
         update_data = segment.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_segment, key, value)
         
+        SearchService.index_entity(db, "segment", db_segment)
+        StatsService.apply(db, before, StatsService.segment_counts(db_segment))
         db.commit()
+        invalidate("segments")
         db.refresh(db_segment)
         return db_segment
 
@@ -69,29 +84,22 @@ class SegmentService:
         if not db_segment:
             return False
         
+        SearchService.remove_entity(db, "segment", segment_id)
+        StatsService.apply(db, before=StatsService.segment_counts(db_segment))
+        SegmentExecutionService.delete_segment_members(db, segment_id)
         db.delete(db_segment)
         db.commit()
+        invalidate("segments")
         return True
 
     @staticmethod
     def get_segments_stats(db: Session):
-        """세그먼트 통계 조회"""
-        total_segments = db.query(Segment).count()
-        total_customers = db.query(func.sum(Segment.customer_count)).scalar() or 0
-        
-        # 카테고리별 고객 수
-        retention_customers = db.query(func.sum(Segment.customer_count)).filter(
-            Segment.category == "리텐션"
-        ).scalar() or 0
-        
-        reactivation_customers = db.query(func.sum(Segment.customer_count)).filter(
-            Segment.category == "재활성화"
-        ).scalar() or 0
-        
+        """세그먼트 통계 조회 (카운터 테이블)"""
+        counters = StatsService.get_counters(db, "segment", "segment.category.customers")
+
         return {
-            "total_segments": total_segments,
-            "total_customers": total_customers,
-            "active_customers": retention_customers,
-            "at_risk_customers": reactivation_customers
+            "total_segments": counters.get(("segment", "total"), 0),
+            "total_customers": counters.get(("segment", "customers"), 0),
+            "active_customers": counters.get(("segment.category.customers", "리텐션"), 0),
+            "at_risk_customers": counters.get(("segment.category.customers", "재활성화"), 0)
         }
-
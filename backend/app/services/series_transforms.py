@@ -0,0 +1,168 @@
+import math
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
+import numpy as np
+from ..config import settings
+
+# 시계열 변환 (이동 평균 / EWMA / 누적 합 / 기간 대비 증감률 / 선형 추세·예측)
+#
+# 버킷 시계열은 값이 없는 버킷이 빠진 희소 배열이므로, 창과 시차는 행 번호가 아니라
+# 버킷 번호(첫 버킷부터 몇 번째 버킷인지) 기준으로 계산한다. 버킷이 없으면 행 번호를 쓴다.
+
+# 이름 -> (인자 필요 여부, 기본 인자)
+_TRANSFORMS = {
+    "ma": (True, None),
+    "ewma": (True, None),
+    "cumsum": (False, None),
+    "pop": (False, 1),
+    "trend": (False, None),
+    "forecast": (True, None),
+}
+
+# EWMA 블록 계산에서 감쇠 계수의 역수 거듭제곱이 넘지 않을 크기 (float64 오버플로 방지)
+_EWMA_BLOCK_RANGE = math.log(1e100)
+
+
+class Transform(NamedTuple):
+    name: str
+    param: Optional[float]
+
+    @property
+    def key(self) -> str:
+        """응답 포인트의 필드 이름 (예: ma_7, ewma_0.3, pop_1)"""
+        if self.param is None or self.name == "forecast":
+            return self.name
+        return f"{self.name}_{self.param:g}"
+
+
+@lru_cache(maxsize=256)
+def parse_transforms(text: Optional[str]) -> Tuple[Transform, ...]:
+    """쉼표로 구분한 변환 목록 파싱 (예: ma:7,ewma:0.3,cumsum,pop:7,trend,forecast:14)
+
+    ma:N은 N개 버킷 이동 평균, ewma:A는 평활 계수 A (1 이상이면 span으로 보고 2/(span+1)),
+    pop:N은 N개 버킷 전 대비 증감률(%), forecast:N은 추세선을 N개 버킷 뒤까지 연장한다.
+    이름이나 인자가 잘못되면 ValueError.
+    """
+    transforms = []
+    for part in (text or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, raw = part.partition(":")
+        if name not in _TRANSFORMS:
+            raise ValueError(f"Unknown transform: {name} (available: {', '.join(_TRANSFORMS)})")
+        required, default = _TRANSFORMS[name]
+        if raw and name in ("cumsum", "trend"):
+            raise ValueError(f"Transform {name} takes no parameter")
+        if not raw:
+            if required:
+                raise ValueError(f"Transform {name} requires a parameter ({name}:N)")
+            param = default
+        else:
+            try:
+                param = float(raw)
+            except ValueError:
+                raise ValueError(f"Invalid transform parameter: {part}")
+            if not math.isfinite(param) or param <= 0 or (name != "ewma" and not param.is_integer()):
+                raise ValueError(f"Invalid transform parameter: {part}")
+            if name != "ewma" and param > settings.timeseries_max_points:
+                raise ValueError(f"Transform parameter exceeds {settings.timeseries_max_points} buckets: {part}")
+        transform = Transform(name, param)
+        if transform not in transforms:
+            transforms.append(transform)
+    if sum(transform.name == "forecast" for transform in transforms) > 1:
+        raise ValueError("Only one forecast transform is allowed")
+    return tuple(transforms)
+
+
+def bucket_positions(timestamps: np.ndarray, bucket: Optional[str]) -> np.ndarray:
+    """첫 포인트 기준 버킷 번호 (버킷이 없으면 행 번호)"""
+    if bucket is None or not len(timestamps):
+        return np.arange(len(timestamps))
+    if bucket == "week":
+        # numpy 주 단위는 목요일 기준이므로 일 단위 차이를 7로 나눈다 (주 버킷은 월요일 시작)
+        days = timestamps.astype("datetime64[D]").astype(np.int64)
+        return (days - days[0]) // 7
+    unit = {"minute": "m", "hour": "h", "day": "D", "month": "M"}[bucket]
+    units = timestamps.astype(f"datetime64[{unit}]").astype(np.int64)
+    return units - units[0]
+
+
+def _moving_average(positions: np.ndarray, values: np.ndarray, window: int) -> np.ndarray:
+    """최근 window개 버킷 안에 있는 값의 평균 (누적 합 차이로 계산)"""
+    sums = np.r_[0.0, np.cumsum(values)]
+    lows = np.searchsorted(positions, positions - window + 1)
+    highs = np.arange(1, len(values) + 1)
+    return (sums[highs] - sums[lows]) / (highs - lows)
+
+
+def _ewma(values: np.ndarray, alpha: float) -> np.ndarray:
+    """s_0 = x_0, s_t = (1 - alpha) s_{t-1} + alpha x_t
+
+    재귀식을 닫힌 형태 s_t = d^(t-b+1) s_(b-1) + alpha d^t Σ x_i d^(-i) (d = 1 - alpha)로 풀어
+    블록마다 누적 합 한 번으로 계산한다. d^(-i)가 커지지 않도록 블록 길이를 제한한다.
+    """
+    if alpha >= 1 or not len(values):
+        return values.copy()
+    decay = 1 - alpha
+    block = max(1, int(_EWMA_BLOCK_RANGE / -math.log(decay)))
+    result = np.empty(len(values))
+    result[0] = carry = values[0]
+    for begin in range(1, len(values), block):
+        chunk = values[begin:begin + block]
+        offsets = np.arange(len(chunk))
+        powers = decay ** offsets
+        result[begin:begin + len(chunk)] = decay * powers * carry + alpha * powers * np.cumsum(chunk / powers)
+        carry = result[begin + len(chunk) - 1]
+    return result
+
+
+def _period_change(positions: np.ndarray, values: np.ndarray, lag: int) -> np.ndarray:
+    """lag개 버킷 전 값 대비 증감률(%), 그 버킷에 값이 없거나 0이면 NaN"""
+    previous = np.searchsorted(positions, positions - lag)
+    found = (previous < len(positions)) & (positions[np.minimum(previous, len(positions) - 1)] == positions - lag)
+    base = np.where(found, values[np.minimum(previous, len(values) - 1)], np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = (values - base) / np.abs(base) * 100
+    change[~np.isfinite(change)] = np.nan
+    return change
+
+
+def _linear_fit(positions: np.ndarray, values: np.ndarray):
+    """최소제곱 직선 (기울기, 절편), 포인트가 2개 미만이면 None"""
+    if len(values) < 2:
+        return None
+    x = positions.astype(np.float64)
+    x_mean, y_mean = x.mean(), values.mean()
+    spread = ((x - x_mean) ** 2).sum()
+    slope = ((x - x_mean) * (values - y_mean)).sum() / spread if spread else 0.0
+    return slope, y_mean - slope * x_mean
+
+
+def apply_transforms(positions: np.ndarray, values: np.ndarray, transforms) -> Dict[str, np.ndarray]:
+    """변환별 결과 배열 {Transform: 값}
+
+    forecast는 기존 포인트의 추세선 값 뒤에 N개 미래 버킷의 연장 값을 이어 붙인 배열이다.
+    """
+    results = {}
+    fit = None
+    for transform in transforms:
+        if transform.name == "ma":
+            column = _moving_average(positions, values, int(transform.param))
+        elif transform.name == "ewma":
+            alpha = transform.param if transform.param < 1 else 2 / (transform.param + 1)
+            column = _ewma(values, alpha)
+        elif transform.name == "cumsum":
+            column = np.cumsum(values)
+        elif transform.name == "pop":
+            column = _period_change(positions, values, int(transform.param))
+        else:
+            if fit is None:
+                fit = _linear_fit(positions, values) or (np.nan, np.nan)
+            slope, intercept = fit
+            x = positions
+            if transform.name == "forecast" and len(positions):
+                x = np.r_[positions, positions[-1] + np.arange(1, int(transform.param) + 1)]
+            column = slope * x + intercept
+        results[transform] = column
+    return results
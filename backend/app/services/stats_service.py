@@ -0,0 +1,106 @@
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from ..cache import invalidate
+from ..models.entity_counter import EntityCounter
+from ..models.metric import Metric
+from ..models.segment import Segment
+
+
+def _upsert_statement():
+    """카운터 증감 (없으면 생성)"""
+    stmt = insert(EntityCounter.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=["scope", "key"],
+        set_={"value": EntityCounter.__table__.c.value + stmt.excluded.value},
+    )
+
+
+class StatsService:
+    @staticmethod
+    def metric_counts(metric: Metric):
+        """지표 1건이 기여하는 카운터 값"""
+        return {
+            ("metric", "total"): 1,
+            ("metric.status", metric.status or ""): 1,
+            ("metric.category", metric.category or ""): 1,
+        }
+
+    @staticmethod
+    def segment_counts(segment: Segment):
+        """세그먼트 1건이 기여하는 카운터 값"""
+        customers = segment.customer_count or 0
+        category = segment.category or ""
+        return {
+            ("segment", "total"): 1,
+            ("segment", "customers"): customers,
+            ("segment.category", category): 1,
+            ("segment.category.customers", category): customers,
+        }
+
+    @staticmethod
+    def apply(db: Session, before=None, after=None):
+        """엔티티 변경 전/후 기여분의 차이만큼 카운터 증감 (호출자가 커밋)"""
+        deltas = dict(after or {})
+        for key, value in (before or {}).items():
+            deltas[key] = deltas.get(key, 0) - value
+
+        rows = [
+            {"scope": scope, "key": key, "value": value}
+            for (scope, key), value in deltas.items()
+            if value
+        ]
+        if rows:
+            db.execute(_upsert_statement(), rows)
+
+    @staticmethod
+    def get_counters(db: Session, *scopes: str):
+        """scope별 카운터 조회 (기본 키 구간 조회 1회)"""
+        rows = (
+            db.query(EntityCounter.scope, EntityCounter.key, EntityCounter.value)
+            .filter(EntityCounter.scope.in_(scopes))
+            .all()
+        )
+        return {(scope, key): value for scope, key, value in rows}
+
+    @staticmethod
+    def rebuild(db: Session):
+        """원본 테이블 집계로 카운터 재계산 후 보정된 항목 반환"""
+        previous = {
+            (row.scope, row.key): row.value
+            for row in db.query(EntityCounter).all()
+        }
+
+        counters = {}
+
+        def add(scope, key, value):
+            counters[(scope, key or "")] = counters.get((scope, key or ""), 0) + (value or 0)
+
+        for status, count in db.query(Metric.status, func.count(Metric.id)).group_by(Metric.status):
+            add("metric", "total", count)
+            add("metric.status", status, count)
+        for category, count in db.query(Metric.category, func.count(Metric.id)).group_by(Metric.category):
+            add("metric.category", category, count)
+        segment_rows = db.query(
+            Segment.category, func.count(Segment.id), func.sum(Segment.customer_count)
+        ).group_by(Segment.category)
+        for category, count, customers in segment_rows:
+            add("segment", "total", count)
+            add("segment", "customers", customers)
+            add("segment.category", category, count)
+            add("segment.category.customers", category, customers)
+
+        db.query(EntityCounter).delete()
+        if counters:
+            db.execute(
+                EntityCounter.__table__.insert(),
+                [{"scope": scope, "key": key, "value": value} for (scope, key), value in counters.items()]
+            )
+        db.commit()
+        invalidate("metrics", "segments")
+
+        return {
+            f"{scope}:{key}": {"before": previous.get((scope, key), 0), "after": counters.get((scope, key), 0)}
+            for scope, key in previous.keys() | counters.keys()
+            if previous.get((scope, key), 0) != counters.get((scope, key), 0)
+        }
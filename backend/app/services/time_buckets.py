@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+from sqlalchemy import DateTime, func, type_coerce
+
+# 시계열 버킷 단위 및 집계 함수
+BUCKETS = ("minute", "hour", "day", "week", "month")
+AGGREGATIONS = ("avg", "sum", "min", "max", "count", "last")
+
+# SQLite strftime 포맷 (+ modifier)
+# SQLAlchemy가 저장하는 DateTime 문자열 형식과 맞추기 위해 마이크로초까지 포함한다
+_BUCKET_FORMATS = {
+    "minute": ("%Y-%m-%d %H:%M:00.000000",),
+    "hour": ("%Y-%m-%d %H:00:00.000000",),
+    "day": ("%Y-%m-%d 00:00:00.000000",),
+    "week": ("%Y-%m-%d 00:00:00.000000", "-6 days", "weekday 1"),  # 월요일 시작
+    "month": ("%Y-%m-01 00:00:00.000000",),
+}
+
+
+def bucket_expression(column, bucket: str):
+    """timestamp 컬럼을 버킷 시작 시각으로 내림하는 SQL 표현식"""
+    fmt, *modifiers = _BUCKET_FORMATS[bucket]
+    return type_coerce(func.strftime(fmt, column, *modifiers), DateTime)
+
+
+def floor_timestamp(timestamp: datetime, bucket: str) -> datetime:
+    """Python datetime을 버킷 시작 시각으로 내림 (bucket_expression과 같은 경계)"""
+    if bucket == "minute":
+        return timestamp.replace(second=0, microsecond=0)
+    if bucket == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    if bucket == "day":
+        return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    if bucket == "week":
+        day = timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return timestamp.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Unsupported bucket: {bucket}")
+
+
+def shift_bucket(bucket_start: datetime, bucket: str, count: int = 1) -> datetime:
+    """버킷 시작 시각에서 count개 뒤(음수면 앞)의 버킷 시작 시각"""
+    if bucket == "week":
+        return bucket_start + timedelta(weeks=count)
+    if bucket == "month":
+        months = bucket_start.year * 12 + bucket_start.month - 1 + count
+        return bucket_start.replace(year=months // 12, month=months % 12 + 1)
+    return bucket_start + bucket_delta(bucket) * count
+
+
+def bucket_delta(bucket: str) -> timedelta:
+    """고정 길이 버킷의 길이 (minute / hour / day)"""
+    return {
+        "minute": timedelta(minutes=1),
+        "hour": timedelta(hours=1),
+        "day": timedelta(days=1),
+    }[bucket]
@@ -18,6 +18,9 @@ if [ ! -f "../database/datahub.db" ]; then
     sqlite3 ../database/datahub.db < ../database/init.sql
 fi
 
+# 1회성 관리 작업 (롤업 백필, 증분 VACUUM 전환). 이미 적용된 DB에서는 확인만 하고 끝난다
+python -m app.cli maintenance
+
 # FastAPI 서버 실행
 uvicorn app.main:app --reload --host 0.0.0.0 --port 8000
 
@@ -0,0 +1,148 @@
+import json
+import os
+import random
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import pytest
+
+# 앱 설정은 import 시점에 읽으므로 임시 DB/세그먼트 소스 경로를 먼저 지정한다
+_TMP_DIR = Path(tempfile.mkdtemp(prefix="datahub-tests-"))
+SEGMENT_SOURCE = _TMP_DIR / "segment_source.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP_DIR / 'datahub.db'}"
+os.environ["SEGMENT_SOURCE_PATH"] = str(SEGMENT_SOURCE)
+os.environ["SEGMENT_SOURCE_ATTACH"] = "{}"
+# 백그라운드 작업이 테스트의 압축/세그먼트 결과와 경합하지 않도록 스케줄러는 끄고 필요한 작업만 직접 실행한다
+os.environ["SCHEDULER_ENABLED"] = "false"
+
+source = sqlite3.connect(SEGMENT_SOURCE)
+source.execute("CREATE TABLE users (user_id TEXT, ltv REAL, grp INTEGER)")
+source.executemany("INSERT INTO users VALUES (?, ?, ?)", [(f"u{i}", i % 1000, i % 13) for i in range(20000)])
+source.commit()
+source.close()
+
+from fastapi.testclient import TestClient  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def create_metric(client):
+    """지표 생성 후 ID 반환 (create 스키마에 없는 필드는 update로 설정)"""
+
+    def create(name="metric", calculation_logic="x", **fields):
+        create_fields = {
+            key: fields.pop(key)
+            for key in ("status", "alert_settings", "higher_is_better", "description", "category")
+            if key in fields
+        }
+        response = client.post("/api/metrics/", json={
+            "name": name,
+            "description": "d",
+            "category": "c",
+            "metric_owner": "o",
+            "priority": "P1",
+            "calculation_logic": calculation_logic,
+            **create_fields,
+        })
+        assert response.status_code == 200, response.text
+        metric_id = response.json()["id"]
+        if fields:
+            assert client.put(f"/api/metrics/{metric_id}", json=fields).status_code == 200
+        return metric_id
+
+    return create
+
+
+@pytest.fixture
+def create_experiment(client):
+    """실험 생성 후 ID 반환 (지표 ID 목록과 variants는 JSON 문자열로 저장)"""
+
+    def create(primary=(), secondary=(), guardrail=(), variants=None, **fields):
+        response = client.post("/api/experiments/", json={
+            "name": "experiment",
+            "owner": "o",
+            "objective": "o",
+            "background": "b",
+            "hypothesis": "h",
+            "target_segment_id": 1,
+            "primary_metric_ids": json.dumps(list(primary)),
+            "secondary_metric_ids": json.dumps(list(secondary)),
+            "guardrail_metric_ids": json.dumps(list(guardrail)),
+            "variants": json.dumps(variants or [
+                {"name": "Control", "traffic_allocation": 50},
+                {"name": "Treatment", "traffic_allocation": 50},
+            ]),
+            **fields,
+        })
+        assert response.status_code == 200, response.text
+        return response.json()["id"]
+
+    return create
+
+
+@pytest.fixture
+def ingest(client):
+    """(metric_id, timestamp, value, visitor_count) 포인트 일괄 적재"""
+
+    def run(points):
+        body = [
+            {
+                "metric_id": metric_id,
+                "timestamp": timestamp.isoformat(),
+                "value": value,
+                **({"visitor_count": visitors} if visitors is not None else {}),
+            }
+            for metric_id, timestamp, value, visitors in points
+        ]
+        response = client.post("/api/metrics/datapoints:batch", json=body)
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    return run
+
+
+@pytest.fixture
+def create_segment(client):
+    """쿼리가 있는 세그먼트 생성 후 ID 반환 (임시 세그먼트 소스의 users 테이블 기준)"""
+
+    def create(query, **fields):
+        response = client.post("/api/segments/", json={"name": "segment", "query": query, **fields})
+        assert response.status_code == 200, response.text
+        return response.json()["id"]
+
+    return create
+
+
+@pytest.fixture
+def recent_day():
+    """보존 기간 안쪽의 기준 날짜 (days일 전 자정)"""
+
+    def day(days: int) -> datetime:
+        return (utcnow() - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    return day
+
+
+@pytest.fixture
+def minute_series(create_metric, ingest):
+    """7분 간격 1500개 포인트 (약 7일, 버킷 경계에 맞지 않는 구간 검증용)"""
+    metric_id = create_metric()
+    base = (utcnow() - timedelta(days=10)).replace(minute=0, second=0, microsecond=0)
+    rng = random.Random(1)
+    points = [
+        (metric_id, base + timedelta(minutes=7 * i), round(rng.uniform(0, 100), 3), rng.randint(1, 50))
+        for i in range(1500)
+    ]
+    ingest(points)
+    return metric_id, base, points
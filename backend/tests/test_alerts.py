@@ -0,0 +1,37 @@
+from datetime import timedelta
+from conftest import utcnow
+
+
+def test_alert_rules_fire_and_resolve_on_ingest(client, create_metric):
+    metric_id = create_metric(alert_settings="value > 150", status="활성화")
+    rules = client.get(f"/api/metrics/{metric_id}/alert-rules").json()
+    assert rules["errors"] == []
+    base = utcnow() - timedelta(hours=1)
+
+    fired = client.post(f"/api/metrics/{metric_id}/datapoints:batch", json=[
+        {"value": 100.0, "timestamp": base.isoformat()},
+        {"value": 200.0, "timestamp": (base + timedelta(seconds=1)).isoformat()},
+    ]).json()
+    assert fired["alerts"]["fired"] == 1
+    alerts = client.get("/api/metrics/alerts", params={"metric_id": metric_id}).json()["items"]
+    assert [alert["state"] for alert in alerts] == ["firing"]
+
+    resolved = client.post(f"/api/metrics/{metric_id}/datapoints:batch", json=[
+        {"value": 100.0, "timestamp": (base + timedelta(seconds=2)).isoformat()},
+    ]).json()
+    assert resolved["alerts"]["resolved"] == 1
+
+
+def test_pct_change_compares_against_the_previous_aggregation_period(client, create_metric, ingest, recent_day):
+    metric_id = create_metric(alert_settings="pct_change >= 50%", aggregation_period="일별", status="활성화")
+    day = recent_day(3)
+    ingest([(metric_id, day + timedelta(hours=1), 100.0, None), (metric_id, day + timedelta(hours=2), 100.0, None)])
+
+    # 전날 평균(100) 대비: 120은 +20%, 160은 +60% (직전 포인트 120 대비로는 +33%)
+    fired = ingest([(metric_id, day + timedelta(days=1, hours=1), 120.0, None), (metric_id, day + timedelta(days=1, hours=2), 160.0, None)])
+    assert fired["alerts"]["fired"] == 1
+    alert = client.get("/api/metrics/alerts", params={"metric_id": metric_id}).json()["items"][0]
+    assert alert["state"] == "firing" and alert["score"] == 60.0
+
+    resolved = ingest([(metric_id, day + timedelta(days=1, hours=3), 90.0, None)])
+    assert resolved["alerts"]["resolved"] == 1
@@ -0,0 +1,34 @@
+THREE_WAY = [
+    {"name": "Control", "traffic_allocation": 50},
+    {"name": "Treatment", "traffic_allocation": 50},
+    {"name": "Paused", "traffic_allocation": 0},
+]
+
+
+def test_assignment_is_deterministic_and_matches_batch(client, create_experiment, create_metric):
+    experiment_id = create_experiment(primary=[create_metric()], variants=THREE_WAY)
+    unit_ids = [f"user-{i}" for i in range(4000)]
+    batch = client.post(f"/api/experiments/{experiment_id}/assign:batch", json={"unit_ids": unit_ids}).json()
+    assert batch["variants"] == ["Control", "Treatment", "Paused"]
+    assert batch["counts"]["Paused"] == 0 and batch["unassigned"] == 0
+    assert abs(batch["counts"]["Control"] - 2000) < 200
+
+    for unit_id, variant in list(zip(unit_ids, batch["assignments"]))[:50]:
+        single = client.get(f"/api/experiments/{experiment_id}/assign", params={"unit_id": unit_id}).json()
+        assert single["variant"] == variant
+    again = client.post(f"/api/experiments/{experiment_id}/assign:batch", json={"unit_ids": unit_ids}).json()
+    assert again["assignments"] == batch["assignments"]
+
+    assert client.post(f"/api/experiments/{experiment_id}/assign:batch", json={"unit_ids": []}).status_code == 422
+    assert client.get("/api/experiments/999999/assign", params={"unit_id": "x"}).status_code == 404
+
+
+def test_partial_allocation_leaves_units_unassigned(client, create_experiment, create_metric):
+    experiment_id = create_experiment(primary=[create_metric()], variants=[
+        {"name": "Control", "traffic_allocation": 10}, {"name": "Treatment", "traffic_allocation": 10},
+    ])
+    batch = client.post(f"/api/experiments/{experiment_id}/assign:batch", json={
+        "unit_ids": [f"user-{i}" for i in range(5000)],
+    }).json()
+    assert abs(batch["unassigned"] - 4000) < 200
+    assert batch["assignments"].count(None) == batch["unassigned"]
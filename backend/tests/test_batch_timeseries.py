@@ -0,0 +1,13 @@
+def test_batch_timeseries_matches_single_requests(client, minute_series, create_metric):
+    metric_id, _, _ = minute_series
+    empty_id = create_metric()
+    for params in [{}, {"bucket": "day", "agg": "avg"}, {"bucket": "hour", "agg": "sum", "limit": 5}]:
+        body = client.post("/api/metrics/timeseries:batch", json={
+            "metric_ids": [metric_id, empty_id, 999999], **params,
+        }).json()
+        single = client.get(f"/api/metrics/{metric_id}/timeseries", params=params).json()
+        assert body["missing"] == [999999]
+        assert body["series"][str(metric_id)]["timestamps"] == [point["timestamp"] for point in single]
+        assert body["series"][str(metric_id)]["values"] == [point["value"] for point in single]
+        assert body["series"][str(empty_id)]["values"] == []
+    assert client.post("/api/metrics/timeseries:batch", json={"metric_ids": []}).status_code == 422
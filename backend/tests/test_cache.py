@@ -0,0 +1,17 @@
+def test_get_responses_are_cached_with_etags_and_invalidated_by_writes(client, create_metric):
+    metric_id = create_metric(name="cached")
+    path = f"/api/metrics/{metric_id}"
+    first = client.get(path)
+    assert first.headers["x-cache"] == "MISS"
+    second = client.get(path)
+    assert second.headers["x-cache"] == "HIT" and second.json() == first.json()
+    assert second.headers["etag"] == first.headers["etag"]
+
+    not_modified = client.get(path, headers={"If-None-Match": first.headers["etag"]})
+    assert not_modified.status_code == 304 and not_modified.content == b""
+
+    client.put(path, json={"name": "cached again"})
+    fresh = client.get(path, headers={"If-None-Match": first.headers["etag"]})
+    assert fresh.status_code == 200 and fresh.headers["x-cache"] == "MISS"
+    assert fresh.json()["name"] == "cached again" and fresh.headers["etag"] != first.headers["etag"]
+    assert client.get("/api/metrics/999999").headers.get("x-cache") is None
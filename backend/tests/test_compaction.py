@@ -0,0 +1,95 @@
+from datetime import timedelta
+from app.config import settings
+from app.services import compaction_service
+from conftest import utcnow
+
+
+def _day_series(client, metric_id, start):
+    return client.get(f"/api/metrics/{metric_id}/timeseries", params={
+        "bucket": "day", "agg": "avg", "start": start.isoformat(), "limit": 1000,
+    }).json()
+
+
+def test_compacted_days_are_served_from_day_rollups(client, create_metric, ingest):
+    # 보존 기간이 긴 주기로 적재한 뒤 7일 보존 주기로 바꿔 압축
+    metric_id = create_metric(aggregation_period="월별")
+    start = (utcnow() - timedelta(days=40)).replace(hour=0, minute=0, second=0, microsecond=0)
+    ingest([
+        (metric_id, start + timedelta(days=day, hours=hour), float(day + hour), 10 + hour)
+        for day in range(40) for hour in (1, 9, 17)
+    ])
+    before_days = _day_series(client, metric_id, start)
+    before_raw = client.get(f"/api/metrics/{metric_id}/timeseries", params={"start": start.isoformat(), "limit": 1000}).json()
+    assert len(before_days) == 40 and len(before_raw) == 120
+
+    client.put(f"/api/metrics/{metric_id}", json={"aggregation_period": "실시간"})
+    report = client.post("/api/admin/compaction").json()
+    assert report["deleted_points"] >= 3 * 30
+
+    # 압축된 날은 일별 롤업 한 행(그날 평균, 방문자 합)으로 읽힌다
+    assert _day_series(client, metric_id, start) == before_days
+    raw = client.get(f"/api/metrics/{metric_id}/timeseries", params={"start": start.isoformat(), "limit": 1000}).json()
+    assert len(raw) < len(before_raw)
+    assert {point["timestamp"][:10] for point in raw} == {point["timestamp"][:10] for point in before_raw}
+    assert sum(point["visitor_count"] for point in raw) == sum(point["visitor_count"] for point in before_raw)
+    first = raw[0]
+    assert first["timestamp"] == start.isoformat() and first["value"] == before_days[0]["value"]
+
+    exported = client.get(f"/api/metrics/{metric_id}/export", params={"format": "csv"}).text.strip().splitlines()
+    assert len(exported) - 1 == len(raw)
+
+    minutes = client.get(f"/api/metrics/{metric_id}/timeseries", params={
+        "bucket": "minute", "agg": "sum", "start": start.isoformat(), "limit": 1000,
+    }).json()
+    assert len(minutes) == len(raw)
+
+
+def test_late_points_before_the_boundary_are_rejected_per_line(client, create_metric, ingest):
+    metric_id = create_metric(aggregation_period="월별")
+    recent = utcnow() - timedelta(hours=1)
+    old_day = (utcnow() - timedelta(days=20)).replace(hour=0, minute=0, second=0, microsecond=0)
+    ingest([(metric_id, old_day + timedelta(hours=1), 4.0, 2), (metric_id, recent, 1.0, None)])
+    client.put(f"/api/metrics/{metric_id}", json={"aggregation_period": "실시간"})
+    client.post("/api/admin/compaction")
+    day_params = {
+        "bucket": "day", "agg": "sum", "start": old_day.isoformat(), "end": (old_day + timedelta(days=1)).isoformat(),
+    }
+    before = client.get(f"/api/metrics/{metric_id}/timeseries", params=day_params).json()
+    assert before == [{"timestamp": old_day.isoformat(), "value": 4.0, "visitor_count": 2}]
+
+    # 압축된 날의 포인트는 기록하지 않으므로 재시도해도 일별 롤업이 두 번 더해지지 않는다
+    late = [(metric_id, old_day + timedelta(hours=3), 10.0, 5), (metric_id, recent + timedelta(minutes=1), 2.0, None)]
+    for _ in range(2):
+        result = ingest(late)
+        assert result["written"] == 1
+        assert [(error["line"], error["metric_id"]) for error in result["rejected"]] == [(1, metric_id)]
+        assert "retention boundary" in result["rejected"][0]["error"]
+    assert client.get(f"/api/metrics/{metric_id}/timeseries", params=day_params).json() == before
+
+
+def test_compaction_refreshes_and_deletes_one_batch_window_at_a_time(client, monkeypatch, create_metric, ingest):
+    metric_id = create_metric(aggregation_period="월별")
+    start = (utcnow() - timedelta(days=30)).replace(hour=0, minute=0, second=0, microsecond=0)
+    ingest([(metric_id, start + timedelta(days=day, hours=hour), float(hour), 1) for day in range(12) for hour in (2, 8, 14)])
+    before = _day_series(client, metric_id, start)
+    client.put(f"/api/metrics/{metric_id}", json={"aggregation_period": "실시간"})
+
+    windows = []
+    original = compaction_service.RollupService.refresh_range
+    monkeypatch.setattr(compaction_service.RollupService, "refresh_range", lambda db, target_id, low, high, **kwargs: (
+        target_id == metric_id and windows.append((low, high)), original(db, target_id, low, high, **kwargs)
+    ))
+    monkeypatch.setattr(settings, "compaction_batch_size", 7)
+    client.post("/api/admin/compaction")
+
+    # 7행 배치는 3일치(9행)까지 덮으므로 12일이 4개 구간으로 나뉜다
+    assert [(low, high + timedelta(microseconds=1)) for low, high in windows] == [
+        (start + timedelta(days=day), start + timedelta(days=day + 3)) for day in range(0, 12, 3)
+    ]
+    assert _day_series(client, metric_id, start) == before
+
+
+def test_compaction_report_after_a_manual_run(client):
+    report = client.post("/api/admin/compaction").json()
+    assert {"deleted_points", "deleted_rollups", "vacuum", "reclaimed_bytes"} <= set(report)
+    assert client.get("/api/admin/compaction").json()["last_report"] == report
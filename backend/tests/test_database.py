@@ -0,0 +1,107 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+INIT_SQL = BACKEND_DIR.parent / "database" / "init.sql"
+
+# 새 프로세스에서 앱을 띄워 지표 생성 → 적재 → 조회까지 실행 (엔진 설정은 import 시점에 정해진다)
+ROUND_TRIP = """
+import json
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app import database
+from app.main import app
+
+with TestClient(app) as client:
+    metric = client.post("/api/metrics/", json={
+        "name": "m", "description": "d", "category": "c", "metric_owner": "o", "priority": "P1", "calculation_logic": "x",
+    }).json()
+    client.post(f"/api/metrics/{metric['id']}/datapoints:batch", json=[
+        {"value": 1.0, "timestamp": "2030-01-01T00:00:00"}, {"value": 3.0, "timestamp": "2030-01-01T01:00:00"},
+    ])
+    series = client.get(f"/api/metrics/{metric['id']}/timeseries", params={"bucket": "day", "agg": "sum"}).json()
+    listed = client.get("/api/metrics/").json()
+    with database.engine.connect() as connection:
+        journal_mode = connection.exec_driver_sql("PRAGMA journal_mode").scalar()
+    read_session = database.ReadSessionLocal()
+    try:
+        read_session.execute(text("CREATE TABLE probe (a)"))
+        read_only = False
+    except Exception:
+        read_only = True
+    finally:
+        read_session.close()
+    print(json.dumps({
+        "series": series,
+        "total": listed["total"],
+        "async_engine": database.async_engine is not None,
+        "read_engine": database.read_engine is not None,
+        "journal_mode": journal_mode,
+        "read_only": read_only,
+    }))
+"""
+
+
+def run_app(path, **environment):
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{path}", **environment}
+    result = subprocess.run(
+        [sys.executable, "-c", ROUND_TRIP], cwd=BACKEND_DIR, env=env, check=True, capture_output=True, text=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_async_mode_serves_the_same_api(tmp_path):
+    synchronous = run_app(tmp_path / "sync.db")
+    asynchronous = run_app(tmp_path / "async.db", DATABASE_MODE="async")
+    assert synchronous["async_engine"] is False and asynchronous["async_engine"] is True
+    assert asynchronous["series"] == synchronous["series"] == [
+        {"timestamp": "2030-01-01T00:00:00", "value": 4.0, "visitor_count": None},
+    ]
+    assert asynchronous["total"] == synchronous["total"] == 1
+
+
+def test_production_profile_uses_wal_and_a_read_only_engine(tmp_path):
+    default = run_app(tmp_path / "default.db")
+    production = run_app(tmp_path / "production.db", DATABASE_PROFILE="production")
+    assert default["journal_mode"] == "delete" and default["read_engine"] is False and default["read_only"] is False
+    assert production["journal_mode"] == "wal" and production["read_engine"] is True and production["read_only"] is True
+    assert production["series"] == default["series"]
+
+
+def test_one_time_backfill_and_vacuum_run_only_from_the_maintenance_command(tmp_path):
+    path = tmp_path / "init.db"
+    connection = sqlite3.connect(path)
+    connection.executescript(INIT_SQL.read_text(encoding="utf-8"))
+    connection.execute("PRAGMA auto_vacuum = NONE")
+    connection.execute("VACUUM")
+    connection.close()
+
+    def state():
+        with sqlite3.connect(path) as connection:
+            return (
+                connection.execute("PRAGMA auto_vacuum").fetchone()[0],
+                connection.execute("SELECT count(*) FROM metric_rollups WHERE granularity = 'day' AND sketch IS NOT NULL").fetchone()[0],
+            )
+
+    # 앱 시작은 전체 VACUUM과 롤업 백필을 하지 않고 경고만 남긴다
+    environment = {**os.environ, "DATABASE_URL": f"sqlite:///{path}", "ROLLUP_REBUILD_BATCH_SIZE": "10"}
+    started = subprocess.run(
+        [sys.executable, "-c", "import app.main"], cwd=BACKEND_DIR, env=environment, check=True, capture_output=True, text=True
+    )
+    assert "app.cli maintenance" in started.stderr
+    assert state() == (0, 0)
+
+    command = [sys.executable, "-m", "app.cli", "maintenance"]
+    subprocess.run(command, cwd=BACKEND_DIR, env=environment, check=True, capture_output=True)
+    vacuum_mode, day_rollups = state()
+    with sqlite3.connect(path) as connection:
+        days = connection.execute("SELECT count(DISTINCT metric_id || date(timestamp)) FROM metric_data_points").fetchone()[0]
+    assert vacuum_mode == 2 and day_rollups == days > 0
+
+    # 이미 적용된 DB에서는 아무 작업도 하지 않는다
+    subprocess.run(command, cwd=BACKEND_DIR, env=environment, check=True, capture_output=True)
+    assert state() == (2, days)
@@ -0,0 +1,90 @@
+from datetime import timedelta
+import pytest
+
+
+@pytest.fixture
+def base_metrics(create_metric, ingest, recent_day):
+    """일별 값이 있는 입력 지표 2개 (분모 지표는 2일차 데이터 없음)"""
+    day = recent_day(5)
+    numerator, denominator = create_metric(name="orders"), create_metric(name="visits")
+    ingest([(numerator, day + timedelta(days=i, hours=h), 10.0 * (i + 1), None) for i in range(4) for h in (1, 2)])
+    ingest([(denominator, day + timedelta(days=i, hours=1), 200.0, None) for i in range(4) if i != 2])
+    return numerator, denominator, day
+
+
+def test_derived_series_applies_the_expression_per_bucket(client, create_metric, base_metrics):
+    numerator, denominator, day = base_metrics
+    ratio = create_metric(calculation_logic=f"metric[{numerator}] / metric[{denominator}] * 100")
+    params = {"bucket": "day", "agg": "avg", "start": day.isoformat(), "end": (day + timedelta(days=4)).isoformat()}
+    body = client.get(f"/api/metrics/{ratio}/derived", params=params).json()
+    assert body["inputs"] == [numerator, denominator]
+    assert body["timestamps"] == [(day + timedelta(days=i)).isoformat() for i in range(4)]
+    assert body["values"] == [5.0, 10.0, None, 20.0]
+
+    # 파생 지표를 참조하는 파생 지표와 입력 변경 후 재계산
+    doubled = create_metric(calculation_logic=f"metric[{ratio}] * 2")
+    assert client.get(f"/api/metrics/{doubled}/derived", params=params).json()["values"] == [10.0, 20.0, None, 40.0]
+    client.post(f"/api/metrics/{denominator}/datapoints:batch", json=[
+        {"value": 100.0, "timestamp": (day + timedelta(days=1, hours=1)).isoformat()},
+    ])
+    again = client.get(f"/api/metrics/{ratio}/derived", params=params).json()
+    assert again["values"] == [5.0, 20.0, None, 20.0] and again["memo"] == "partial"
+
+
+@pytest.mark.parametrize("logic, message", [
+    ("metric[1] +", "Invalid metric expression"),
+    ("__import__('os').system('true') + metric[1]", "Unsupported expression element"),
+    ("metric[0] * 2", "positive integer"),
+    ("metric[999999] * 2", "unknown metrics"),
+    ("metric[1] / 0 + '1'", None),
+])
+def test_invalid_expressions_are_rejected(client, create_metric, logic, message):
+    metric_id = create_metric()
+    response = client.put(f"/api/metrics/{metric_id}", json={"calculation_logic": logic.replace("metric[1]", f"metric[{metric_id - 1}]")})
+    assert response.status_code == 400
+    if message:
+        assert message in response.json()["detail"]
+
+
+def test_circular_references_are_rejected(client, create_metric, base_metrics):
+    numerator, _, _ = base_metrics
+    first = create_metric(calculation_logic=f"metric[{numerator}] + 1")
+    second = create_metric(calculation_logic=f"metric[{first}] + 1")
+    response = client.put(f"/api/metrics/{first}", json={"calculation_logic": f"metric[{second}] + 1"})
+    assert response.status_code == 400 and "Circular" in response.json()["detail"]
+    assert client.put(f"/api/metrics/{first}", json={"calculation_logic": f"metric[{first}] * 2"}).status_code == 400
+
+
+def test_huge_constants_do_not_fail_the_request(client, create_metric, base_metrics):
+    numerator, _, day = base_metrics
+    metric_id = create_metric()
+    response = client.put(f"/api/metrics/{metric_id}", json={"calculation_logic": f"9**9**9 * metric[{numerator}]"})
+    assert response.status_code == 200
+    series = client.get(f"/api/metrics/{metric_id}/derived", params={"start": day.isoformat()})
+    assert series.status_code == 200
+    assert len(series.json()["values"]) == 4 and all(value is None for value in series.json()["values"])
+    too_large = client.put(f"/api/metrics/{metric_id}", json={"calculation_logic": f"{'9' * 400} * metric[{numerator}]"})
+    assert too_large.status_code == 400
+
+
+def test_derived_errors(client, create_metric):
+    plain = create_metric(calculation_logic="sum(revenue) / count(orders)")
+    assert client.get(f"/api/metrics/{plain}/derived").status_code == 400
+    assert client.get("/api/metrics/999999/derived").status_code == 404
+    metric_id = create_metric()
+    derived = create_metric(calculation_logic=f"metric[{metric_id}] * 2")
+    assert client.get(f"/api/metrics/{derived}/derived", params={"bucket": "year"}).status_code == 422
+
+
+def test_inputs_of_derived_metrics_cannot_be_deleted(client, create_metric, base_metrics):
+    numerator, denominator, day = base_metrics
+    ratio = create_metric(calculation_logic=f"metric[{numerator}] / metric[{denominator}]")
+    response = client.delete(f"/api/metrics/{denominator}")
+    assert response.status_code == 400 and str(ratio) in response.json()["detail"]
+    assert client.get(f"/api/metrics/{denominator}").status_code == 200
+
+    # 파생 지표의 식에서 빼면 삭제할 수 있고, 파생 시계열은 남은 입력으로 계산된다
+    client.put(f"/api/metrics/{ratio}", json={"calculation_logic": f"metric[{numerator}] * 2"})
+    assert client.delete(f"/api/metrics/{denominator}").status_code == 200
+    series = client.get(f"/api/metrics/{ratio}/derived", params={"bucket": "day", "start": day.isoformat()}).json()
+    assert series["inputs"] == [numerator] and series["values"][0] == 20.0
@@ -0,0 +1,54 @@
+import math
+from datetime import timedelta
+import pytest
+
+THREE_WAY = [
+    {"name": "Control", "traffic_allocation": 50},
+    {"name": "Treatment", "traffic_allocation": 50},
+    {"name": "Paused", "traffic_allocation": 0},
+]
+
+
+@pytest.fixture
+def percent_metric(create_metric, ingest, recent_day):
+    """최근 14일간 4.1%인 전환율 지표 (일 방문자 1000명)"""
+    metric_id = create_metric(name="conversion", unit="%")
+    ingest([(metric_id, recent_day(days) + timedelta(hours=12), 4.1, 1000) for days in range(1, 15)])
+    return metric_id
+
+
+def test_design_sizes_percent_metrics_as_proportions(client, create_experiment, percent_metric):
+    experiment_id = create_experiment(primary=[percent_metric], variants=THREE_WAY)
+    design = client.get(f"/api/experiments/{experiment_id}/design", params={"mde": 0.05}).json()
+    assert design["baseline"]["is_proportion"] is True and design["baseline"]["variance"] == "bernoulli"
+    assert design["baseline"]["std"] == pytest.approx(100 * math.sqrt(0.041 * 0.959))
+    assert design["baseline"]["daily_visitors"] == pytest.approx(1000)
+
+    rate, delta = 0.041, 0.041 * 0.05
+    expected = 2 * 2 * (1.959964 + 0.841621) ** 2 * rate * (1 - rate) / delta ** 2
+    assert design["sample_size"]["total"] == pytest.approx(expected, rel=0.01)
+    assert design["sample_size"]["per_variant"]["Paused"] == 0
+    assert design["sample_size"]["estimated_days"] == math.ceil(design["sample_size"]["total"] / 1000)
+    assert design["allocation"]["Paused"] == 0
+
+
+def test_design_requires_an_explicit_variance_for_non_proportion_metrics(client, create_metric, create_experiment, ingest, recent_day):
+    metric_id = create_metric(name="revenue per day")
+    ingest([(metric_id, recent_day(days) + timedelta(hours=1), 1000.0 + 10 * days, 50) for days in range(1, 15)])
+    experiment_id = create_experiment(primary=[metric_id])
+    path = f"/api/experiments/{experiment_id}/design"
+
+    refused = client.get(path)
+    assert refused.status_code == 400 and "aggregate_variance" in refused.json()["detail"]
+    aggregate = client.get(path, params={"aggregate_variance": True}).json()
+    assert aggregate["baseline"]["variance"] == "aggregate" and aggregate["sample_size"]["total"] > 0
+    given = client.get(path, params={"baseline_std": 400}).json()
+    assert given["baseline"]["variance"] == "given" and given["baseline"]["std"] == 400
+    assert client.get("/api/experiments/999999/design").status_code == 404
+
+
+def test_design_rejects_a_control_without_traffic(client, create_experiment, percent_metric):
+    experiment_id = create_experiment(primary=[percent_metric], variants=[
+        {"name": "Control", "traffic_allocation": 0}, {"name": "Treatment", "traffic_allocation": 100},
+    ])
+    assert client.get(f"/api/experiments/{experiment_id}/design").status_code == 400
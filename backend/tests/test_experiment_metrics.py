@@ -0,0 +1,46 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+INIT_SQL = BACKEND_DIR.parent / "database" / "init.sql"
+
+
+def test_metric_experiment_links_follow_experiment_writes(client, create_metric, create_experiment):
+    metric_id = create_metric()
+    primary = create_experiment(primary=[metric_id], status="running")
+    guarded = create_experiment(primary=[create_metric()], guardrail=[metric_id])
+
+    links = client.get(f"/api/metrics/{metric_id}/experiments").json()["items"]
+    assert {(link["experiment"]["id"], link["role"]) for link in links} == {(primary, "primary"), (guarded, "guardrail")}
+    only_guardrail = client.get(f"/api/metrics/{metric_id}/experiments", params={"role": "guardrail"}).json()["items"]
+    assert [link["experiment"]["id"] for link in only_guardrail] == [guarded]
+    running = client.get(f"/api/metrics/{metric_id}/experiments", params={"status": "running"}).json()["items"]
+    assert [link["experiment"]["id"] for link in running] == [primary]
+    listed = client.get("/api/experiments/", params={"metric_id": metric_id, "role": "primary"}).json()["items"]
+    assert [item["id"] for item in listed] == [primary]
+
+    client.put(f"/api/experiments/{guarded}", json={"guardrail_metric_ids": json.dumps([])})
+    client.delete(f"/api/experiments/{primary}")
+    assert client.get(f"/api/metrics/{metric_id}/experiments").json()["items"] == []
+    assert client.get("/api/metrics/999999/experiments").status_code == 404
+
+
+def test_init_sql_database_starts_without_backfilling_old_experiment_rows(tmp_path):
+    # init.sql로 만든 DB의 experiments 테이블은 예전 스키마(background 컬럼 없음)라 연결 테이블 백필을 건너뛴다
+    path = tmp_path / "init.db"
+    connection = sqlite3.connect(path)
+    connection.executescript(INIT_SQL.read_text(encoding="utf-8"))
+    connection.close()
+
+    environment = {**os.environ, "DATABASE_URL": f"sqlite:///{path}"}
+    subprocess.run(
+        [sys.executable, "-c", "import app.main"], cwd=BACKEND_DIR, env=environment, check=True, capture_output=True
+    )
+    connection = sqlite3.connect(path)
+    assert connection.execute("SELECT count(*) FROM experiment_metrics").fetchone()[0] == 0
+    assert connection.execute("SELECT count(*) FROM experiments").fetchone()[0] > 0
+    connection.close()
@@ -0,0 +1,110 @@
+import math
+import numpy as np
+import pytest
+
+
+def _observe(client, experiment_id, metric_id, samples):
+    body = [
+        {"variant": variant, "metric_id": metric_id, "value": float(value), "unit_id": f"{variant}-{i}"}
+        for variant, values in samples.items() for i, value in enumerate(values)
+    ]
+    response = client.post(f"/api/experiments/{experiment_id}/observations:batch", json=body)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _treatment(results, metric_id):
+    metric = next(metric for metric in results["metrics"] if metric["metric_id"] == metric_id)
+    return metric, metric["variants"][1]
+
+
+def test_results_match_welch_and_proportion_tests(client, create_metric, create_experiment):
+    revenue, converted = create_metric(name="revenue"), create_metric(name="converted")
+    experiment_id = create_experiment(primary=[revenue], secondary=[converted])
+    rng = np.random.default_rng(7)
+    control, treatment = rng.normal(10, 2, 800), rng.normal(10.2, 3, 600)
+    assert _observe(client, experiment_id, revenue, {"Control": control, "Treatment": treatment})["written"] == 1400
+    _observe(client, experiment_id, converted, {"Control": [1] * 100 + [0] * 900, "Treatment": [1] * 150 + [0] * 850})
+
+    results = client.get(f"/api/experiments/{experiment_id}/results").json()
+    assert results["control"] == "Control" and results["variants"] == ["Control", "Treatment"]
+
+    metric, row = _treatment(results, revenue)
+    assert metric["test"] == "welch_t" and metric["role"] == "primary"
+    assert metric["variants"][0]["n"] == 800 and row["n"] == 600
+    assert row["mean"] == pytest.approx(treatment.mean())
+    assert row["std"] == pytest.approx(treatment.std(ddof=1))
+    assert row["diff"] == pytest.approx(treatment.mean() - control.mean())
+    standard_error = math.sqrt(control.var(ddof=1) / 800 + treatment.var(ddof=1) / 600)
+    assert (row["ci_high"] - row["ci_low"]) / 2 == pytest.approx(1.96 * standard_error, rel=0.01)
+    # 자유도가 1000 안팎이면 t 분포 꼬리는 정규 분포와 거의 같다
+    assert row["p_value"] == pytest.approx(math.erfc(abs(row["diff"]) / standard_error / math.sqrt(2)), rel=0.1)
+    assert row["significant"] == (row["p_value"] < 0.05)
+
+    metric, row = _treatment(results, converted)
+    assert metric["test"] == "proportion_z"
+    pooled = 250 / 2000
+    z = 0.05 / math.sqrt(pooled * (1 - pooled) * (1 / 1000 + 1 / 1000))
+    assert row["diff"] == pytest.approx(0.05) and row["lift"] == pytest.approx(0.5)
+    assert row["p_value"] == pytest.approx(math.erfc(z / math.sqrt(2)), rel=0.01)
+
+
+def test_guardrail_breaches_only_in_the_harmful_direction(client, create_metric, create_experiment):
+    latency = create_metric(name="latency", higher_is_better=False)
+    sessions = create_metric(name="sessions")
+    revenue = create_metric(name="revenue")
+    experiment_id = create_experiment(primary=[revenue], guardrail=[latency, sessions])
+    control = np.linspace(90, 110, 500)
+    # 두 가드레일 모두 실험군에서 크게 증가: 지연시간은 악화, 세션 수는 개선
+    for metric_id in (latency, sessions, revenue):
+        _observe(client, experiment_id, metric_id, {"Control": control, "Treatment": control + 20})
+
+    results = client.get(f"/api/experiments/{experiment_id}/results").json()
+    assert results["guardrail_breaches"] == [{"metric_id": latency, "variant": "Treatment"}]
+    assert _treatment(results, latency)[0]["guardrail_breached"] is True
+    assert _treatment(results, sessions)[0]["guardrail_breached"] is False
+    reasons = {(reason["metric_id"], reason["role"]) for reason in results["early_stop"]["reasons"]}
+    assert (latency, "guardrail") in reasons and (sessions, "guardrail") not in reasons
+
+
+def test_observation_ingest_rejects_unknown_metrics_and_variants(client, create_metric, create_experiment):
+    metric_id = create_metric()
+    experiment_id = create_experiment(primary=[metric_id])
+    unlinked = create_metric()
+    assert client.post(f"/api/experiments/{experiment_id}/observations:batch", json=[
+        {"variant": "Control", "metric_id": unlinked, "value": 1},
+    ]).status_code == 400
+    assert client.post(f"/api/experiments/{experiment_id}/observations:batch", json=[
+        {"variant": "Control", "metric_id": metric_id, "value": 1},
+        {"variant": "Nope", "metric_id": metric_id, "value": 1},
+    ]).status_code == 400
+    # 실패한 요청은 한 행도 남기지 않는다
+    assert client.get(f"/api/experiments/{experiment_id}/results").json()["metrics"][0]["variants"][0]["n"] == 0
+    assert client.post("/api/experiments/999999/observations:batch", json=[
+        {"variant": "Control", "metric_id": metric_id, "value": 1},
+    ]).status_code == 404
+    assert client.get("/api/experiments/999999/results").status_code == 404
+
+
+def test_accumulators_merge_batches_and_drive_sequential_stops(client, create_metric, create_experiment):
+    metric_id, flat = create_metric(name="orders"), create_metric(name="flat")
+    experiment_id = create_experiment(primary=[metric_id, flat])
+    rng = np.random.default_rng(3)
+    control, treatment = rng.normal(50, 5, 3000), rng.normal(53, 5, 3000)
+    # 여러 배치로 나눠 적재해도 한 번에 계산한 통계량과 같아야 한다
+    for chunk in range(3):
+        window = slice(chunk * 1000, (chunk + 1) * 1000)
+        _observe(client, experiment_id, metric_id, {"Control": control[window], "Treatment": treatment[window]})
+    _observe(client, experiment_id, flat, {"Control": np.full(200, 7.0) + np.arange(200) % 3, "Treatment": np.full(200, 7.0) + np.arange(200) % 3})
+
+    results = client.get(f"/api/experiments/{experiment_id}/results").json()
+    metric, row = _treatment(results, metric_id)
+    assert metric["variants"][0]["n"] == 3000 and row["n"] == 3000
+    assert metric["variants"][0]["mean"] == pytest.approx(control.mean())
+    assert metric["variants"][0]["std"] == pytest.approx(control.std(ddof=1))
+    assert row["std"] == pytest.approx(treatment.std(ddof=1))
+
+    assert row["sequential"]["boundary_crossed"] is True
+    assert row["sequential"]["cs_low"] <= row["diff"] <= row["sequential"]["cs_high"]
+    assert _treatment(results, flat)[1]["sequential"]["boundary_crossed"] is False
+    assert results["early_stop"] == {"recommended": True, "reasons": [{"metric_id": metric_id, "variant": "Treatment", "role": "primary"}]}
@@ -0,0 +1,59 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+import pytest
+from conftest import utcnow
+
+
+@pytest.fixture
+def exported_metrics(create_metric, ingest):
+    base = utcnow().replace(microsecond=0) - timedelta(hours=3)
+    first, second = create_metric(), create_metric()
+    ingest([(first, base + timedelta(minutes=i), i * 1.5, i) for i in range(5)])
+    ingest([(second, base + timedelta(minutes=i), -i, None) for i in range(3)])
+    return first, second, base
+
+
+def test_csv_export_streams_every_point(client, exported_metrics):
+    first, _, base = exported_metrics
+    response = client.get(f"/api/metrics/{first}/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert f'metric_{first}.csv' in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [datetime.fromisoformat(row["timestamp"]) for row in rows] == [base + timedelta(minutes=i) for i in range(5)]
+    assert [float(row["value"]) for row in rows] == [i * 1.5 for i in range(5)]
+    assert rows[0]["metric_id"] == str(first) and rows[2]["visitor_count"] == "2"
+
+    ranged = client.get(f"/api/metrics/{first}/export", params={
+        "start": (base + timedelta(minutes=1)).isoformat(), "end": (base + timedelta(minutes=3)).isoformat(),
+    })
+    assert len(ranged.text.strip().splitlines()) == 1 + 2
+
+
+def test_ndjson_export_of_several_metrics(client, exported_metrics):
+    first, second, _ = exported_metrics
+    response = client.get("/api/metrics/export", params=[
+        ("metric_ids", second), ("metric_ids", first), ("format", "ndjson"),
+    ])
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["metric_id"] for row in rows] == [first] * 5 + [second] * 3
+    assert rows[-1] == {**rows[-1], "value": -2.0, "visitor_count": None}
+
+
+def test_arrow_export_round_trips(client, exported_metrics):
+    ipc = pytest.importorskip("pyarrow.ipc")
+    first, second, _ = exported_metrics
+    response = client.get("/api/metrics/export", params=[("metric_ids", first), ("metric_ids", second), ("format", "arrow")])
+    table = ipc.open_stream(response.content).read_all()
+    assert table.column_names == ["metric_id", "timestamp", "value", "visitor_count"]
+    assert table.num_rows == 8 and table.column("value").to_pylist()[:2] == [0.0, 1.5]
+
+
+def test_export_errors(client, exported_metrics):
+    first, _, _ = exported_metrics
+    assert client.get("/api/metrics/999999/export").status_code == 404
+    assert client.get("/api/metrics/export", params=[("metric_ids", first), ("metric_ids", 999999)]).status_code == 404
+    assert client.get(f"/api/metrics/{first}/export", params={"format": "xlsx"}).status_code == 422
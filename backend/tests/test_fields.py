@@ -0,0 +1,23 @@
+import pytest
+
+
+@pytest.mark.parametrize("path", ["/api/metrics/", "/api/segments/", "/api/experiments/"])
+def test_list_fields_selects_response_columns(client, create_metric, create_experiment, path):
+    create_experiment(primary=[create_metric()])
+    client.post("/api/segments/", json={"name": "fields"})
+    body = client.get(path, params={"fields": "id,name", "limit": 5}).json()
+    assert body["items"] and all(set(item) == {"id", "name"} for item in body["items"])
+    full = client.get(path, params={"fields": "all", "limit": 1}).json()["items"][0]
+    assert {"id", "name", "description", "created_at"} <= set(full)
+    response = client.get(path, params={"fields": "id,no_such_field"})
+    assert response.status_code == 400
+
+
+def test_detail_fields_selects_response_columns(client, create_metric):
+    metric_id = create_metric(calculation_logic="sum(x)")
+    assert client.get(f"/api/metrics/{metric_id}", params={"fields": "id,calculation_logic"}).json() == {
+        "id": metric_id, "calculation_logic": "sum(x)",
+    }
+    summary = client.get("/api/metrics/", params={"limit": 1}).json()["items"][0]
+    assert "calculation_logic" not in summary and "higher_is_better" in summary
+    assert client.get(f"/api/metrics/{metric_id}", params={"fields": "bogus"}).status_code == 400
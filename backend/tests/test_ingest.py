@@ -0,0 +1,44 @@
+import json
+from datetime import timedelta
+from conftest import utcnow
+
+
+def test_batch_ingest_json_and_ndjson_is_idempotent(client, create_metric):
+    metric_id = create_metric()
+    base = utcnow().replace(microsecond=0) - timedelta(hours=2)
+    rows = [{"metric_id": metric_id, "value": i, "timestamp": (base + timedelta(minutes=i)).isoformat()} for i in range(20)]
+
+    response = client.post("/api/metrics/datapoints:batch", json=rows)
+    assert response.status_code == 200
+    assert response.json()["written"] == 20
+    assert response.json()["metrics"] == 1
+
+    body = "\n".join(json.dumps(row) for row in rows)
+    again = client.post(
+        "/api/metrics/datapoints:batch", content=body, headers={"content-type": "application/x-ndjson"}
+    )
+    assert again.status_code == 200
+    points = client.get(f"/api/metrics/{metric_id}/timeseries", params={"limit": 100}).json()
+    assert [point["value"] for point in points] == list(range(20))
+
+
+def test_single_metric_ingest_normalizes_timezones(client, create_metric):
+    metric_id = create_metric()
+    day = (utcnow() - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    response = client.post(f"/api/metrics/{metric_id}/datapoints:batch", json=[
+        {"value": 1.5, "timestamp": day.isoformat() + "Z", "visitor_count": 3},
+        {"value": 2.0, "timestamp": (day + timedelta(hours=10)).isoformat() + "+09:00"},
+    ])
+    assert response.json()["written"] == 2
+    points = client.get(f"/api/metrics/{metric_id}/timeseries").json()
+    assert [point["timestamp"] for point in points] == [day.isoformat(), (day + timedelta(hours=1)).isoformat()]
+    assert points[0]["visitor_count"] == 3
+
+
+def test_ingest_rejects_unknown_metrics_and_bad_payloads(client, create_metric):
+    timestamp = utcnow().isoformat()
+    missing = client.post("/api/metrics/datapoints:batch", json=[{"metric_id": 999999, "value": 1, "timestamp": timestamp}])
+    assert missing.status_code == 404
+    invalid = client.post("/api/metrics/datapoints:batch", json=[{"metric_id": create_metric(), "value": "x", "timestamp": timestamp}])
+    assert invalid.status_code == 422
+    assert client.post("/api/metrics/datapoints:batch", json={"a": 1}).status_code == 400
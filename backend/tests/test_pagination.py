@@ -0,0 +1,19 @@
+def test_list_keyset_pagination_walks_every_row_once(client, create_metric):
+    created = {create_metric(name=f"page {i}", category="pagination") for i in range(7)}
+    seen, cursor = [], None
+    while True:
+        params = {"category": "pagination", "limit": 3, "include_total": False}
+        if cursor:
+            params["cursor"] = cursor
+        body = client.get("/api/metrics/", params=params).json()
+        assert body["total"] is None
+        seen += [item["id"] for item in body["items"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted(created) and len(seen) == len(set(seen))
+
+    first = client.get("/api/metrics/", params={"category": "pagination", "limit": 3}).json()
+    assert first["total"] == 7
+    for path in ["/api/metrics/", "/api/segments/", "/api/experiments/"]:
+        assert client.get(path, params={"cursor": "not-a-cursor"}).status_code == 400
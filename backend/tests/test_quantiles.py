@@ -0,0 +1,21 @@
+from datetime import timedelta
+import numpy as np
+import pytest
+from conftest import utcnow
+
+
+def test_quantiles_merge_bucket_sketches(client, create_metric, ingest):
+    metric_id = create_metric()
+    base = (utcnow() - timedelta(days=3)).replace(minute=0, second=0, microsecond=0)
+    rng = np.random.default_rng(1)
+    values = rng.lognormal(3, 1, 5000)
+    ingest([(metric_id, base + timedelta(seconds=40 * i), float(value), None) for i, value in enumerate(values)])
+
+    result = client.get(f"/api/metrics/{metric_id}/quantiles", params={
+        "q": "0.5,0.99", "start": base.isoformat(), "end": utcnow().isoformat(),
+    }).json()
+    assert result["count"] == 5000
+    assert result["quantiles"]["0.5"] == pytest.approx(np.quantile(values, 0.5), rel=0.02)
+    assert result["quantiles"]["0.99"] == pytest.approx(np.quantile(values, 0.99), rel=0.05)
+    assert client.get(f"/api/metrics/{metric_id}/quantiles", params={"q": "2"}).status_code == 400
+    assert client.get("/api/metrics/999999/quantiles").status_code == 404
@@ -0,0 +1,81 @@
+from datetime import timedelta
+import pytest
+from app.services import rollup_service
+from app.services.time_buckets import floor_timestamp
+from conftest import utcnow
+
+
+def _expected(points, start, end, bucket, agg):
+    groups = {}
+    for _, timestamp, value, visitors in points:
+        if start <= timestamp < end:
+            groups.setdefault(floor_timestamp(timestamp, bucket), []).append((value, visitors))
+    expected = []
+    for bucket_start in sorted(groups):
+        values = [value for value, _ in groups[bucket_start]]
+        value = {
+            "avg": sum(values) / len(values),
+            "sum": sum(values),
+            "min": min(values),
+            "max": max(values),
+            "count": len(values),
+            "last": values[-1],
+        }[agg]
+        expected.append((bucket_start.isoformat(), round(value, 6), sum(visitors for _, visitors in groups[bucket_start])))
+    return expected
+
+
+@pytest.mark.parametrize("bucket", ["hour", "day", "week", "month"])
+@pytest.mark.parametrize("agg", ["avg", "sum", "min", "max", "count", "last"])
+def test_rollup_buckets_match_raw_points_on_unaligned_ranges(client, minute_series, bucket, agg):
+    metric_id, base, points = minute_series
+    ranges = [
+        (base + timedelta(hours=5, minutes=13), base + timedelta(days=3, hours=2, minutes=41)),
+        (base + timedelta(minutes=20), base + timedelta(minutes=50)),
+        (base + timedelta(days=1), base + timedelta(days=4)),
+    ]
+    for start, end in ranges:
+        response = client.get(f"/api/metrics/{metric_id}/timeseries", params={
+            "start": start.isoformat(), "end": end.isoformat(), "bucket": bucket, "agg": agg, "limit": 5000,
+        })
+        assert response.status_code == 200
+        actual = [(point["timestamp"], round(point["value"], 6), point["visitor_count"]) for point in response.json()]
+        assert actual == _expected(points, start, end, bucket, agg)
+
+
+def test_rollups_follow_upserts_across_batches(client, create_metric, ingest):
+    metric_id = create_metric()
+    day = (utcnow() - timedelta(days=2)).replace(hour=0, minute=0, second=0, microsecond=0)
+    params = {"bucket": "day", "agg": "sum", "start": day.isoformat(), "end": (day + timedelta(days=1)).isoformat()}
+
+    ingest([(metric_id, day + timedelta(hours=1), 5.0, 2), (metric_id, day + timedelta(hours=2), 7.0, 3)])
+    assert client.get(f"/api/metrics/{metric_id}/timeseries", params=params).json() == [
+        {"timestamp": day.isoformat(), "value": 12.0, "visitor_count": 5},
+    ]
+    # 같은 시각의 포인트는 덮어쓰고, 다른 배치의 포인트는 같은 버킷에 합쳐진다
+    ingest([(metric_id, day + timedelta(hours=1), 1.0, 1), (metric_id, day + timedelta(hours=5), 10.0, None)])
+    assert client.get(f"/api/metrics/{metric_id}/timeseries", params=params).json() == [
+        {"timestamp": day.isoformat(), "value": 18.0, "visitor_count": 4},
+    ]
+    counts = client.get(f"/api/metrics/{metric_id}/timeseries", params={**params, "agg": "count", "bucket": "hour"}).json()
+    assert [point["value"] for point in counts] == [1, 1, 1]
+
+
+def test_ingest_refreshes_only_the_touched_buckets(monkeypatch, create_metric, ingest):
+    metric_id = create_metric()
+    day = (utcnow() - timedelta(days=6)).replace(hour=0, minute=0, second=0, microsecond=0)
+    ingest([(metric_id, day + timedelta(days=i, hours=3), 1.0, None) for i in range(6)])
+
+    calls = []
+    original = rollup_service._upsert_rollups
+    monkeypatch.setattr(rollup_service, "_upsert_rollups", lambda db, granularity, **kwargs: (
+        calls.append((granularity, kwargs["start"], kwargs["end"])), original(db, granularity, **kwargs)
+    ))
+    # 첫날과 마지막 날 사이의 버킷은 다시 집계하지 않는다
+    ingest([(metric_id, day + timedelta(hours=3, minutes=30), 2.0, None), (metric_id, day + timedelta(days=5, hours=4), 3.0, None)])
+    assert sorted(calls) == [
+        ("day", day, day + timedelta(days=1)),
+        ("day", day + timedelta(days=5), day + timedelta(days=6)),
+        ("hour", day + timedelta(hours=3), day + timedelta(hours=4)),
+        ("hour", day + timedelta(days=5, hours=4), day + timedelta(days=5, hours=5)),
+    ]
@@ -0,0 +1,56 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from app.services.scheduler import scheduler
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+LIFESPAN_PROBE = """
+import json
+import time
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.scheduler import scheduler
+
+with TestClient(app) as client:
+    deadline = time.monotonic() + 10
+    while not scheduler.snapshot()["jobs"] and time.monotonic() < deadline:
+        time.sleep(0.1)
+    status = client.get("/api/admin/scheduler").json()
+print(json.dumps({"running": status["running"], "jobs": [[job["kind"], job["target_id"]] for job in status["jobs"]]}))
+"""
+
+
+def test_sync_plans_segment_and_compaction_jobs_but_not_metric_values(client, create_metric, create_segment):
+    segment_id = create_segment("SELECT user_id FROM users WHERE grp = 1", refresh_period="1시간")
+    metric_id = create_metric(value=12.5, aggregation_period="일별")
+    scheduler.sync_jobs()
+    jobs = {(job["kind"], job["target_id"]): job for job in scheduler.snapshot()["jobs"]}
+    assert jobs[("segment", segment_id)]["interval_seconds"] == 3600
+    assert ("compaction", None) in jobs
+    assert not any(kind == "metric" for kind, _ in jobs)
+    assert client.get(f"/api/metrics/{metric_id}").json()["value"] == 12.5
+
+    # 삭제된 세그먼트의 작업은 다음 동기화에서 빠진다
+    client.delete(f"/api/segments/{segment_id}")
+    scheduler.sync_jobs()
+    assert ("segment", segment_id) not in {(job["kind"], job["target_id"]) for job in scheduler.snapshot()["jobs"]}
+
+
+def test_scheduler_status_route(client):
+    status = client.get("/api/admin/scheduler").json()
+    assert {"running", "workers", "max_writers", "queue_depth", "jobs"} <= set(status)
+
+
+def test_lifespan_starts_the_compaction_job_with_default_settings(tmp_path):
+    # 기본 설정(환경 변수 없음)으로 새 프로세스에서 앱을 띄워 스케줄러가 압축 작업을 계획하는지 확인
+    environment = {key: value for key, value in os.environ.items() if not key.startswith("SCHEDULER_")}
+    environment["DATABASE_URL"] = f"sqlite:///{tmp_path / 'app.db'}"
+    result = subprocess.run([sys.executable, "-c", LIFESPAN_PROBE], cwd=BACKEND_DIR, env=environment,
+                            check=True, capture_output=True, text=True)
+    status = json.loads(result.stdout.strip().splitlines()[-1])
+    assert status["running"] is True
+    assert ["compaction", None] in status["jobs"]
+    assert not any(kind == "metric" for kind, _ in status["jobs"])
@@ -0,0 +1,21 @@
+def test_search_ranks_catalog_entities_and_ignores_punctuation_only_queries(client, create_metric):
+    metric_id = create_metric(name="quokka retention", description="weekly quokka cohort")
+    segment = client.post("/api/segments/", json={"name": "quokka fans", "category": "c"}).json()
+
+    body = client.get("/api/search/", params={"q": "quokka"}).json()
+    hits = {(hit["type"], hit["id"]) for hit in body["items"]}
+    assert ("metric", metric_id) in hits and ("segment", segment["id"]) in hits
+    only_metrics = client.get("/api/search/", params={"q": "quokka", "types": "metric"}).json()
+    assert {hit["type"] for hit in only_metrics["items"]} == {"metric"}
+
+    assert client.get("/api/search/", params={"q": "%%%"}).json() == {"total": 0, "items": []}
+    for path in ["/api/metrics/", "/api/segments/", "/api/experiments/"]:
+        body = client.get(path, params={"search": "%%%"}).json()
+        assert body["total"] == 0 and body["items"] == []
+
+    client.put(f"/api/metrics/{metric_id}", json={"name": "wombat retention", "description": "d"})
+    hits = client.get("/api/search/", params={"q": "quokka", "types": "metric"}).json()["items"]
+    assert metric_id not in [hit["id"] for hit in hits]
+    client.delete(f"/api/segments/{segment['id']}")
+    hits = client.get("/api/search/", params={"q": "quokka", "types": "segment"}).json()["items"]
+    assert segment["id"] not in [hit["id"] for hit in hits]
@@ -0,0 +1,26 @@
+def test_set_operations_and_overlap_match_python_sets(client, create_segment):
+    low = create_segment("SELECT user_id FROM users WHERE ltv < 300")
+    even = create_segment("SELECT user_id FROM users WHERE grp % 2 = 0")
+    empty = create_segment("SELECT user_id FROM users WHERE ltv < 0")
+    for segment_id in (low, even, empty):
+        client.post(f"/api/segments/{segment_id}/refresh")
+    low_set = {f"u{i}" for i in range(20000) if i % 1000 < 300}
+    even_set = {f"u{i}" for i in range(20000) if (i % 13) % 2 == 0}
+
+    counts = client.get("/api/segments/setops", params={"left": low, "right": even}).json()
+    assert counts["left"] == len(low_set) and counts["right"] == len(even_set)
+    assert counts["intersection"] == len(low_set & even_set)
+    assert counts["union"] == len(low_set | even_set)
+    assert counts["left_only"] == len(low_set - even_set) and counts["right_only"] == len(even_set - low_set)
+
+    overlap = client.get("/api/segments/overlap", params=[("segment_ids", low), ("segment_ids", even), ("segment_ids", empty)]).json()
+    assert overlap["sizes"] == [len(low_set), len(even_set), 0]
+    assert overlap["matrix"][0][1] == overlap["matrix"][1][0] == len(low_set & even_set)
+    assert overlap["matrix"][2] == [0, 0, 0]
+
+    assert client.get("/api/segments/setops", params={"left": low, "right": 999999}).status_code == 404
+    assert client.get("/api/segments/overlap", params={"segment_ids": 999999}).status_code == 404
+
+    # 세그먼트 삭제 시 멤버십/비트맵도 함께 삭제된다
+    client.delete(f"/api/segments/{even}")
+    assert client.get("/api/segments/setops", params={"left": low, "right": even}).status_code == 404
@@ -0,0 +1,48 @@
+import pytest
+
+
+def test_refresh_stores_members_and_reuses_unchanged_results(client, create_segment):
+    segment_id = create_segment("SELECT user_id FROM users WHERE grp = 0", refresh_period="일별")
+    first = client.post(f"/api/segments/{segment_id}/refresh").json()
+    assert first["refreshed"] is True and first["member_count"] == 1539 and first["added"] == 1539
+
+    again = client.post(f"/api/segments/{segment_id}/refresh").json()
+    assert again["refreshed"] is False and again["member_count"] == 1539
+
+    client.put(f"/api/segments/{segment_id}", json={"query": "SELECT user_id FROM users WHERE grp = 0 AND ltv < 500"})
+    changed = client.post(f"/api/segments/{segment_id}/refresh").json()
+    assert changed["refreshed"] is True and changed["added"] == 0
+    assert changed["removed"] == 1539 - changed["member_count"]
+    assert client.get(f"/api/segments/{segment_id}").json()["customer_count"] == changed["member_count"]
+
+
+def test_members_are_paginated_by_member_id(client, create_segment):
+    segment_id = create_segment("SELECT user_id FROM users WHERE grp = 3")
+    client.post(f"/api/segments/{segment_id}/refresh")
+    members, cursor = [], None
+    while True:
+        params = {"limit": 400, **({"cursor": cursor} if cursor else {})}
+        page = client.get(f"/api/segments/{segment_id}/members", params=params).json()
+        members += page["items"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert page["total"] == len(members) == len(set(members))
+    assert members == sorted(f"u{i}" for i in range(20000) if i % 13 == 3)
+    assert client.get(f"/api/segments/{segment_id}/members", params={"cursor": "bad"}).status_code == 400
+    assert client.get("/api/segments/999999/members").status_code == 404
+
+
+@pytest.mark.parametrize("query", [
+    "DELETE FROM users",
+    "SELECT user_id FROM users; DROP TABLE users",
+    "ATTACH DATABASE '/tmp/x.db' AS x",
+    "SELECT load_extension('x')",
+    "SELECT * FROM no_such_table",
+    "",
+])
+def test_forbidden_or_broken_queries_are_rejected(client, create_segment, query):
+    segment_id = create_segment(query)
+    response = client.post(f"/api/segments/{segment_id}/refresh")
+    assert response.status_code == 400
+    assert client.get(f"/api/segments/{segment_id}/members").json()["total"] == 0
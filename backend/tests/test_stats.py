@@ -0,0 +1,23 @@
+def test_stats_counters_follow_writes_and_repair(client, create_metric):
+    before = client.get("/api/metrics/stats").json()
+    metric_id = create_metric(status="활성화")
+    after = client.get("/api/metrics/stats").json()
+    assert after["total"] == before["total"] + 1 and after["active"] == before["active"] + 1
+
+    client.put(f"/api/metrics/{metric_id}", json={"status": "비활성화"})
+    updated = client.get("/api/metrics/stats").json()
+    assert updated["active"] == before["active"] and updated["inactive"] == before["inactive"] + 1
+
+    segments_before = client.get("/api/segments/stats").json()
+    segment = client.post("/api/segments/", json={"name": "counted", "customer_count": 40}).json()
+    segments_after = client.get("/api/segments/stats").json()
+    assert segments_after["total_segments"] == segments_before["total_segments"] + 1
+    assert segments_after["total_customers"] == segments_before["total_customers"] + 40
+
+    client.delete(f"/api/metrics/{metric_id}")
+    client.delete(f"/api/segments/{segment['id']}")
+    assert client.get("/api/metrics/stats").json() == before
+    assert client.get("/api/segments/stats").json() == segments_before
+
+    assert client.post("/api/admin/counters/repair").status_code == 200
+    assert client.get("/api/metrics/stats").json() == before
@@ -0,0 +1,40 @@
+from datetime import timedelta
+import pytest
+
+
+def test_timeseries_defaults_to_latest_points(client, minute_series):
+    metric_id, _, points = minute_series
+    latest = client.get(f"/api/metrics/{metric_id}/timeseries", params={"limit": 2}).json()
+    assert [point["value"] for point in latest] == [points[-2][2], points[-1][2]]
+    assert len(client.get(f"/api/metrics/{metric_id}/timeseries").json()) == 30
+
+
+def test_day_buckets_aggregate_points_in_range(client, minute_series):
+    metric_id, base, points = minute_series
+    start = base.replace(hour=0) + timedelta(days=1)
+    end = start + timedelta(days=2)
+    for agg in ["avg", "sum", "count"]:
+        response = client.get(f"/api/metrics/{metric_id}/timeseries", params={
+            "start": start.isoformat(), "end": end.isoformat(), "bucket": "day", "agg": agg,
+        })
+        assert response.status_code == 200
+        series = response.json()
+        assert [point["timestamp"] for point in series] == [start.isoformat(), (start + timedelta(days=1)).isoformat()]
+        first_day = [(value, visitors) for _, timestamp, value, visitors in points if start <= timestamp < start + timedelta(days=1)]
+        values = [value for value, _ in first_day]
+        expected = {"avg": sum(values) / len(values), "sum": sum(values), "count": len(values)}[agg]
+        assert series[0]["value"] == pytest.approx(expected)
+        assert series[0]["visitor_count"] == sum(visitors for _, visitors in first_day)
+
+
+def test_minute_buckets_and_bad_bucket(client, minute_series):
+    metric_id, base, points = minute_series
+    start, end = base + timedelta(minutes=10), base + timedelta(hours=1)
+    response = client.get(f"/api/metrics/{metric_id}/timeseries", params={
+        "bucket": "minute", "agg": "sum", "start": start.isoformat(), "end": end.isoformat(),
+    })
+    assert [(point["timestamp"], point["value"]) for point in response.json()] == [
+        (timestamp.isoformat(), value) for _, timestamp, value, _ in points if start <= timestamp < end
+    ]
+    assert client.get(f"/api/metrics/{metric_id}/timeseries", params={"bucket": "year"}).status_code == 422
+    assert client.get("/api/metrics/999999/timeseries").status_code == 404
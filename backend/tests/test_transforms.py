@@ -0,0 +1,24 @@
+from datetime import timedelta
+import numpy as np
+import pytest
+
+
+def test_transforms_add_columns_per_bucket(client, create_metric, ingest, recent_day):
+    metric_id = create_metric()
+    base = recent_day(20)
+    ingest([(metric_id, base + timedelta(days=day, hours=3), float(day * 2 + 1), None) for day in range(20) if day != 5])
+
+    points = client.get(f"/api/metrics/{metric_id}/timeseries", params={
+        "bucket": "day", "agg": "sum", "start": base.isoformat(), "transforms": "ma:3,cumsum,pop:1,trend,forecast:3",
+    }).json()
+    values = [point["value"] for point in points[:19]]
+    assert [point["cumsum"] for point in points[:19]] == list(np.cumsum(values))
+    # 5일차 버킷이 비어 있으므로 6일차(points[5])는 전날 대비 증감률이 없다
+    assert points[5]["pop_1"] is None
+    assert points[1]["pop_1"] == pytest.approx((3 - 1) / 1 * 100)
+    assert points[6]["ma_3"] == pytest.approx((13 + 15) / 2)
+    assert points[3]["trend"] == pytest.approx(7.0)
+    assert len(points) == 22 and points[-1]["value"] is None and points[-1]["forecast"] == pytest.approx(45.0)
+
+    for bad in ["foo", "ma", "ma:0", "ma:1.5", "trend:3", "forecast:2,forecast:3"]:
+        assert client.get(f"/api/metrics/{metric_id}/timeseries", params={"transforms": bad}).status_code == 400
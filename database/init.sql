@@ -1,5 +1,8 @@
 -- DataHub 데이터베이스 초기화 스크립트
 
+-- 압축 작업 후 빈 페이지를 증분 VACUUM으로 반환 (테이블 생성 전에 설정해야 함)
+PRAGMA auto_vacuum = INCREMENTAL;
+
 -- Insights 테이블
 CREATE TABLE IF NOT EXISTS insights (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -28,6 +31,7 @@ CREATE TABLE IF NOT EXISTS metrics (
     alert_settings TEXT,
     data_source TEXT,
     aggregation_period VARCHAR(50),
+    higher_is_better BOOLEAN,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -185,6 +189,10 @@ INSERT INTO segments (name, description, segment_owner, category, tags, refresh_
 -- Add visitor_count column to metric_data_points
 ALTER TABLE metric_data_points ADD COLUMN visitor_count INTEGER;
 
+-- (metric_id, timestamp) 기준 upsert 및 구간 조회용 인덱스
+CREATE UNIQUE INDEX IF NOT EXISTS ix_metric_data_points_metric_id_timestamp
+    ON metric_data_points (metric_id, timestamp);
+
 -- Insert sample time series data for metric_id=1 (결제 전환율)
 -- 최근 90일간 데이터 (7일, 30일, 90일 모두 조회 가능하도록)
 INSERT INTO metric_data_points (metric_id, value, visitor_count, timestamp) VALUES
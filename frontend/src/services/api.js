@@ -21,6 +21,12 @@ export const metricsAPI = {
   getStats: () => api.get('/api/metrics/stats'),
   getById: (id) => api.get(`/api/metrics/${id}`),
   getTimeSeries: (id, params) => api.get(`/api/metrics/${id}/timeseries`, { params }),
+  getQuantiles: (id, params) => api.get(`/api/metrics/${id}/quantiles`, { params }),
+  getDerived: (id, params) => api.get(`/api/metrics/${id}/derived`, { params }),
+  getTimeSeriesBatch: (data) => api.post('/api/metrics/timeseries:batch', data),
+  getExperiments: (id, params) => api.get(`/api/metrics/${id}/experiments`, { params }),
+  getAlerts: (params) => api.get('/api/metrics/alerts', { params }),
+  getAlertRules: (id) => api.get(`/api/metrics/${id}/alert-rules`),
   create: (data) => api.post('/api/metrics', data),
   update: (id, data) => api.put(`/api/metrics/${id}`, data),
   delete: (id) => api.delete(`/api/metrics/${id}`),
@@ -34,6 +40,13 @@ export const segmentsAPI = {
   create: (data) => api.post('/api/segments', data),
   update: (id, data) => api.put(`/api/segments/${id}`, data),
   delete: (id) => api.delete(`/api/segments/${id}`),
+  getMembers: (id, params) => api.get(`/api/segments/${id}/members`, { params }),
+  refresh: (id, force = false) => api.post(`/api/segments/${id}/refresh`, null, { params: { force } }),
+  setOperations: (left, right) => api.get('/api/segments/setops', { params: { left, right } }),
+  getOverlap: (segmentIds) => api.get('/api/segments/overlap', {
+    params: { segment_ids: segmentIds },
+    paramsSerializer: { indexes: null },
+  }),
 }
 
 // Experiments API
@@ -43,6 +56,8 @@ export const experimentsAPI = {
   create: (data) => api.post('/api/experiments/', data),
   update: (id, data) => api.put(`/api/experiments/${id}`, data),
   delete: (id) => api.delete(`/api/experiments/${id}`),
+  getDesign: (id, params) => api.get(`/api/experiments/${id}/design`, { params }),
+  assignBatch: (id, unitIds) => api.post(`/api/experiments/${id}/assign:batch`, { unit_ids: unitIds }),
 }
 
 export default api